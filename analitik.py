@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Analitik Turunan Hasil Simulasi
+===============================
+
+Ringkasan yang ditampilkan halaman Analisis Detail: statistik deskriptif
+waktu tunggu, statistik box plot per stasiun (untuk ``ax.bxp``), matriks
+korelasi, serta rata-rata dan maksimum panjang antrean.
+
+Semua ringkasan dihitung sekali per hasil lalu disimpan bersama hasil itu
+(lihat ``ManajerSesi.turunan``), bukan dihitung ulang setiap rerun.
+
+- Momen (rata-rata, std, min, max, kovarians) diakumulasi per chunk baris
+  dengan satu perkalian matriks per chunk; data digeser dengan baris
+  pertama agar akumulasi kuadrat tetap stabil.
+- Kuartil butuh seluruh kolom, tetapi dihitung per kolom (satu kolom
+  float64 di memori pada satu waktu).
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Baris per chunk saat mengakumulasi momen
+UKURAN_CHUNK = 1_000_000
+
+KOLOM_KORELASI = (
+    'Waktu_Datang', 'Waktu_Tunggu_Pesan', 'Waktu_Tunggu_Bayar',
+    'Waktu_Tunggu_Ambil', 'Total_Waktu_Tunggu', 'Total_Waktu_Sistem',
+)
+KOLOM_TUNGGU_STASIUN = {
+    'Pesan': 'Waktu_Tunggu_Pesan',
+    'Bayar': 'Waktu_Tunggu_Bayar',
+    'Ambil': 'Waktu_Tunggu_Ambil',
+}
+KOLOM_ANTREAN = {
+    'Pesan': 'Antrean_Pesan',
+    'Bayar': 'Antrean_Bayar',
+    'Ambil': 'Antrean_Ambil',
+}
+
+
+@dataclass
+class AnalitikLog:
+    """Ringkasan turunan dari log pelanggan."""
+    jumlah_mobil: int
+    ringkasan_tunggu: pd.Series      # Seperti ``describe()`` Total_Waktu_Tunggu
+    statistik_box: List[Dict]        # Satu dict per stasiun, format ``ax.bxp``
+    korelasi: pd.DataFrame           # Pearson antar ``KOLOM_KORELASI``
+
+
+@dataclass
+class AnalitikAntrean:
+    """Ringkasan turunan dari monitoring antrean."""
+    rata: Dict[str, float]
+    maks: Dict[str, int]
+
+
+def _momen(
+    df: pd.DataFrame,
+    kolom: List[str],
+    ukuran_chunk: int
+) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Jumlah baris, rata-rata, kovarians (ddof=1), min, dan max per kolom.
+    """
+    k = len(kolom)
+    n = 0
+    jumlah = np.zeros(k)
+    kuadrat = np.zeros((k, k))
+    minimum = np.full(k, np.inf)
+    maksimum = np.full(k, -np.inf)
+    geser = df[kolom].iloc[0].to_numpy(dtype=np.float64)
+
+    for awal in range(0, len(df), ukuran_chunk):
+        x = df[kolom].iloc[awal:awal + ukuran_chunk].to_numpy(dtype=np.float64)
+        minimum = np.minimum(minimum, x.min(axis=0))
+        maksimum = np.maximum(maksimum, x.max(axis=0))
+        x -= geser
+        n += len(x)
+        jumlah += x.sum(axis=0)
+        kuadrat += x.T @ x
+
+    rata_geser = jumlah / n
+    with np.errstate(invalid='ignore', divide='ignore'):
+        kovarians = (kuadrat - n * np.outer(rata_geser, rata_geser)) / (n - 1)
+    return n, rata_geser + geser, kovarians, minimum, maksimum
+
+
+def _statistik_box(nilai: np.ndarray, label: str) -> Dict:
+    """Statistik box plot (whisker 1.5 IQR) seperti ``cbook.boxplot_stats``."""
+    q1, median, q3 = np.quantile(nilai, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    dalam = nilai[(nilai >= q1 - 1.5 * iqr) & (nilai <= q3 + 1.5 * iqr)]
+    return {
+        'label': label,
+        'med': median,
+        'q1': q1,
+        'q3': q3,
+        'whislo': dalam.min() if len(dalam) else q1,
+        'whishi': dalam.max() if len(dalam) else q3,
+        # Nilai 2 desimal: flier unik sudah cukup untuk digambar
+        'fliers': np.unique(nilai[(nilai < q1 - 1.5 * iqr) | (nilai > q3 + 1.5 * iqr)]),
+    }
+
+
+def hitung_analitik_log(df_log: pd.DataFrame, ukuran_chunk: int = UKURAN_CHUNK) -> AnalitikLog:
+    """
+    Menghitung semua ringkasan log pelanggan untuk halaman Analisis Detail.
+
+    Args:
+        df_log: DataFrame log pelanggan
+        ukuran_chunk: Baris per chunk akumulasi momen
+
+    Returns:
+        ``AnalitikLog`` (ringkasan kosong jika log kosong)
+    """
+    kolom = list(KOLOM_KORELASI)
+    if len(df_log) == 0:
+        return AnalitikLog(
+            jumlah_mobil=0,
+            ringkasan_tunggu=pd.Series(dtype=float),
+            statistik_box=[],
+            korelasi=pd.DataFrame(index=kolom, columns=kolom, dtype=float)
+        )
+
+    n, rata, kovarians, minimum, maksimum = _momen(df_log, kolom, ukuran_chunk)
+    std = np.sqrt(np.diag(kovarians))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        korelasi = np.clip(kovarians / np.outer(std, std), -1.0, 1.0)
+    # Seperti pandas: korelasi kolom dengan dirinya sendiri 1 (jika variansnya ada)
+    np.fill_diagonal(korelasi, np.where(std > 0, 1.0, np.nan))
+
+    i = kolom.index('Total_Waktu_Tunggu')
+    total_tunggu = df_log['Total_Waktu_Tunggu'].to_numpy(dtype=np.float64)
+    q1, median, q3 = np.quantile(total_tunggu, [0.25, 0.5, 0.75])
+    ringkasan = pd.Series({
+        'count': float(n), 'mean': rata[i], 'std': std[i], 'min': minimum[i],
+        '25%': q1, '50%': median, '75%': q3, 'max': maksimum[i],
+    })
+
+    statistik_box = [
+        _statistik_box(df_log[nama].to_numpy(dtype=np.float64), stasiun)
+        for stasiun, nama in KOLOM_TUNGGU_STASIUN.items()
+    ]
+
+    return AnalitikLog(
+        jumlah_mobil=n,
+        ringkasan_tunggu=ringkasan,
+        statistik_box=statistik_box,
+        korelasi=pd.DataFrame(korelasi, index=kolom, columns=kolom)
+    )
+
+
+def hitung_analitik_antrean(df_antrean: pd.DataFrame, ukuran_chunk: int = UKURAN_CHUNK) -> AnalitikAntrean:
+    """
+    Rata-rata dan maksimum panjang antrean setiap stasiun.
+
+    Args:
+        df_antrean: DataFrame monitoring antrean
+        ukuran_chunk: Baris per chunk
+
+    Returns:
+        ``AnalitikAntrean``
+    """
+    kolom = list(KOLOM_ANTREAN.values())
+    jumlah = np.zeros(len(kolom))
+    maksimum = np.zeros(len(kolom), dtype=np.int64)
+    for awal in range(0, len(df_antrean), ukuran_chunk):
+        x = df_antrean[kolom].iloc[awal:awal + ukuran_chunk].to_numpy(dtype=np.int64)
+        jumlah += x.sum(axis=0)
+        maksimum = np.maximum(maksimum, x.max(axis=0))
+
+    n = max(len(df_antrean), 1)
+    return AnalitikAntrean(
+        rata={stasiun: jumlah[j] / n for j, stasiun in enumerate(KOLOM_ANTREAN)},
+        maks={stasiun: int(maksimum[j]) for j, stasiun in enumerate(KOLOM_ANTREAN)}
+    )
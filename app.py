@@ -10,15 +10,34 @@ Author: Simulation Dashboard
 Version: 1.0.0
 """
 
+import os
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from simulation import (
-    jalankan_simulasi, 
     identifikasi_bottleneck, 
-    generate_insight
+    generate_insight,
+    untuk_tampilan,
+    ukuran_memori
+)
+from sketsa_kuantil import BATAS_TUNGGU_SLA
+from surrogat import estimasi_simulasi
+from manajer_job import TugasSimulasi, STATUS_ANTRE, STATUS_SELESAI, STATUS_GAGAL
+from sumber_daya import (
+    get_manajer_job,
+    get_mesin_replay,
+    get_surrogat,
+    get_tabel_skenario,
+    get_manajer_sesi,
+    get_id_sesi,
+    simpan_hasil_sesi,
+    ambil_hasil_sesi,
+    path_berkas_sesi,
+    hapus_berkas_run
 )
 
 # =====================================================================
@@ -468,6 +487,50 @@ def create_queue_dynamics_chart(df_queue: pd.DataFrame):
     return fig
 
 
+def create_lane_chart(keadaan: dict, waktu: float):
+    """Membuat visualisasi tiga jalur stasiun pada satu titik waktu replay."""
+    fig, ax = plt.subplots(figsize=(10, 4))
+    
+    plt.style.use('dark_background')
+    fig.patch.set_facecolor('#1a1a2e')
+    ax.set_facecolor('#1a1a2e')
+    
+    stations = ['Pesan', 'Bayar', 'Ambil']
+    colors = ['#00d2ff', '#ffd700', '#ff4757']
+    max_antrean = max([keadaan[f'Antrean_{s}'] for s in stations] + [5])
+    
+    for y, (station, color) in enumerate(zip(stations, colors)):
+        antrean = keadaan[f'Antrean_{station}']
+        dilayani = keadaan[f'Dilayani_{station}']
+        
+        # Mobil mengantre berbaris ke kiri, mobil dilayani di loket (x >= 0)
+        ax.scatter(-np.arange(1, antrean + 1), [y] * antrean, marker='s', s=180,
+                   color=color, alpha=0.6, edgecolor='white', linewidth=0.5)
+        ax.scatter(np.arange(dilayani) * 0.6, [y] * dilayani, marker='s', s=260,
+                   color=color, edgecolor='#00d26a', linewidth=2)
+        ax.text(max_antrean * 0.05 + 2, y, f'{antrean} antre • {dilayani} dilayani',
+                va='center', fontsize=11, color='white', fontweight='bold')
+    
+    ax.axvline(-0.5, color='#666', linestyle='--', linewidth=1)
+    ax.set_yticks(range(len(stations)))
+    ax.set_yticklabels([f'Stasiun {s}' for s in stations], color='white', fontsize=11)
+    ax.set_xlim(-max_antrean - 1, max_antrean * 0.05 + 8)
+    ax.set_ylim(-0.7, len(stations) - 0.3)
+    ax.invert_yaxis()
+    ax.set_xticks([])
+    ax.set_title(
+        f'🎬 Menit {waktu:.1f} — {keadaan["Di_Sistem"]} mobil di sistem, '
+        f'{keadaan["Selesai"]} selesai',
+        fontsize=14, color='#ffd700', fontweight='bold', pad=15
+    )
+    
+    sns.despine(ax=ax, top=True, right=True, bottom=True)
+    ax.spines['left'].set_color('#666')
+    
+    plt.tight_layout()
+    return fig
+
+
 # =====================================================================
 # SIDEBAR - CONTROL PANEL
 # =====================================================================
@@ -512,6 +575,34 @@ with st.sidebar:
         help="Jumlah staff di stasiun pengambilan"
     )
     
+    st.markdown("### ⚡ Estimasi Instan")
+    
+    model_surrogat = get_surrogat()
+    parameter_estimasi = {
+        'laju_kedatangan': laju_kedatangan,
+        'durasi_simulasi': durasi_simulasi,
+        'jumlah_kasir': jumlah_kasir,
+        'jumlah_staff_ambil': jumlah_staff_ambil,
+    }
+    if model_surrogat is not None:
+        estimasi = model_surrogat.estimasi(parameter_estimasi)
+    else:
+        estimasi = estimasi_simulasi(parameter_estimasi)
+    util_maks = max(('utilisasi_pesan', 'utilisasi_bayar', 'utilisasi_ambil'), key=estimasi.nilai.get)
+    st.markdown(
+        f"⏱️ Tunggu: **{estimasi.nilai['rata_waktu_tunggu']:.1f}** ± {estimasi.std['rata_waktu_tunggu']:.1f} menit  \n"
+        f"📈 Throughput: **{estimasi.nilai['throughput']:.0f}** ± {estimasi.std['throughput']:.0f} mobil/jam  \n"
+        f"🎯 Utilisasi maks: **{estimasi.nilai[util_maks]:.0f}%** "
+        f"({util_maks.replace('utilisasi_', '').capitalize()})"
+    )
+    if estimasi.sumber == 'surrogat':
+        st.caption(f"Model surrogat • {estimasi.waktu_detik * 1e6:.0f} µs")
+    elif model_surrogat is None:
+        st.caption(f"Model surrogat belum dilatih untuk engine ini, simulasi cepat • "
+                   f"{estimasi.waktu_detik * 1000:.0f} ms")
+    else:
+        st.caption(f"Di luar jangkauan model, simulasi cepat • {estimasi.waktu_detik * 1000:.0f} ms")
+    
     st.markdown("### 🎲 Pengaturan Lanjutan")
     
     use_random_seed = st.checkbox("Gunakan Seed Tetap", value=True)
@@ -519,6 +610,21 @@ with st.sidebar:
     if use_random_seed:
         random_seed = st.number_input("Random Seed", min_value=1, max_value=9999, value=42)
     
+    aktifkan_profil = st.checkbox(
+        "Profil Performa",
+        value=False,
+        help="Catat waktu per fase, jumlah event SimPy, dan puncak memori"
+    )
+    dump_cprofile = False
+    if aktifkan_profil:
+        dump_cprofile = st.checkbox("Dump cProfile", value=False)
+    
+    rekam_jejak = st.checkbox(
+        "Rekam Jejak Event",
+        value=False,
+        help="Simpan jejak event setiap mobil untuk replay animasi antrean"
+    )
+    
     st.markdown("---")
     
     # Run Simulation Button
@@ -543,33 +649,131 @@ st.markdown("""
 # Initialize session state
 if 'simulation_run' not in st.session_state:
     st.session_state.simulation_run = False
-if 'df_hasil' not in st.session_state:
-    st.session_state.df_hasil = None
 
 # Run simulation if button clicked
 if run_simulation:
-    with st.spinner("🔄 Menjalankan simulasi..."):
-        df_hasil, df_antrean, utilisasi, statistik = jalankan_simulasi(
-            laju_kedatangan=laju_kedatangan,
-            durasi_simulasi=durasi_simulasi,
-            jumlah_kasir=jumlah_kasir,
-            jumlah_staff_ambil=jumlah_staff_ambil,
-            random_seed=random_seed
+    # Job lama milik sesi ini tidak lagi relevan
+    job_lama = st.session_state.get('job_simulasi')
+    if job_lama is not None:
+        try:
+            get_manajer_job().batalkan(job_lama['id'])
+            get_manajer_job().hapus(job_lama['id'])
+        except KeyError:
+            pass
+        hapus_berkas_run(job_lama['berkas_run'])
+        st.session_state.job_simulasi = None
+    
+    # Seed default tanpa profil/jejak: cukup lookup tabel skenario prakomputasi
+    hasil_tabel = None
+    tabel_skenario = get_tabel_skenario()
+    if tabel_skenario is not None and not aktifkan_profil and not rekam_jejak:
+        hasil_tabel = tabel_skenario.hasil(
+            laju_kedatangan, durasi_simulasi, jumlah_kasir, jumlah_staff_ambil, random_seed
         )
-        
-        # Store in session state
+    
+    if hasil_tabel is not None:
+        df_log, df_antrean, utilisasi, statistik = hasil_tabel
         st.session_state.simulation_run = True
-        st.session_state.df_hasil = df_hasil
-        st.session_state.df_antrean = df_antrean
+        simpan_hasil_sesi('df_hasil', df_log)
+        simpan_hasil_sesi('df_antrean', df_antrean)
         st.session_state.utilisasi = utilisasi
         st.session_state.statistik = statistik
         st.session_state.jumlah_kasir = jumlah_kasir
         st.session_state.jumlah_staff_ambil = jumlah_staff_ambil
+        st.session_state.profil = None
+        st.session_state.path_jejak = None
+        st.session_state.durasi_simulasi = durasi_simulasi
+        # Berkas run hasil sebelumnya tidak lagi dipakai
+        hapus_berkas_run(st.session_state.get('berkas_run', []))
+        st.session_state.berkas_run = []
+    else:
+        path_cprofile = None
+        if aktifkan_profil and dump_cprofile:
+            path_cprofile = path_berkas_sesi('.prof')
+        path_jejak = None
+        if rekam_jejak:
+            path_jejak = path_berkas_sesi('.jejak')
+        
+        tugas = TugasSimulasi(
+            parameter={
+                'laju_kedatangan': laju_kedatangan,
+                'durasi_simulasi': durasi_simulasi,
+                'jumlah_kasir': jumlah_kasir,
+                'jumlah_staff_ambil': jumlah_staff_ambil,
+                'random_seed': random_seed,
+            },
+            profil=aktifkan_profil,
+            path_cprofile=path_cprofile,
+            path_jejak=path_jejak
+        )
+        
+        st.session_state.job_simulasi = {
+            'id': get_manajer_job().kirim([tugas]),
+            'jumlah_kasir': jumlah_kasir,
+            'jumlah_staff_ambil': jumlah_staff_ambil,
+            'durasi_simulasi': durasi_simulasi,
+            'path_jejak': path_jejak,
+            'berkas_run': [path_jejak, path_cprofile],
+        }
+
+# Poll background job
+perlu_polling = False
+job = st.session_state.get('job_simulasi')
+if job is not None:
+    manajer = get_manajer_job()
+    try:
+        status_job = manajer.status(job['id'])
+    except KeyError:
+        # Worker pool dibuat ulang (mis. server restart), handle job hilang
+        status_job = None
+        hapus_berkas_run(job['berkas_run'])
+        st.session_state.job_simulasi = None
+    
+    if status_job is not None and status_job.aktif:
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            label = "⏳ Menunggu worker..." if status_job.status == STATUS_ANTRE else "🔄 Menjalankan simulasi..."
+            st.progress(
+                min(max(status_job.progres, 0.0), 1.0),
+                text=f"{label} ({status_job.waktu_berjalan:.1f} detik) {status_job.pesan}"
+            )
+        with col2:
+            if st.button("⛔ Batalkan", use_container_width=True):
+                manajer.batalkan(job['id'])
+        perlu_polling = True
+    elif status_job is not None:
+        if status_job.status == STATUS_SELESAI:
+            hasil = manajer.hasil(job['id'])[0]
+            
+            # Store in session state
+            st.session_state.simulation_run = True
+            # DataFrame disimpan terkompresi di luar session_state (anggaran memori)
+            simpan_hasil_sesi('df_hasil', hasil['df_log'])
+            simpan_hasil_sesi('df_antrean', hasil['df_antrean'])
+            st.session_state.utilisasi = hasil['utilisasi']
+            st.session_state.statistik = hasil['statistik']
+            st.session_state.jumlah_kasir = job['jumlah_kasir']
+            st.session_state.jumlah_staff_ambil = job['jumlah_staff_ambil']
+            st.session_state.profil = hasil['profil']
+            st.session_state.path_jejak = job['path_jejak']
+            st.session_state.durasi_simulasi = job['durasi_simulasi']
+            # Berkas run hasil sebelumnya diganti berkas run ini
+            hapus_berkas_run(st.session_state.get('berkas_run', []))
+            st.session_state.berkas_run = job['berkas_run']
+        else:
+            if status_job.status == STATUS_GAGAL:
+                st.error(f"❌ Simulasi gagal: {status_job.pesan}")
+            else:
+                st.warning("⛔ Simulasi dibatalkan.")
+            hapus_berkas_run(job['berkas_run'])
+        
+        manajer.hapus(job['id'])
+        st.session_state.job_simulasi = None
 
 # Display content
-if st.session_state.simulation_run and st.session_state.df_hasil is not None:
-    df_hasil = st.session_state.df_hasil
-    df_antrean = st.session_state.df_antrean
+df_hasil = ambil_hasil_sesi('df_hasil') if st.session_state.simulation_run else None
+df_antrean = ambil_hasil_sesi('df_antrean') if df_hasil is not None else None
+if df_hasil is not None and df_antrean is not None:
     utilisasi = st.session_state.utilisasi
     statistik = st.session_state.statistik
     
@@ -625,6 +829,23 @@ if st.session_state.simulation_run and st.session_state.df_hasil is not None:
                 delta="mobil per jam"
             )
         
+        # Tail latency (SLA berbasis persentil, dari sketsa kuantil)
+        if 'p90_waktu_tunggu' in statistik:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("📍 P50 Waktu Tunggu", f"{statistik['p50_waktu_tunggu']:.1f} menit")
+            col2.metric(
+                "📍 P90 Waktu Tunggu", f"{statistik['p90_waktu_tunggu']:.1f} menit",
+                delta=f"P90 sistem: {statistik['p90_waktu_sistem']:.1f}", delta_color="off"
+            )
+            col3.metric(
+                "📍 P95 Waktu Tunggu", f"{statistik['p95_waktu_tunggu']:.1f} menit",
+                delta=f"P99: {statistik['p99_waktu_tunggu']:.1f}", delta_color="off"
+            )
+            col4.metric(
+                f"🚨 Tunggu > {BATAS_TUNGGU_SLA:g} menit",
+                f"{statistik['persen_tunggu_di_atas_batas']:.1f}%"
+            )
+        
         # Status Alert
         _, status = identifikasi_bottleneck(utilisasi)
         if "KRITIS" in status:
@@ -639,10 +860,13 @@ if st.session_state.simulation_run and st.session_state.df_hasil is not None:
         # =====================================================================
         # VISUALIZATION TABS
         # =====================================================================
-        tab1, tab2, tab3 = st.tabs([
+        render_mulai = time.perf_counter()
+        
+        tab1, tab2, tab3, tab4 = st.tabs([
             "📈 Analisis Waktu",
             "🎯 Deteksi Bottleneck", 
-            "📋 Data Mentah"
+            "📋 Data Mentah",
+            "🎬 Replay Antrean"
         ])
         
         with tab1:
@@ -742,7 +966,7 @@ if st.session_state.simulation_run and st.session_state.df_hasil is not None:
             # Full Data Table
             st.markdown("#### 📋 Data Lengkap (10 Teratas)")
             st.dataframe(
-                df_hasil.head(10).style.format({
+                untuk_tampilan(df_hasil.head(10)).style.format({
                     'Waktu_Datang': '{:.1f}',
                     'Waktu_Selesai': '{:.1f}',
                     'Waktu_Tunggu_Pesan': '{:.2f}',
@@ -756,13 +980,67 @@ if st.session_state.simulation_run and st.session_state.df_hasil is not None:
             )
             
             # Download button
-            csv = df_hasil.to_csv(index=False).encode('utf-8')
+            csv = untuk_tampilan(df_hasil).to_csv(index=False, float_format='%.2f').encode('utf-8')
             st.download_button(
                 label="📥 Download Data CSV",
                 data=csv,
                 file_name="hasil_simulasi_drive_thru.csv",
                 mime="text/csv"
             )
+            _, byte_sesi = get_manajer_sesi().ukuran_sesi(get_id_sesi())
+            st.caption(
+                f"💾 Hasil sesi: {byte_sesi / 1024:.1f} KB terkompresi, "
+                f"{ukuran_memori(df_hasil, df_antrean) / 1024:.1f} KB saat dibuka "
+                f"({len(df_hasil):,} mobil, {len(df_antrean):,} titik antrean)"
+            )
+        
+        with tab4:
+            st.markdown("""
+            <div class="section-header">
+                <span class="icon">🎬</span>
+                <h2>Replay Antrean dari Jejak Event</h2>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            path_jejak = st.session_state.get('path_jejak')
+            if path_jejak and os.path.exists(path_jejak):
+                replay = get_mesin_replay(path_jejak)
+                durasi_replay = float(st.session_state.durasi_simulasi)
+                
+                col1, col2 = st.columns([4, 1])
+                with col1:
+                    waktu_replay = st.slider(
+                        "Waktu Simulasi (menit)",
+                        min_value=0.0,
+                        max_value=durasi_replay,
+                        value=0.0,
+                        step=0.5
+                    )
+                with col2:
+                    kecepatan = st.selectbox("Langkah Animasi", [0.5, 1.0, 2.0, 5.0], index=1)
+                    putar = st.button("▶️ Putar", use_container_width=True)
+                
+                frame = st.empty()
+                if putar:
+                    # Animasi hanya membaca snapshot jejak, SimPy tidak dijalankan ulang
+                    for waktu_frame in np.arange(waktu_replay, durasi_replay + kecepatan, kecepatan):
+                        waktu_frame = min(waktu_frame, durasi_replay)
+                        fig_lane = create_lane_chart(replay.keadaan_pada(waktu_frame), waktu_frame)
+                        frame.pyplot(fig_lane)
+                        plt.close(fig_lane)
+                        time.sleep(0.05)
+                else:
+                    fig_lane = create_lane_chart(replay.keadaan_pada(waktu_replay), waktu_replay)
+                    frame.pyplot(fig_lane)
+                    plt.close(fig_lane)
+                
+                st.caption(f"{len(replay.jejak):,} event terekam • file: {os.path.basename(path_jejak)}")
+            else:
+                st.info("ℹ️ Aktifkan **Rekam Jejak Event** di Pengaturan Lanjutan lalu jalankan simulasi untuk melihat replay.")
+        
+        profil = st.session_state.get('profil')
+        if profil is not None:
+            profil.waktu_fase['render_dashboard'] = time.perf_counter() - render_mulai
         
         # =====================================================================
         # INSIGHT BOX
@@ -782,6 +1060,35 @@ if st.session_state.simulation_run and st.session_state.df_hasil is not None:
             <p>{insight.replace(chr(10), '<br>')}</p>
         </div>
         """, unsafe_allow_html=True)
+        
+        # =====================================================================
+        # PERFORMANCE PANEL
+        # =====================================================================
+        if profil is not None:
+            with st.expander("⚡ Performance", expanded=False):
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Total Waktu", f"{profil.total_waktu * 1000:.1f} ms")
+                with col2:
+                    st.metric("Event SimPy", f"{profil.jumlah_event:,}")
+                with col3:
+                    st.metric("Puncak Antrean Event", f"{profil.puncak_antrean_event:,}")
+                with col4:
+                    if profil.puncak_memori is not None:
+                        st.metric("Puncak Memori", f"{profil.puncak_memori / 1024 ** 2:.2f} MB")
+                
+                st.dataframe(profil.ringkasan(), use_container_width=True, hide_index=True)
+                
+                if profil.statistik_cprofile:
+                    st.code(profil.statistik_cprofile, language="text")
+                if profil.path_cprofile and os.path.exists(profil.path_cprofile):
+                    with open(profil.path_cprofile, 'rb') as f:
+                        st.download_button(
+                            label="📥 Download cProfile (.prof)",
+                            data=f.read(),
+                            file_name="simulasi_drive_thru.prof",
+                            mime="application/octet-stream"
+                        )
 
 else:
     # Initial state - no simulation run yet
@@ -810,3 +1117,8 @@ st.markdown("""
     <p style="font-size: 0.8rem;">Menggunakan SimPy • Streamlit • Seaborn</p>
 </div>
 """, unsafe_allow_html=True)
+
+# Job masih berjalan: rerun berkala untuk memperbarui progres
+if perlu_polling:
+    time.sleep(0.5)
+    st.rerun()
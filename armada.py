@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Simulasi Armada Multi-Toko
+==========================
+
+Mensimulasikan ratusan toko drive-thru (masing-masing dengan laju
+kedatangan dan staffing sendiri) dalam beberapa run batch paralel, lalu
+mengembalikan KPI per toko dan KPI agregat per wilayah serta seluruh armada.
+
+- Toko dengan durasi, staffing, dan rata-rata layanan sama disimulasikan
+  sekaligus oleh engine batch (satu replikasi per toko, laju kedatangan
+  per toko), dibagi per ``ukuran_batch`` toko agar array tetap kecil.
+- Batch dikirim lewat backend eksekutor; setiap worker hanya
+  mengembalikan KPI per toko dan sketsa kuantil per wilayah, tidak pernah
+  log per mobil.
+- Koordinator menggabungkan sketsa begitu setiap batch selesai (agregasi
+  streaming), jadi memori tidak tumbuh dengan jumlah mobil. Persentil
+  armada hasil penggabungan identik dengan sketsa yang diisi semua mobil.
+
+Contoh:
+    python armada.py toko.csv -o hasil_toko.csv -w 8
+    python armada.py --contoh 500          # armada sintetis untuk uji skala
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from eksekutor import Eksekutor, EksekutorProses
+from engine_batch import simulasi_batch_konfigurasi
+from simulation import KonfigurasiSimulasi
+from sketsa_kuantil import SketsaKPI
+
+
+# Kolom tabel toko selain laju_kedatangan (wajib) beserta nilai default
+KOLOM_TOKO = {
+    'durasi_simulasi': 960,          # Satu hari operasional (16 jam)
+    'jumlah_kasir': 1,
+    'jumlah_staff_ambil': 1,
+    'waktu_layanan_pesan': 1.5,
+    'waktu_layanan_bayar': 1.0,
+    'waktu_layanan_ambil': 2.0,
+    'wilayah': 'semua',
+}
+
+# Toko dengan nilai kolom ini sama dapat disimulasikan dalam satu batch
+KOLOM_KELOMPOK = (
+    'durasi_simulasi', 'jumlah_kasir', 'jumlah_staff_ambil',
+    'waktu_layanan_pesan', 'waktu_layanan_bayar', 'waktu_layanan_ambil',
+)
+
+UKURAN_BATCH = 64
+
+
+@dataclass
+class HasilArmada:
+    """KPI armada: per toko, per wilayah, dan seluruh armada."""
+    per_toko: pd.DataFrame
+    per_wilayah: pd.DataFrame
+    agregat: Dict[str, float]
+    sketsa: Dict[str, SketsaKPI] = field(repr=False)  # Per wilayah
+    waktu_komputasi: float = 0.0
+
+
+def siapkan_armada(df_toko: pd.DataFrame, seed_awal: int = 1) -> pd.DataFrame:
+    """
+    Melengkapi tabel toko dengan nilai default dan memvalidasinya.
+
+    Args:
+        df_toko: Satu baris per toko; wajib ``laju_kedatangan``, opsional
+            ``toko``, ``random_seed``, dan kolom di ``KOLOM_TOKO``
+        seed_awal: Seed toko pertama jika ``random_seed`` tidak ada
+
+    Returns:
+        DataFrame toko lengkap (indeks 0..N-1)
+    """
+    if 'laju_kedatangan' not in df_toko:
+        raise ValueError("Tabel toko wajib memiliki kolom laju_kedatangan")
+    df = df_toko.reset_index(drop=True).copy()
+    if 'toko' not in df:
+        df['toko'] = [f'Toko_{i + 1:03d}' for i in range(len(df))]
+    if not df['toko'].is_unique:
+        raise ValueError("Nama toko harus unik")
+    for nama, default in KOLOM_TOKO.items():
+        df[nama] = df[nama].fillna(default) if nama in df else default
+    if 'random_seed' not in df:
+        df['random_seed'] = np.arange(seed_awal, seed_awal + len(df))
+
+    df['laju_kedatangan'] = df['laju_kedatangan'].astype(float)
+    for nama in ('durasi_simulasi', 'jumlah_kasir', 'jumlah_staff_ambil', 'random_seed'):
+        df[nama] = df[nama].astype(int)
+    if (df['laju_kedatangan'] <= 0).any():
+        raise ValueError("laju_kedatangan harus > 0")
+    if ((df['jumlah_kasir'] < 1) | (df['jumlah_staff_ambil'] < 1)).any():
+        raise ValueError("jumlah_kasir dan jumlah_staff_ambil minimal 1")
+    df['wilayah'] = df['wilayah'].astype(str)
+    return df
+
+
+def _simulasi_batch_toko(tugas: Tuple[Dict, List[int], List[float], List[int], List[str]]):
+    """Satu batch toko dengan konfigurasi sama (dieksekusi di worker)."""
+    kelompok, indeks, laju, seeds, wilayah = tugas
+    config = KonfigurasiSimulasi(
+        laju_kedatangan=laju[0],
+        durasi_simulasi=kelompok['durasi_simulasi'],
+        kapasitas_kasir=kelompok['jumlah_kasir'],
+        kapasitas_ambil=kelompok['jumlah_staff_ambil'],
+        waktu_layanan_pesan=kelompok['waktu_layanan_pesan'],
+        waktu_layanan_bayar=kelompok['waktu_layanan_bayar'],
+        waktu_layanan_ambil=kelompok['waktu_layanan_ambil']
+    )
+    sketsa: List[SketsaKPI] = []
+    df_kpi = simulasi_batch_konfigurasi(config, seeds, sketsa, laju_kedatangan=laju)
+    df_kpi.index = indeks
+
+    sketsa_wilayah: Dict[str, SketsaKPI] = {}
+    for nama, s in zip(wilayah, sketsa):
+        sketsa_wilayah.setdefault(nama, SketsaKPI()).gabung(s)
+    return df_kpi.drop(columns='random_seed'), sketsa_wilayah
+
+
+def _daftar_tugas(df: pd.DataFrame, ukuran_batch: int) -> List[tuple]:
+    """Batch toko per kelompok konfigurasi, laju berdekatan dalam satu batch."""
+    tugas = []
+    for kunci, kelompok in df.groupby(list(KOLOM_KELOMPOK), sort=False):
+        # Laju serupa -> jumlah mobil serupa -> sedikit padding di array batch
+        kelompok = kelompok.sort_values('laju_kedatangan')
+        parameter = {
+            nama: (nilai.item() if hasattr(nilai, 'item') else nilai)
+            for nama, nilai in zip(KOLOM_KELOMPOK, kunci)
+        }
+        for awal in range(0, len(kelompok), ukuran_batch):
+            bagian = kelompok.iloc[awal:awal + ukuran_batch]
+            tugas.append((
+                parameter,
+                bagian.index.tolist(),
+                bagian['laju_kedatangan'].tolist(),
+                bagian['random_seed'].tolist(),
+                bagian['wilayah'].tolist(),
+            ))
+    return tugas
+
+
+def _ringkas(df_toko: pd.DataFrame, sketsa: SketsaKPI) -> Dict[str, float]:
+    """KPI agregat sekelompok toko (rata-rata tertimbang mobil + persentil sketsa)."""
+    utilisasi = df_toko[['utilisasi_pesan', 'utilisasi_bayar', 'utilisasi_ambil']]
+    return {
+        'jumlah_toko': len(df_toko),
+        'total_mobil': int(df_toko['total_mobil'].sum()),
+        'throughput': round(float(df_toko['throughput'].sum()), 2),
+        'rata_waktu_tunggu': round(sketsa.tunggu.rata_rata, 2) if sketsa.tunggu.jumlah else 0.0,
+        'rata_waktu_sistem': round(sketsa.sistem.rata_rata, 2) if sketsa.sistem.jumlah else 0.0,
+        **sketsa.ringkasan(),
+        'rata_utilisasi_pesan': round(float(utilisasi['utilisasi_pesan'].mean()), 2),
+        'rata_utilisasi_bayar': round(float(utilisasi['utilisasi_bayar'].mean()), 2),
+        'rata_utilisasi_ambil': round(float(utilisasi['utilisasi_ambil'].mean()), 2),
+        'toko_kritis': int((utilisasi.max(axis=1) >= 95).sum()),
+    }
+
+
+def simulasi_armada(
+    df_toko: pd.DataFrame,
+    eksekutor: Optional[Eksekutor] = None,
+    ukuran_batch: int = UKURAN_BATCH,
+    seed_awal: int = 1
+) -> HasilArmada:
+    """
+    Mensimulasikan seluruh armada toko.
+
+    Args:
+        df_toko: Tabel toko (lihat ``siapkan_armada``)
+        eksekutor: Backend eksekusi (default: ``EksekutorProses``)
+        ukuran_batch: Toko maksimum per batch array
+        seed_awal: Seed toko pertama jika tabel tidak memiliki ``random_seed``
+
+    Returns:
+        ``HasilArmada``
+    """
+    mulai = time.perf_counter()
+    df = siapkan_armada(df_toko, seed_awal)
+    daftar_tugas = _daftar_tugas(df, ukuran_batch)
+
+    bagian_kpi = []
+    sketsa: Dict[str, SketsaKPI] = {}
+
+    def _kumpulkan(hasil_tugas):
+        for _, (df_kpi, sketsa_batch) in hasil_tugas:
+            bagian_kpi.append(df_kpi)
+            for wilayah, s in sketsa_batch.items():
+                sketsa.setdefault(wilayah, SketsaKPI()).gabung(s)
+
+    if eksekutor is None:
+        with EksekutorProses() as eksekutor:
+            _kumpulkan(eksekutor.imap(_simulasi_batch_toko, daftar_tugas, ukuran_chunk=1))
+    else:
+        _kumpulkan(eksekutor.imap(_simulasi_batch_toko, daftar_tugas, ukuran_chunk=1))
+
+    kpi = pd.concat(bagian_kpi).sort_index() if bagian_kpi else pd.DataFrame(index=df.index)
+    per_toko = df.join(kpi)
+
+    per_wilayah = pd.DataFrame([
+        {'wilayah': wilayah, **_ringkas(per_toko[per_toko['wilayah'] == wilayah], sketsa[wilayah])}
+        for wilayah in sorted(sketsa)
+    ])
+    agregat = _ringkas(per_toko, SketsaKPI.gabung_semua(sketsa.values()))
+
+    return HasilArmada(
+        per_toko=per_toko,
+        per_wilayah=per_wilayah,
+        agregat=agregat,
+        sketsa=sketsa,
+        waktu_komputasi=time.perf_counter() - mulai
+    )
+
+
+def baca_armada(path: str) -> pd.DataFrame:
+    """Membaca tabel toko dari CSV, Parquet, JSON, atau JSON Lines."""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return pd.read_csv(path)
+    if suffix == '.parquet':
+        return pd.read_parquet(path)
+    if suffix == '.json':
+        return pd.read_json(path)
+    if suffix in ('.jsonl', '.ndjson'):
+        return pd.read_json(path, lines=True)
+    raise ValueError(f"Format file toko tidak dikenal: {suffix}")
+
+
+def contoh_armada(jumlah_toko: int, seed: int = 0) -> pd.DataFrame:
+    """Armada sintetis (laju dan staffing acak, 4 wilayah) untuk uji skala."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'toko': [f'Toko_{i + 1:04d}' for i in range(jumlah_toko)],
+        'laju_kedatangan': np.round(rng.uniform(1.6, 4.0, jumlah_toko), 1),
+        'jumlah_kasir': rng.integers(1, 3, jumlah_toko),
+        'jumlah_staff_ambil': rng.integers(1, 4, jumlah_toko),
+        'wilayah': rng.choice(['Barat', 'Timur', 'Utara', 'Selatan'], jumlah_toko),
+    })
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line."""
+    parser = argparse.ArgumentParser(description="Simulasi armada multi-toko Drive-Thru.")
+    parser.add_argument('input', nargs='?', default=None, help="Tabel toko (CSV/Parquet/JSON/JSONL)")
+    parser.add_argument('--contoh', type=int, default=None, metavar='N',
+                        help="Pakai armada sintetis N toko alih-alih file")
+    parser.add_argument('-o', '--output', default=None, help="Tulis KPI per toko (CSV/Parquet)")
+    parser.add_argument('--batch', type=int, default=UKURAN_BATCH, help="Toko per batch array")
+    parser.add_argument('--seed', type=int, default=1, help="Seed toko pertama")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Jumlah proses worker")
+    args = parser.parse_args(argv)
+
+    if (args.input is None) == (args.contoh is None):
+        parser.error("Berikan file tabel toko atau --contoh N")
+    df_toko = contoh_armada(args.contoh) if args.contoh is not None else baca_armada(args.input)
+
+    with EksekutorProses(args.workers) as eksekutor:
+        hasil = simulasi_armada(df_toko, eksekutor, args.batch, args.seed)
+
+    if args.output:
+        if args.output.lower().endswith('.parquet'):
+            hasil.per_toko.to_parquet(args.output, index=False)
+        else:
+            hasil.per_toko.to_csv(args.output, index=False)
+
+    with pd.option_context('display.float_format', '{:.2f}'.format, 'display.width', 160):
+        print(hasil.per_wilayah.to_string(index=False))
+    print()
+    for nama, nilai in hasil.agregat.items():
+        print(f"{nama:<28}: {nilai}")
+    print(f"\n{len(hasil.per_toko)} toko dalam {hasil.waktu_komputasi:.2f} detik")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
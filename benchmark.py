@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Engine Simulasi Drive-Thru
+====================================
+
+Mengukur waktu komputasi, puncak memori, dan jumlah alokasi per mobil
+untuk engine SimPy (``jalankan_simulasi``) dan engine array
+(``engine_batch.jalankan_simulasi_vektor``).
+
+- Waktu: median beberapa run tanpa tracemalloc (tracemalloc memperlambat)
+- Puncak memori: ``tracemalloc`` selama satu run penuh
+- Alokasi per mobil: blok memori yang masih hidup dan dialokasikan dari
+  ``simulation.py`` setelah ``env.run`` (state per mobil yang ditahan
+  sampai DataFrame dibangun), dibagi jumlah mobil selesai
+- Memori hasil: ukuran ``df_log`` + ``df_antrean`` yang disimpan di sesi
+
+Contoh:
+    python benchmark.py
+    python benchmark.py --laju 0.5 --durasi 480 --ulang 10
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import simulation
+from engine_batch import jalankan_simulasi_vektor
+from simulation import KonfigurasiSimulasi, SimulasiDriveThru, jalankan_simulasi, ukuran_memori
+
+
+def _ukur_waktu(fungsi: Callable[[], object], ulang: int) -> float:
+    """Median waktu eksekusi (detik)."""
+    durasi = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        durasi.append(time.perf_counter() - mulai)
+    return statistics.median(durasi)
+
+
+def _ukur_puncak_memori(fungsi: Callable[[], object]) -> int:
+    """Puncak memori Python (byte) selama satu pemanggilan."""
+    tracemalloc.start()
+    try:
+        fungsi()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def alokasi_per_mobil(config: KonfigurasiSimulasi) -> Dict[str, float]:
+    """
+    Blok memori per mobil yang ditahan engine SimPy setelah ``env.run``.
+
+    Args:
+        config: Konfigurasi simulasi
+
+    Returns:
+        Dictionary ``mobil``, ``blok_per_mobil``, dan ``byte_per_mobil``
+    """
+    simulasi = SimulasiDriveThru(config)
+    ambil_snapshot = {}
+    buat_dataframe = simulasi._buat_dataframe_log
+
+    def _snapshot_lalu_buat():
+        # Dipanggil tepat setelah env.run, sebelum catatan diubah ke DataFrame
+        ambil_snapshot['snapshot'] = tracemalloc.take_snapshot()
+        return buat_dataframe()
+
+    simulasi._buat_dataframe_log = _snapshot_lalu_buat
+    tracemalloc.start()
+    try:
+        simulasi.jalankan()
+    finally:
+        tracemalloc.stop()
+
+    filter_modul = [tracemalloc.Filter(True, simulation.__file__)]
+    statistik = ambil_snapshot['snapshot'].filter_traces(filter_modul).statistics('filename')
+    blok = sum(s.count for s in statistik)
+    ukuran = sum(s.size for s in statistik)
+    jumlah_mobil = max(len(simulasi.log_data), 1)
+    return {
+        'mobil': len(simulasi.log_data),
+        'blok_per_mobil': blok / jumlah_mobil,
+        'byte_per_mobil': ukuran / jumlah_mobil,
+    }
+
+
+def jalankan_benchmark(
+    laju_kedatangan: float = 2.0,
+    durasi_simulasi: int = 240,
+    jumlah_kasir: int = 1,
+    jumlah_staff_ambil: int = 1,
+    ulang: int = 5
+) -> pd.DataFrame:
+    """
+    Menjalankan benchmark kedua engine.
+
+    Returns:
+        DataFrame satu baris per engine
+    """
+    parameter = {
+        'laju_kedatangan': laju_kedatangan,
+        'durasi_simulasi': durasi_simulasi,
+        'jumlah_kasir': jumlah_kasir,
+        'jumlah_staff_ambil': jumlah_staff_ambil,
+    }
+    config = KonfigurasiSimulasi(
+        laju_kedatangan=laju_kedatangan,
+        durasi_simulasi=durasi_simulasi,
+        kapasitas_kasir=jumlah_kasir,
+        kapasitas_ambil=jumlah_staff_ambil
+    )
+
+    baris = []
+    for nama, fungsi in (
+        ('simpy', lambda: jalankan_simulasi(**parameter)),
+        ('vektor', lambda: jalankan_simulasi_vektor(**parameter)),
+    ):
+        df_log, df_antrean, _, _ = fungsi()
+        baris.append({
+            'engine': nama,
+            'waktu_ms': _ukur_waktu(fungsi, ulang) * 1000,
+            'puncak_memori_kb': _ukur_puncak_memori(fungsi) / 1024,
+            'memori_hasil_kb': ukuran_memori(df_log, df_antrean) / 1024,
+        })
+
+    alokasi = alokasi_per_mobil(config)
+    baris[0].update(alokasi)
+    return pd.DataFrame(baris).set_index('engine')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line."""
+    parser = argparse.ArgumentParser(description="Benchmark engine simulasi Drive-Thru.")
+    parser.add_argument('--laju', type=float, default=2.0, help="Interval kedatangan (menit)")
+    parser.add_argument('--durasi', type=int, default=240, help="Durasi simulasi (menit)")
+    parser.add_argument('--kasir', type=int, default=1, help="Jumlah kasir")
+    parser.add_argument('--staff', type=int, default=1, help="Jumlah staff ambil")
+    parser.add_argument('--ulang', type=int, default=5, help="Jumlah run pengukuran waktu")
+    args = parser.parse_args(argv)
+
+    df = jalankan_benchmark(args.laju, args.durasi, args.kasir, args.staff, args.ulang)
+    with pd.option_context('display.float_format', '{:.2f}'.format):
+        print(df)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
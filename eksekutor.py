@@ -0,0 +1,521 @@
+# -*- coding: utf-8 -*-
+"""
+Backend Eksekutor untuk Replikasi dan Sweep
+===========================================
+
+Abstraksi eksekusi tugas simulasi dengan tiga backend:
+
+1. ``EksekutorLokal``  - berurutan di proses yang sama (debugging, tes)
+2. ``EksekutorProses`` - process pool lokal, memakai semua core mesin
+3. ``EksekutorTCP``    - protokol worker TCP ringan; worker dijalankan
+   dengan ``python eksekutor.py worker --port 9100`` di mesin mana pun
+
+Tugas dibagi menjadi chunk. Chunk yang hilang karena worker mati dikirim
+ulang (maksimal ``maks_percobaan`` kali). Hasil selalu disusun menurut urutan
+tugas, bukan urutan selesai, sehingga penggabungan deterministik; untuk
+replikasi dan sweep urutan tugas adalah urutan seed.
+
+Catatan keamanan: protokol TCP memakai pickle, jadi hanya untuk jaringan
+tepercaya. Worker default hanya mendengarkan 127.0.0.1; pakai ``--token``
+saat membuka worker ke jaringan lain. Token dikirim sebagai byte mentah dan
+dibandingkan (``hmac.compare_digest``) sebelum pesan pickle apa pun dibaca,
+jadi klien tanpa token tidak dapat mengirim payload pickle. Token tidak
+dienkripsi; siapa pun yang dapat menyadap jaringan tetap dapat mencurinya.
+
+Contoh (beberapa worker di localhost):
+    proses, alamat = mulai_worker_lokal(3)
+    with EksekutorTCP(alamat) as eksekutor:
+        hasil = eksekutor.jalankan(fungsi, daftar_tugas)
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import hmac
+import math
+import os
+import pickle
+import queue
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+
+Alamat = Tuple[str, int]
+
+# Batas panjang frame token; frame sebelum autentikasi tidak boleh besar
+PANJANG_TOKEN_MAKS = 4096
+
+
+def _bagi_chunk(jumlah_tugas: int, ukuran_chunk: int) -> List[List[int]]:
+    """Membagi indeks tugas menjadi chunk berurutan."""
+    ukuran_chunk = max(1, ukuran_chunk)
+    return [
+        list(range(awal, min(awal + ukuran_chunk, jumlah_tugas)))
+        for awal in range(0, jumlah_tugas, ukuran_chunk)
+    ]
+
+
+def _jalankan_chunk(fungsi: Callable, chunk: List[Any]) -> List[Any]:
+    """Menjalankan satu chunk tugas (dieksekusi di worker)."""
+    return [fungsi(tugas) for tugas in chunk]
+
+
+class Eksekutor:
+    """
+    Kelas dasar backend eksekusi.
+
+    Subclass cukup mengimplementasikan ``imap``; ``jalankan`` menyusun
+    hasilnya menurut urutan tugas.
+    """
+
+    def imap(
+        self,
+        fungsi: Callable,
+        daftar_tugas: Sequence[Any],
+        ukuran_chunk: Optional[int] = None
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Menjalankan ``fungsi`` untuk setiap tugas.
+
+        Args:
+            fungsi: Fungsi level-modul (harus bisa di-pickle)
+            daftar_tugas: Argumen tunggal untuk setiap pemanggilan
+            ukuran_chunk: Jumlah tugas per chunk (default: otomatis)
+
+        Yields:
+            Tuple (indeks_tugas, hasil) dalam urutan selesai
+        """
+        raise NotImplementedError
+
+    def jalankan(
+        self,
+        fungsi: Callable,
+        daftar_tugas: Sequence[Any],
+        ukuran_chunk: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Seperti ``imap`` tetapi mengembalikan list hasil sesuai urutan tugas.
+
+        Returns:
+            List hasil, ``hasil[i]`` milik ``daftar_tugas[i]``
+        """
+        hasil = [None] * len(daftar_tugas)
+        for indeks, nilai in self.imap(fungsi, daftar_tugas, ukuran_chunk):
+            hasil[indeks] = nilai
+        return hasil
+
+    @property
+    def jumlah_worker(self) -> int:
+        """Jumlah tugas yang dapat berjalan bersamaan."""
+        return 1
+
+    def _ukuran_chunk_default(self, jumlah_tugas: int) -> int:
+        # Sekitar 4 chunk per worker: cukup kecil untuk load balancing,
+        # cukup besar agar overhead pengiriman tidak dominan
+        return max(1, math.ceil(jumlah_tugas / (self.jumlah_worker * 4)))
+
+    def tutup(self):
+        """Melepaskan resource backend."""
+
+    def __enter__(self) -> 'Eksekutor':
+        return self
+
+    def __exit__(self, *exc):
+        self.tutup()
+
+
+class EksekutorLokal(Eksekutor):
+    """Backend berurutan di proses yang sama."""
+
+    def imap(self, fungsi, daftar_tugas, ukuran_chunk=None):
+        for indeks, tugas in enumerate(daftar_tugas):
+            yield indeks, fungsi(tugas)
+
+
+class EksekutorProses(Eksekutor):
+    """
+    Backend process pool lokal.
+
+    Pool dibuat sekali dan dipakai ulang antar pemanggilan. Jika sebuah
+    worker mati (``BrokenProcessPool``), pool dibuat ulang dan chunk yang
+    belum selesai dikirim ulang.
+    """
+
+    def __init__(self, workers: Optional[int] = None, maks_percobaan: int = 3):
+        """
+        Args:
+            workers: Jumlah proses worker (default: jumlah CPU)
+            maks_percobaan: Batas pengiriman ulang per chunk
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.maks_percobaan = maks_percobaan
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def jumlah_worker(self) -> int:
+        return self.workers
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def imap(self, fungsi, daftar_tugas, ukuran_chunk=None):
+        ukuran_chunk = ukuran_chunk or self._ukuran_chunk_default(len(daftar_tugas))
+        sisa = dict(enumerate(_bagi_chunk(len(daftar_tugas), ukuran_chunk)))
+        percobaan: Counter = Counter()
+
+        while sisa:
+            pool = self._get_pool()
+            futures = {
+                pool.submit(_jalankan_chunk, fungsi, [daftar_tugas[i] for i in indeks]): id_chunk
+                for id_chunk, indeks in sisa.items()
+            }
+            try:
+                for future in as_completed(futures):
+                    id_chunk = futures[future]
+                    for indeks, nilai in zip(sisa[id_chunk], future.result()):
+                        yield indeks, nilai
+                    del sisa[id_chunk]
+            except BrokenProcessPool:
+                # Worker mati: buang pool lama, kirim ulang chunk tersisa
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                for id_chunk in sisa:
+                    percobaan[id_chunk] += 1
+                    if percobaan[id_chunk] >= self.maks_percobaan:
+                        raise RuntimeError(
+                            f"Chunk {id_chunk} gagal {percobaan[id_chunk]}x karena worker mati"
+                        )
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def tutup(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+# =====================================================================
+# PROTOKOL TCP
+# =====================================================================
+def _kirim_pesan(sock: socket.socket, pesan: Any):
+    """Mengirim satu pesan: panjang 8 byte big-endian + payload pickle."""
+    data = pickle.dumps(pesan, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(struct.pack('>Q', len(data)) + data)
+
+
+def _terima_tepat(sock: socket.socket, jumlah: int) -> bytes:
+    potongan = []
+    while jumlah > 0:
+        data = sock.recv(min(jumlah, 1 << 20))
+        if not data:
+            raise ConnectionError("Koneksi ditutup oleh lawan bicara")
+        potongan.append(data)
+        jumlah -= len(data)
+    return b''.join(potongan)
+
+
+def _terima_pesan(sock: socket.socket) -> Any:
+    """Menerima satu pesan yang dikirim ``_kirim_pesan``."""
+    (panjang,) = struct.unpack('>Q', _terima_tepat(sock, 8))
+    return pickle.loads(_terima_tepat(sock, panjang))
+
+
+def _kirim_mentah(sock: socket.socket, data: bytes):
+    """Mengirim byte mentah (tanpa pickle) dengan prefiks panjang 8 byte."""
+    sock.sendall(struct.pack('>Q', len(data)) + data)
+
+
+def _terima_mentah(sock: socket.socket, panjang_maks: int) -> bytes:
+    """Menerima byte mentah dari ``_kirim_mentah`` (maksimal ``panjang_maks``)."""
+    (panjang,) = struct.unpack('>Q', _terima_tepat(sock, 8))
+    if panjang > panjang_maks:
+        raise ConnectionError(f"Frame handshake terlalu panjang ({panjang} byte)")
+    return _terima_tepat(sock, panjang)
+
+
+def _token_bytes(token: Optional[str]) -> bytes:
+    return (token or '').encode('utf-8')
+
+
+def _layani_koneksi(conn: socket.socket, token: Optional[str]):
+    """Melayani satu klien sampai klien menutup koneksi."""
+    # Autentikasi dengan byte mentah: tidak ada pickle sebelum token cocok
+    token_klien = _terima_mentah(conn, PANJANG_TOKEN_MAKS)
+    if not hmac.compare_digest(token_klien, _token_bytes(token)):
+        _kirim_mentah(conn, b'ditolak')
+        return
+    _kirim_mentah(conn, b'siap')
+
+    while True:
+        pesan = _terima_pesan(conn)
+        if pesan[0] == 'selesai':
+            return
+        _, id_chunk, fungsi, chunk = pesan
+        try:
+            hasil = _jalankan_chunk(fungsi, chunk)
+        except Exception:
+            _kirim_pesan(conn, ('error', id_chunk, traceback.format_exc()))
+        else:
+            _kirim_pesan(conn, ('hasil', id_chunk, hasil))
+
+
+def jalankan_worker(host: str = '127.0.0.1', port: int = 9100, token: Optional[str] = None):
+    """
+    Menjalankan worker TCP (blocking). Satu klien dilayani pada satu waktu.
+
+    Args:
+        host: Alamat bind
+        port: Port TCP
+        token: Token bersama yang harus dikirim klien (opsional)
+    """
+    if not token and host not in ('127.0.0.1', 'localhost', '::1'):
+        print(f"Peringatan: worker {host}:{port} tanpa --token menerima pickle dari siapa pun",
+              file=sys.stderr)
+    with socket.create_server((host, port)) as server:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    _layani_koneksi(conn, token)
+                except (ConnectionError, EOFError, OSError):
+                    # Klien hilang di tengah jalan; tunggu klien berikutnya
+                    continue
+                except Exception as e:
+                    # Pesan rusak (mis. modul fungsi tidak ada di worker)
+                    print(f"Worker {host}:{port}: {type(e).__name__}: {e}", file=sys.stderr)
+
+
+class EksekutorTCP(Eksekutor):
+    """
+    Backend worker TCP.
+
+    Setiap alamat worker dilayani satu thread klien yang mengambil chunk
+    dari antrean bersama. Jika koneksi ke worker putus, chunk yang sedang
+    dikerjakan dikembalikan ke antrean untuk worker lain.
+    """
+
+    def __init__(
+        self,
+        alamat: List[Alamat],
+        token: Optional[str] = None,
+        maks_percobaan: int = 3,
+        timeout_koneksi: float = 10.0
+    ):
+        """
+        Args:
+            alamat: List (host, port) worker
+            token: Token bersama worker (opsional)
+            maks_percobaan: Batas pengiriman ulang per chunk
+            timeout_koneksi: Timeout saat membuka koneksi (detik)
+        """
+        if not alamat:
+            raise ValueError("Minimal satu alamat worker diperlukan")
+        self.alamat = list(alamat)
+        self.token = token
+        self.maks_percobaan = maks_percobaan
+        self.timeout_koneksi = timeout_koneksi
+
+    @property
+    def jumlah_worker(self) -> int:
+        return len(self.alamat)
+
+    def _klien(self, alamat, fungsi, daftar_tugas, chunks, antrean, kotak_hasil, selesai):
+        try:
+            sock = socket.create_connection(alamat, timeout=self.timeout_koneksi)
+            sock.settimeout(None)
+            _kirim_mentah(sock, _token_bytes(self.token))
+            if _terima_mentah(sock, PANJANG_TOKEN_MAKS) != b'siap':
+                raise ConnectionError(f"Worker {alamat} menolak token")
+        except (OSError, EOFError, ConnectionError) as e:
+            kotak_hasil.put(('worker_hilang', alamat, None, repr(e)))
+            return
+
+        with sock:
+            while not selesai.is_set():
+                try:
+                    id_chunk = antrean.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                chunk = [daftar_tugas[i] for i in chunks[id_chunk]]
+                try:
+                    _kirim_pesan(sock, ('tugas', id_chunk, fungsi, chunk))
+                    jenis, id_balasan, isi = _terima_pesan(sock)
+                except (OSError, EOFError, ConnectionError) as e:
+                    kotak_hasil.put(('worker_hilang', alamat, id_chunk, repr(e)))
+                    return
+                kotak_hasil.put((jenis, alamat, id_balasan, isi))
+            try:
+                _kirim_pesan(sock, ('selesai',))
+            except OSError:
+                pass
+
+    def imap(self, fungsi, daftar_tugas, ukuran_chunk=None):
+        ukuran_chunk = ukuran_chunk or self._ukuran_chunk_default(len(daftar_tugas))
+        chunks = _bagi_chunk(len(daftar_tugas), ukuran_chunk)
+        if not chunks:
+            return
+
+        antrean: queue.Queue = queue.Queue()
+        for id_chunk in range(len(chunks)):
+            antrean.put(id_chunk)
+        kotak_hasil: queue.Queue = queue.Queue()
+        selesai = threading.Event()
+
+        threads = [
+            threading.Thread(
+                target=self._klien,
+                args=(alamat, fungsi, daftar_tugas, chunks, antrean, kotak_hasil, selesai),
+                daemon=True
+            )
+            for alamat in self.alamat
+        ]
+        for thread in threads:
+            thread.start()
+
+        sisa = set(range(len(chunks)))
+        worker_hidup = len(threads)
+        percobaan: Counter = Counter()
+        try:
+            while sisa:
+                jenis, alamat, id_chunk, isi = kotak_hasil.get()
+                if jenis == 'hasil':
+                    if id_chunk in sisa:
+                        for indeks, nilai in zip(chunks[id_chunk], isi):
+                            yield indeks, nilai
+                        sisa.discard(id_chunk)
+                elif jenis == 'error':
+                    raise RuntimeError(f"Tugas gagal di worker {alamat}:\n{isi}")
+                elif jenis == 'worker_hilang':
+                    worker_hidup -= 1
+                    if id_chunk is not None:
+                        percobaan[id_chunk] += 1
+                        if percobaan[id_chunk] >= self.maks_percobaan:
+                            raise RuntimeError(
+                                f"Chunk {id_chunk} gagal {percobaan[id_chunk]}x karena worker hilang"
+                            )
+                        antrean.put(id_chunk)
+                    if worker_hidup == 0:
+                        raise RuntimeError(f"Semua worker TCP hilang (terakhir {alamat}: {isi})")
+        finally:
+            selesai.set()
+            for thread in threads:
+                thread.join(timeout=1.0)
+
+
+def mulai_worker_lokal(
+    jumlah: int,
+    port_awal: int = 9100,
+    token: Optional[str] = None,
+    timeout: float = 15.0
+) -> Tuple[List[subprocess.Popen], List[Alamat]]:
+    """
+    Menjalankan beberapa worker TCP sebagai subprocess di localhost.
+
+    Berguna untuk menguji backend TCP tanpa cluster.
+
+    Args:
+        jumlah: Jumlah worker
+        port_awal: Port worker pertama (berikutnya +1, +2, ...)
+        token: Token bersama (opsional)
+        timeout: Batas waktu menunggu worker siap (detik)
+
+    Returns:
+        Tuple (list proses, list alamat). Matikan proses dengan ``terminate()``.
+    """
+    proses = []
+    alamat = []
+    for i in range(jumlah):
+        port = port_awal + i
+        perintah = [sys.executable, os.path.abspath(__file__), 'worker', '--port', str(port)]
+        if token:
+            perintah += ['--token', token]
+        proses.append(subprocess.Popen(perintah, cwd=os.path.dirname(os.path.abspath(__file__))))
+        alamat.append(('127.0.0.1', port))
+
+    batas = time.monotonic() + timeout
+    for host, port in alamat:
+        while True:
+            try:
+                # Koneksi tanpa handshake langsung ditutup; worker lanjut menunggu
+                socket.create_connection((host, port), timeout=0.5).close()
+                break
+            except OSError:
+                if time.monotonic() > batas:
+                    for p in proses:
+                        p.terminate()
+                    raise RuntimeError(f"Worker {host}:{port} tidak siap dalam {timeout} detik")
+                time.sleep(0.1)
+    return proses, alamat
+
+
+def parse_alamat(teks: str) -> List[Alamat]:
+    """Parse ``host:port,host:port`` menjadi list alamat."""
+    alamat = []
+    for bagian in teks.split(','):
+        host, _, port = bagian.strip().rpartition(':')
+        alamat.append((host or '127.0.0.1', int(port)))
+    return alamat
+
+
+def buat_eksekutor(
+    backend: str = 'proses',
+    workers: Optional[int] = None,
+    alamat_worker: Optional[str] = None,
+    token: Optional[str] = None
+) -> Eksekutor:
+    """
+    Membuat eksekutor dari nama backend (dipakai opsi command-line).
+
+    Args:
+        backend: ``'lokal'``, ``'proses'``, atau ``'tcp'``
+        workers: Jumlah proses untuk backend ``proses``
+        alamat_worker: ``host:port,...`` untuk backend ``tcp``
+        token: Token worker TCP
+
+    Returns:
+        Instance ``Eksekutor``
+    """
+    if backend == 'lokal':
+        return EksekutorLokal()
+    if backend == 'proses':
+        return EksekutorProses(workers)
+    if backend == 'tcp':
+        if not alamat_worker:
+            raise ValueError("Backend tcp membutuhkan alamat worker (host:port,...)")
+        return EksekutorTCP(parse_alamat(alamat_worker), token=token)
+    raise ValueError(f"Backend eksekutor tidak dikenal: {backend}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line untuk menjalankan worker TCP."""
+    parser = argparse.ArgumentParser(description="Worker TCP simulasi Drive-Thru.")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+    worker = sub.add_parser('worker', help="Jalankan worker TCP")
+    worker.add_argument('--host', default='127.0.0.1', help="Alamat bind (default: 127.0.0.1)")
+    worker.add_argument('--port', type=int, default=9100, help="Port TCP")
+    worker.add_argument('--token', default=None, help="Token bersama untuk klien")
+    args = parser.parse_args(argv)
+
+    if args.perintah == 'worker':
+        try:
+            jalankan_worker(args.host, args.port, args.token)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
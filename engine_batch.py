@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""
+Engine Simulasi Batch Berbasis Array
+====================================
+
+Menjalankan R replikasi independen jalur Pesan -> Bayar -> Ambil sekaligus
+sebagai array NumPy berukuran (R x mobil). Alih-alih antrean event SimPy,
+waktu setiap mobil dihitung dengan rekursi antrean FIFO:
+
+- Stasiun 1 server (rekursi Lindley): ``mulai_k = max(datang_k, selesai_{k-1})``
+- Stasiun c server: mobil ke-k dilayani server yang paling cepat bebas,
+  ``mulai_k = max(datang_k, min(bebas))``
+
+Loop Python hanya berjalan sepanjang jumlah mobil; setiap langkahnya
+memproses seluruh replikasi sebagai vektor. Mobil tiba di stasiun Ambil
+tidak lagi berurutan (kasir > 1), jadi kedatangan diurutkan per replikasi.
+
+Definisi KPI sama dengan ``simulation.hitung_statistik``: hanya mobil yang
+selesai sebelum ``durasi_simulasi`` dihitung, waktu per mobil dibulatkan
+2 desimal, dan utilisasi memakai rumus ``SimulasiDriveThru._hitung_utilisasi``.
+Variat diambil dari stream per sumber (``distribusi.STREAM``) dengan pola blok
+yang sama seperti engine SimPy, sehingga timestamp setiap mobil untuk seed
+yang sama identik.
+
+Contoh:
+    df = simulasi_batch(1000, laju_kedatangan=1.5, jumlah_kasir=2)
+    df['rata_waktu_tunggu'].describe()
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import math
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from distribusi import Distribusi, Eksponensial, PenyampelBlok, buat_generator
+from jejak_kedatangan import isi_layanan
+from simulation import (
+    KonfigurasiSimulasi, buat_dataframe_antrean, buat_dataframe_log, hitung_kolom_waktu,
+    hitung_persentil
+)
+from sketsa_kuantil import SketsaKPI
+
+
+def _bangkitkan_kedatangan(penyampel: PenyampelBlok, rata_rata: float, durasi: float) -> np.ndarray:
+    """Waktu kedatangan (< durasi) satu replikasi."""
+    ukuran = int(durasi / rata_rata + 6 * math.sqrt(durasi / rata_rata)) + 16
+    antar = penyampel.ambil(ukuran)
+    # Perpanjang stream yang sama sampai melewati durasi
+    while antar.sum() < durasi:
+        antar = np.concatenate([antar, penyampel.ambil(ukuran)])
+    # cumsum menjumlah berurutan, sama seperti env.now + timeout di SimPy
+    waktu = np.cumsum(antar)
+    return waktu[waktu < durasi]
+
+
+def _waktu_jejak(datang: np.ndarray) -> np.ndarray:
+    """Waktu kedatangan tercatat persis seperti dijadwalkan SimPy (``now + delay``)."""
+    sekarang = 0.0
+    hasil = []
+    for t in datang.tolist():
+        sekarang += max(t - sekarang, 0.0)
+        hasil.append(sekarang)
+    return np.array(hasil, dtype=float)
+
+
+def _stasiun(datang: np.ndarray, layanan: np.ndarray, kapasitas: int) -> np.ndarray:
+    """
+    Waktu mulai layanan stasiun FIFO ``kapasitas`` server.
+
+    Args:
+        datang: Array (R, K) waktu tiba di stasiun, terurut per baris
+        layanan: Array (R, K) durasi layanan sesuai urutan tiba
+        kapasitas: Jumlah server
+
+    Returns:
+        Array (R, K) waktu mulai layanan
+    """
+    jumlah_baris, jumlah_kolom = datang.shape
+    mulai = np.empty_like(datang)
+
+    if kapasitas == 1:
+        selesai = np.zeros(jumlah_baris)
+        for k in range(jumlah_kolom):
+            np.maximum(datang[:, k], selesai, out=mulai[:, k])
+            selesai = mulai[:, k] + layanan[:, k]
+        return mulai
+
+    bebas = np.zeros((jumlah_baris, kapasitas))
+    baris = np.arange(jumlah_baris)
+    for k in range(jumlah_kolom):
+        server = bebas.argmin(axis=1)
+        np.maximum(datang[:, k], bebas[baris, server], out=mulai[:, k])
+        bebas[baris, server] = mulai[:, k] + layanan[:, k]
+    return mulai
+
+
+def hitung_waktu_batch(
+    config: KonfigurasiSimulasi,
+    seeds: List[Optional[int]],
+    laju_kedatangan: Optional[Sequence[float]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Timestamp setiap mobil untuk seluruh replikasi.
+
+    Kolom di luar jumlah kedatangan replikasi berisi ``inf``.
+
+    Args:
+        config: Konfigurasi simulasi (``random_seed`` diabaikan)
+        seeds: Seed per replikasi
+        laju_kedatangan: Rata-rata menit antar kedatangan per replikasi
+            (default: ``config.laju_kedatangan`` untuk semua), mis. untuk
+            banyak toko dengan staffing sama dalam satu batch; diabaikan jika
+            ``config.jejak_kedatangan`` diisi (semua replikasi memakai
+            kedatangan tercatat yang sama, layanan kosong disampel per seed)
+
+    Returns:
+        Dictionary array (R, K): datang, mulai_pesan, selesai_pesan,
+        mulai_bayar, selesai_bayar, mulai_ambil, selesai
+    """
+    durasi = config.durasi_simulasi
+    distribusi = config.get_distribusi()
+    if laju_kedatangan is None:
+        laju_kedatangan = [config.laju_kedatangan] * len(seeds)
+    jejak = None
+    if config.jejak_kedatangan is not None:
+        jejak = config.jejak_kedatangan.muat(durasi)
+        jejak['datang'] = _waktu_jejak(jejak['datang'])
+    penyampel_ambil = []
+    per_replikasi = []
+    for seed, laju in zip(seeds, laju_kedatangan):
+        rng_datang, rng_pesan, rng_bayar, rng_ambil = buat_generator(seed)
+        if jejak is None:
+            datang = _bangkitkan_kedatangan(
+                PenyampelBlok(Eksponensial(laju), rng_datang), laju, durasi
+            )
+            teramati = {}
+        else:
+            datang, teramati = jejak['datang'], jejak
+        n = len(datang)
+        if 'Ambil' in teramati:
+            # Ambil disampel setelah urutan tiba di Ambil diketahui
+            penyampel_ambil.append(PenyampelBlok(distribusi['Ambil'], rng_ambil))
+            sampel_ambil = None
+        else:
+            sampel_ambil = PenyampelBlok(distribusi['Ambil'], rng_ambil).ambil(n)
+        per_replikasi.append((
+            datang,
+            isi_layanan(teramati.get('Pesan'), PenyampelBlok(distribusi['Pesan'], rng_pesan), n),
+            isi_layanan(teramati.get('Bayar'), PenyampelBlok(distribusi['Bayar'], rng_bayar), n),
+            sampel_ambil,
+        ))
+
+    jumlah_replikasi = len(seeds)
+    lebar = max((len(p[0]) for p in per_replikasi), default=0)
+    datang = np.full((jumlah_replikasi, lebar), np.inf)
+    layanan = np.zeros((3, jumlah_replikasi, lebar))
+    for r, (t, s_pesan, s_bayar, s_ambil) in enumerate(per_replikasi):
+        datang[r, :len(t)] = t
+        layanan[0, r, :len(t)] = s_pesan
+        layanan[1, r, :len(t)] = s_bayar
+        if s_ambil is not None:
+            layanan[2, r, :len(t)] = s_ambil
+
+    with np.errstate(invalid='ignore'):
+        mulai_pesan = _stasiun(datang, layanan[0], 1)
+        selesai_pesan = mulai_pesan + layanan[0]
+        # Pesan 1 server FIFO: urutan tiba di Bayar = urutan kedatangan
+        mulai_bayar = _stasiun(selesai_pesan, layanan[1], config.kapasitas_kasir)
+        selesai_bayar = mulai_bayar + layanan[1]
+
+        # Dengan >1 kasir mobil bisa saling menyalip; urutkan per replikasi.
+        # Layanan Ambil ke-j dipakai oleh mobil ke-j yang tiba di Ambil.
+        urutan = np.argsort(selesai_bayar, axis=1, kind='stable')
+        tiba_ambil = np.take_along_axis(selesai_bayar, urutan, axis=1)
+        if jejak is not None and 'Ambil' in jejak:
+            # Durasi teramati milik mobil; yang kosong disampel urut tiba di Ambil
+            for r, (t, _, _, _) in enumerate(per_replikasi):
+                teramati_urut = jejak['Ambil'][urutan[r, :len(t)]]
+                layanan[2, r, :len(t)] = isi_layanan(teramati_urut, penyampel_ambil[r], len(t))
+        mulai_ambil_urut = _stasiun(tiba_ambil, layanan[2], config.kapasitas_ambil)
+        mulai_ambil = np.empty_like(mulai_ambil_urut)
+        layanan_ambil = np.empty_like(mulai_ambil_urut)
+        np.put_along_axis(mulai_ambil, urutan, mulai_ambil_urut, axis=1)
+        np.put_along_axis(layanan_ambil, urutan, layanan[2], axis=1)
+        selesai = mulai_ambil + layanan_ambil
+
+    return {
+        'datang': datang,
+        'mulai_pesan': mulai_pesan,
+        'selesai_pesan': selesai_pesan,
+        'mulai_bayar': mulai_bayar,
+        'selesai_bayar': selesai_bayar,
+        'mulai_ambil': mulai_ambil,
+        'selesai': selesai,
+    }
+
+
+def _kpi_batch(
+    waktu: Dict[str, np.ndarray],
+    config: KonfigurasiSimulasi,
+    sketsa: Optional[List[SketsaKPI]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    KPI per replikasi, setara ``hitung_statistik`` + utilisasi.
+
+    Jika ``sketsa`` berupa list, sketsa kuantil setiap replikasi ditambahkan
+    ke dalamnya (untuk digabung dengan ``SketsaKPI.gabung_semua``).
+    """
+    durasi = config.durasi_simulasi
+    with np.errstate(invalid='ignore'):
+        valid = waktu['selesai'] < durasi
+        kolom = hitung_kolom_waktu(waktu)
+    tunggu = np.where(valid, np.round(kolom['Total_Waktu_Tunggu'], 2), 0.0)
+    sistem = np.where(valid, np.round(kolom['Total_Waktu_Sistem'], 2), 0.0)
+
+    n = valid.sum(axis=1)
+    ada = n > 0
+    n_aman = np.maximum(n, 1)
+    rata_tunggu = tunggu.sum(axis=1) / n_aman
+    deviasi = np.where(valid, tunggu - rata_tunggu[:, None], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt((deviasi ** 2).sum(axis=1) / (n - 1))
+
+    kpi = {
+        'total_mobil': n,
+        'rata_waktu_tunggu': np.round(rata_tunggu, 2),
+        'max_waktu_tunggu': np.where(ada, np.where(valid, tunggu, -np.inf).max(axis=1, initial=-np.inf), 0.0),
+        'min_waktu_tunggu': np.where(ada, np.where(valid, tunggu, np.inf).min(axis=1, initial=np.inf), 0.0),
+        'rata_waktu_sistem': np.round(sistem.sum(axis=1) / n_aman, 2),
+        'throughput': np.round(n / (durasi / 60), 2),
+        # Seperti pandas: std satu sampel = NaN, tanpa sampel = 0
+        'std_waktu_tunggu': np.where(ada, np.round(std, 2), 0.0),
+    }
+
+    # Persentil eksak langsung dari array (R, K), sama dengan hitung_statistik;
+    # objek sketsa hanya dibangun jika pemanggil memintanya
+    kpi.update(hitung_persentil(tunggu, sistem, valid))
+    if sketsa is not None:
+        sketsa.extend(
+            SketsaKPI.dari_array(tunggu[r, valid[r]], sistem[r, valid[r]])
+            for r in range(len(n))
+        )
+    distribusi = config.get_distribusi()
+    for nama, kapasitas in (
+        ('Pesan', 1),
+        ('Bayar', config.kapasitas_kasir),
+        ('Ambil', config.kapasitas_ambil),
+    ):
+        rata_layanan = distribusi[nama].rata_rata
+        util = np.minimum(n * rata_layanan / (durasi * kapasitas) * 100, 100)
+        kpi[f'utilisasi_{nama.lower()}'] = np.round(util, 2)
+    return kpi
+
+
+def _buat_config(
+    laju_kedatangan: float,
+    durasi_simulasi: int,
+    jumlah_kasir: int,
+    jumlah_staff_ambil: int,
+    distribusi_layanan: Optional[Dict[str, Distribusi]]
+) -> KonfigurasiSimulasi:
+    distribusi_layanan = distribusi_layanan or {}
+    return KonfigurasiSimulasi(
+        laju_kedatangan=laju_kedatangan,
+        durasi_simulasi=durasi_simulasi,
+        kapasitas_kasir=jumlah_kasir,
+        kapasitas_ambil=jumlah_staff_ambil,
+        distribusi_pesan=distribusi_layanan.get('Pesan'),
+        distribusi_bayar=distribusi_layanan.get('Bayar'),
+        distribusi_ambil=distribusi_layanan.get('Ambil')
+    )
+
+
+def simulasi_batch(
+    jumlah_replikasi: int,
+    laju_kedatangan: float = 2.0,
+    durasi_simulasi: int = 240,
+    jumlah_kasir: int = 1,
+    jumlah_staff_ambil: int = 1,
+    seed_awal: int = 1,
+    distribusi_layanan: Optional[Dict[str, Distribusi]] = None
+) -> pd.DataFrame:
+    """
+    Menjalankan banyak replikasi sekaligus dan mengembalikan KPI-nya.
+
+    Replikasi ke-i memakai seed ``seed_awal + i``.
+
+    Args:
+        jumlah_replikasi: Jumlah replikasi R
+        laju_kedatangan: Rata-rata menit antar kedatangan
+        durasi_simulasi: Durasi simulasi (menit)
+        jumlah_kasir: Jumlah kasir
+        jumlah_staff_ambil: Jumlah staff ambil
+        seed_awal: Seed replikasi pertama
+        distribusi_layanan: Distribusi per stasiun, seperti ``jalankan_simulasi``
+
+    Returns:
+        DataFrame satu baris per replikasi: ``random_seed``, KPI
+        ``hitung_statistik``, dan ``utilisasi_<stasiun>``
+    """
+    config = _buat_config(
+        laju_kedatangan, durasi_simulasi, jumlah_kasir, jumlah_staff_ambil, distribusi_layanan
+    )
+    return simulasi_batch_konfigurasi(config, range(seed_awal, seed_awal + jumlah_replikasi))
+
+
+def simulasi_batch_konfigurasi(
+    config: KonfigurasiSimulasi,
+    seeds: Iterable[Optional[int]],
+    sketsa: Optional[List[SketsaKPI]] = None,
+    laju_kedatangan: Optional[Sequence[float]] = None
+) -> pd.DataFrame:
+    """
+    Seperti ``simulasi_batch`` untuk ``KonfigurasiSimulasi`` lengkap
+    (termasuk rata-rata waktu layanan) dan daftar seed bebas.
+
+    Args:
+        config: Konfigurasi simulasi (``random_seed`` diabaikan)
+        seeds: Seed per replikasi
+        sketsa: List opsional; sketsa kuantil setiap replikasi ditambahkan
+            ke dalamnya
+        laju_kedatangan: Interval kedatangan per replikasi (lihat
+            ``hitung_waktu_batch``)
+
+    Returns:
+        DataFrame satu baris per replikasi
+    """
+    seeds = list(seeds)
+    kpi = _kpi_batch(hitung_waktu_batch(config, seeds, laju_kedatangan), config, sketsa)
+    return pd.DataFrame({'random_seed': seeds, **kpi})
+
+
+def jalankan_simulasi_vektor(
+    laju_kedatangan: float = 2.0,
+    durasi_simulasi: int = 240,
+    jumlah_kasir: int = 1,
+    jumlah_staff_ambil: int = 1,
+    random_seed: Optional[int] = 42,
+    distribusi_layanan: Optional[Dict[str, Distribusi]] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], Dict[str, float]]:
+    """
+    Satu replikasi dengan keluaran lengkap seperti ``jalankan_simulasi``.
+
+    Returns:
+        Tuple (df_log, df_antrean, utilisasi, statistik)
+    """
+    config = _buat_config(
+        laju_kedatangan, durasi_simulasi, jumlah_kasir, jumlah_staff_ambil, distribusi_layanan
+    )
+    waktu = {nama: nilai[0] for nama, nilai in hitung_waktu_batch(config, [random_seed]).items()}
+    kpi = {nama: nilai.item() for nama, nilai in _kpi_batch(
+        {nama: nilai[None, :] for nama, nilai in waktu.items()}, config
+    ).items()}
+
+    # Log disusun menurut urutan selesai, seperti engine SimPy
+    valid = np.flatnonzero(waktu['selesai'] < durasi_simulasi)
+    valid = valid[np.argsort(waktu['selesai'][valid], kind='stable')]
+    df_log = buat_dataframe_log(valid + 1, {nama: nilai[valid] for nama, nilai in waktu.items()})
+
+    # Panjang antrean tiap menit = sudah tiba di stasiun - sudah mulai dilayani
+    menit = np.arange(durasi_simulasi, dtype=float)
+    antrean = [
+        np.searchsorted(np.sort(tiba), menit, side='right')
+        - np.searchsorted(np.sort(mulai), menit, side='right')
+        for tiba, mulai in (
+            (waktu['datang'], waktu['mulai_pesan']),
+            (waktu['selesai_pesan'], waktu['mulai_bayar']),
+            (waktu['selesai_bayar'], waktu['mulai_ambil']),
+        )
+    ]
+    df_antrean = buat_dataframe_antrean(menit, *antrean)
+
+    utilisasi = {
+        stasiun: kpi.pop(f'utilisasi_{stasiun.lower()}')
+        for stasiun in ('Pesan', 'Bayar', 'Ambil')
+    }
+    statistik = kpi
+    statistik['total_mobil'] = int(statistik['total_mobil'])
+    return df_log, df_antrean, utilisasi, statistik
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line: ringkasan KPI dan waktu komputasi."""
+    parser = argparse.ArgumentParser(description="Simulasi batch R replikasi berbasis array.")
+    parser.add_argument('-r', '--replikasi', type=int, default=1000, help="Jumlah replikasi")
+    parser.add_argument('--laju', type=float, default=2.0, help="Interval kedatangan (menit)")
+    parser.add_argument('--durasi', type=int, default=240, help="Durasi simulasi (menit)")
+    parser.add_argument('--kasir', type=int, default=1, help="Jumlah kasir")
+    parser.add_argument('--staff', type=int, default=1, help="Jumlah staff ambil")
+    parser.add_argument('--seed', type=int, default=1, help="Seed replikasi pertama")
+    args = parser.parse_args(argv)
+
+    mulai = time.perf_counter()
+    df = simulasi_batch(
+        args.replikasi, args.laju, args.durasi, args.kasir, args.staff, seed_awal=args.seed
+    )
+    durasi = time.perf_counter() - mulai
+
+    print(df.drop(columns='random_seed').describe().T[['mean', 'std', 'min', 'max']].round(3))
+    print(f"\n{args.replikasi} replikasi dalam {durasi:.3f} detik")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
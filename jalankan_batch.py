@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+"""
+Runner Batch Headless Simulasi Drive-Thru
+=========================================
+
+Entry point command-line untuk menjalankan banyak skenario simulasi tanpa
+dashboard Streamlit. Skenario dibaca dari file CSV, JSON, atau JSON Lines,
+dijalankan paralel lewat backend eksekutor (lihat ``eksekutor.py``), dan KPI
+ditulis sebagai JSON Lines atau Parquet. Batch yang terhenti di tengah jalan
+dapat dilanjutkan (``--resume``).
+
+Contoh:
+    python jalankan_batch.py skenario.csv -o hasil.jsonl --workers 4
+    python jalankan_batch.py skenario.jsonl -o hasil.parquet --resume
+    python jalankan_batch.py skenario.csv -o hasil.jsonl --db hasil_simulasi
+    python jalankan_batch.py skenario.csv -o hasil.jsonl --backend tcp \
+        --worker-tcp 127.0.0.1:9100,127.0.0.1:9101
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from eksekutor import Eksekutor, EksekutorProses, buat_eksekutor
+from penyimpanan_hasil import PenyimpananHasil, jalankan_simulasi_tersimpan
+
+
+# Parameter skenario yang diteruskan ke jalankan_simulasi beserta nilai default
+PARAMETER_SKENARIO = {
+    'laju_kedatangan': 2.0,
+    'durasi_simulasi': 240,
+    'jumlah_kasir': 1,
+    'jumlah_staff_ambil': 1,
+    'random_seed': 42,
+}
+
+
+def baca_skenario(path: str) -> List[Dict]:
+    """
+    Membaca daftar skenario dari file.
+
+    Format didukung: ``.csv``, ``.json`` (list of object), dan
+    ``.jsonl``/``.ndjson`` (satu object per baris). Setiap skenario boleh
+    memiliki kolom ``id``; jika tidak ada, nomor baris dipakai sebagai ID.
+
+    Args:
+        path: Lokasi file skenario
+
+    Returns:
+        List dictionary skenario yang sudah dinormalisasi
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        records = pd.read_csv(path).to_dict(orient='records')
+    elif suffix == '.json':
+        with open(path, encoding='utf-8') as f:
+            records = json.load(f)
+    elif suffix in ('.jsonl', '.ndjson'):
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(baris) for baris in f if baris.strip()]
+    else:
+        raise ValueError(f"Format file skenario tidak dikenal: {suffix}")
+
+    daftar_skenario = []
+    for nomor, record in enumerate(records):
+        kolom_asing = set(record) - set(PARAMETER_SKENARIO) - {'id'}
+        if kolom_asing:
+            raise ValueError(
+                f"Skenario baris {nomor}: kolom tidak dikenal {sorted(kolom_asing)}"
+            )
+
+        skenario = {'id': str(record.get('id', nomor))}
+        for nama, default in PARAMETER_SKENARIO.items():
+            nilai = record.get(nama, default)
+            # Sel kosong di CSV terbaca sebagai NaN
+            if nilai is None or (isinstance(nilai, float) and pd.isna(nilai)):
+                nilai = None if nama == 'random_seed' else default
+            elif nama == 'laju_kedatangan':
+                nilai = float(nilai)
+            else:
+                nilai = int(nilai)
+            skenario[nama] = nilai
+        daftar_skenario.append(skenario)
+
+    ids = [s['id'] for s in daftar_skenario]
+    if len(set(ids)) != len(ids):
+        raise ValueError("ID skenario harus unik")
+
+    return daftar_skenario
+
+
+def jalankan_skenario(skenario: Dict, direktori_db: Optional[str] = None) -> Dict:
+    """
+    Menjalankan satu skenario dan meratakan hasilnya menjadi satu baris KPI.
+
+    Fungsi ini dieksekusi di dalam proses worker. Jika ``direktori_db``
+    diberikan, hasil tersimpan dipakai ulang dan run baru ikut disimpan.
+
+    Args:
+        skenario: Dictionary skenario hasil ``baca_skenario``
+        direktori_db: Folder ``PenyimpananHasil`` (opsional)
+
+    Returns:
+        Dictionary berisi parameter skenario, statistik KPI, dan utilisasi
+    """
+    mulai = time.perf_counter()
+    penyimpanan = PenyimpananHasil(direktori_db) if direktori_db else None
+    parameter = {nama: skenario[nama] for nama in PARAMETER_SKENARIO}
+    _, _, utilisasi, statistik = jalankan_simulasi_tersimpan(penyimpanan, **parameter)
+
+    baris = dict(skenario)
+    baris.update(statistik)
+    for stasiun, nilai in utilisasi.items():
+        baris[f'utilisasi_{stasiun.lower()}'] = nilai
+    baris['waktu_komputasi'] = round(time.perf_counter() - mulai, 4)
+    return baris
+
+
+def grid_skenario(grid: Dict[str, Iterable], seeds: Iterable[int] = (42,)) -> List[Dict]:
+    """
+    Membuat daftar skenario dari produk kartesius nilai parameter.
+
+    Skenario diurutkan menurut kombinasi parameter lalu seed, sehingga
+    urutannya (dan urutan hasil sweep) selalu sama.
+
+    Args:
+        grid: Nama parameter -> daftar nilai, mis. ``{'jumlah_kasir': [1, 2, 3]}``
+        seeds: Seed replikasi untuk setiap kombinasi
+
+    Returns:
+        List dictionary skenario dengan ID ``k<kombinasi>-s<seed>``
+    """
+    kolom_asing = set(grid) - set(PARAMETER_SKENARIO)
+    if kolom_asing:
+        raise ValueError(f"Parameter sweep tidak dikenal: {sorted(kolom_asing)}")
+
+    nama = list(grid)
+    seeds = sorted(seeds)
+    daftar_skenario = []
+    for nomor, nilai in enumerate(itertools.product(*(grid[n] for n in nama))):
+        for seed in seeds:
+            skenario = {**PARAMETER_SKENARIO, **dict(zip(nama, nilai)), 'random_seed': seed}
+            skenario['id'] = f'k{nomor}-s{seed}'
+            daftar_skenario.append(skenario)
+    return daftar_skenario
+
+
+def jalankan_sweep(
+    daftar_skenario: List[Dict],
+    eksekutor: Optional[Eksekutor] = None,
+    direktori_db: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Menjalankan sweep parameter dan mengembalikan KPI sebagai DataFrame.
+
+    Hasil disusun menurut urutan ``daftar_skenario`` apa pun backend-nya,
+    sehingga sweep yang sama selalu menghasilkan tabel yang identik.
+
+    Args:
+        daftar_skenario: List skenario (mis. dari ``grid_skenario``)
+        eksekutor: Backend eksekusi (default: ``EksekutorProses``)
+        direktori_db: Folder ``PenyimpananHasil`` (opsional)
+
+    Returns:
+        DataFrame satu baris per skenario
+    """
+    fungsi = functools.partial(jalankan_skenario, direktori_db=direktori_db)
+    if eksekutor is None:
+        with EksekutorProses() as eksekutor:
+            baris = eksekutor.jalankan(fungsi, daftar_skenario)
+    else:
+        baris = eksekutor.jalankan(fungsi, daftar_skenario)
+    return pd.DataFrame(baris)
+
+
+def _path_checkpoint(output: str, format_output: str) -> str:
+    """JSON Lines dipakai langsung sebagai checkpoint; Parquet lewat file sementara."""
+    if format_output == 'jsonl':
+        return output
+    return output + '.partial.jsonl'
+
+
+def _baca_id_selesai(path_checkpoint: str) -> Set[str]:
+    """Membaca ID skenario yang sudah tercatat di file checkpoint."""
+    selesai = set()
+    if not os.path.exists(path_checkpoint):
+        return selesai
+
+    with open(path_checkpoint, encoding='utf-8') as f:
+        for baris in f:
+            try:
+                selesai.add(str(json.loads(baris)['id']))
+            except (ValueError, KeyError):
+                # Baris terakhir bisa terpotong jika proses sebelumnya mati
+                continue
+    return selesai
+
+
+def _rapikan_checkpoint(path_checkpoint: str):
+    """Membuang baris yang terpotong agar checkpoint bisa di-append dengan aman."""
+    if not os.path.exists(path_checkpoint):
+        return
+
+    with open(path_checkpoint, encoding='utf-8') as f:
+        baris_valid = []
+        for baris in f:
+            try:
+                json.loads(baris)
+            except ValueError:
+                continue
+            baris_valid.append(baris if baris.endswith('\n') else baris + '\n')
+
+    with open(path_checkpoint, 'w', encoding='utf-8') as f:
+        f.writelines(baris_valid)
+
+
+def _json_aman(baris: Dict) -> Dict:
+    """NaN/inf menjadi None (``null``) agar baris JSON Lines valid di luar Python."""
+    return {
+        kunci: None if isinstance(nilai, float) and not math.isfinite(nilai) else nilai
+        for kunci, nilai in baris.items()
+    }
+
+
+def _baca_parquet(output: str, **kwargs) -> Optional[pd.DataFrame]:
+    """Output Parquet yang sudah ada, atau None jika belum ada."""
+    if not os.path.exists(output):
+        return None
+    try:
+        df = pd.read_parquet(output, **kwargs)
+    except ImportError as e:
+        raise SystemExit(f"Output Parquet membutuhkan pyarrow (pip install pyarrow): {e}")
+    df['id'] = df['id'].astype(str)
+    return df
+
+
+def _tulis_parquet(path_checkpoint: str, output: str, gabung: bool = False):
+    """
+    Mengonversi checkpoint JSON Lines menjadi file Parquet final.
+
+    Dengan ``gabung=True`` (resume), baris Parquet yang sudah ada
+    dipertahankan dan hasil checkpoint ditambahkan di belakangnya.
+    File ditulis ke path sementara lalu diganti sekaligus, sehingga hasil
+    lama tidak hilang jika penulisan gagal.
+    """
+    df = pd.read_json(path_checkpoint, lines=True, dtype={'id': str})
+    lama = _baca_parquet(output) if gabung else None
+    if lama is not None:
+        df = pd.concat([lama, df], ignore_index=True).drop_duplicates('id', keep='last')
+
+    path_sementara = output + '.tmp'
+    try:
+        df.to_parquet(path_sementara, index=False)
+    except ImportError as e:
+        raise SystemExit(
+            f"Output Parquet membutuhkan pyarrow (pip install pyarrow): {e}. "
+            f"Hasil tetap tersimpan di {path_checkpoint}"
+        )
+    os.replace(path_sementara, output)
+    os.remove(path_checkpoint)
+
+
+def jalankan_batch(
+    daftar_skenario: List[Dict],
+    output: str,
+    format_output: str = 'jsonl',
+    workers: Optional[int] = None,
+    resume: bool = False,
+    verbose: bool = True,
+    direktori_db: Optional[str] = None,
+    eksekutor: Optional[Eksekutor] = None
+) -> int:
+    """
+    Menjalankan seluruh skenario lewat eksekutor dan menulis KPI ke file.
+
+    Setiap hasil langsung ditulis ke checkpoint JSON Lines begitu selesai,
+    sehingga batch yang terputus dapat dilanjutkan dengan ``resume=True``
+    tanpa mengulang skenario yang sudah selesai. Untuk output Parquet,
+    skenario di file Parquet yang sudah ada juga dianggap selesai dan
+    barisnya dipertahankan saat file ditulis ulang.
+
+    Args:
+        daftar_skenario: List skenario hasil ``baca_skenario``
+        output: Lokasi file output
+        format_output: ``'jsonl'`` atau ``'parquet'``
+        workers: Jumlah proses worker jika ``eksekutor`` tidak diberikan
+        resume: Lanjutkan batch dari checkpoint yang ada
+        verbose: Cetak progres ke stderr
+        direktori_db: Folder ``PenyimpananHasil`` untuk cache hasil (opsional)
+        eksekutor: Backend eksekusi (default: ``EksekutorProses(workers)``)
+
+    Returns:
+        Jumlah skenario yang dijalankan pada pemanggilan ini
+    """
+    path_checkpoint = _path_checkpoint(output, format_output)
+
+    if resume:
+        _rapikan_checkpoint(path_checkpoint)
+        selesai = _baca_id_selesai(path_checkpoint)
+        if format_output == 'parquet':
+            # Checkpoint dihapus setelah Parquet final ditulis
+            df_selesai = _baca_parquet(output, columns=['id'])
+            if df_selesai is not None:
+                selesai |= set(df_selesai['id'])
+    else:
+        selesai = set()
+        if os.path.exists(path_checkpoint):
+            os.remove(path_checkpoint)
+
+    sisa = [s for s in daftar_skenario if s['id'] not in selesai]
+    if verbose:
+        print(
+            f"{len(daftar_skenario)} skenario, {len(selesai)} sudah selesai, "
+            f"{len(sisa)} akan dijalankan",
+            file=sys.stderr
+        )
+
+    if direktori_db:
+        # Buat skema sekali di proses utama sebelum worker berjalan
+        PenyimpananHasil(direktori_db)
+
+    if sisa:
+        milik_sendiri = eksekutor is None
+        if milik_sendiri:
+            eksekutor = EksekutorProses(workers)
+        fungsi = functools.partial(jalankan_skenario, direktori_db=direktori_db)
+        try:
+            with open(path_checkpoint, 'a', encoding='utf-8') as f:
+                hasil = eksekutor.imap(fungsi, sisa)
+                for nomor, (indeks, baris) in enumerate(hasil, start=1):
+                    f.write(json.dumps(_json_aman(baris), allow_nan=False) + '\n')
+                    f.flush()
+                    if verbose:
+                        print(
+                            f"[{nomor}/{len(sisa)}] {sisa[indeks]['id']}: "
+                            f"rata tunggu {baris['rata_waktu_tunggu']:.2f} menit",
+                            file=sys.stderr
+                        )
+        finally:
+            if milik_sendiri:
+                eksekutor.tutup()
+
+    if format_output == 'parquet' and os.path.exists(path_checkpoint):
+        _tulis_parquet(path_checkpoint, output, gabung=resume)
+
+    return len(sisa)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line."""
+    parser = argparse.ArgumentParser(
+        description="Jalankan batch skenario simulasi Drive-Thru tanpa dashboard."
+    )
+    parser.add_argument('skenario', help="File skenario (.csv, .json, .jsonl)")
+    parser.add_argument('-o', '--output', required=True, help="File output KPI")
+    parser.add_argument(
+        '-f', '--format', choices=['jsonl', 'parquet'], default=None,
+        help="Format output (default: ditebak dari ekstensi output)"
+    )
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Lanjutkan batch yang sebelumnya terhenti")
+    parser.add_argument('--db', default=None, metavar='DIREKTORI',
+                        help="Folder penyimpanan hasil; run tersimpan tidak dihitung ulang")
+    parser.add_argument('--backend', choices=['lokal', 'proses', 'tcp'], default='proses',
+                        help="Backend eksekusi (default: proses)")
+    parser.add_argument('--worker-tcp', default=None, metavar='HOST:PORT,...',
+                        help="Alamat worker untuk --backend tcp")
+    parser.add_argument('--token', default=None, help="Token worker TCP")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Jangan cetak progres")
+    args = parser.parse_args(argv)
+
+    format_output = args.format
+    if format_output is None:
+        format_output = 'parquet' if args.output.endswith('.parquet') else 'jsonl'
+
+    daftar_skenario = baca_skenario(args.skenario)
+    with buat_eksekutor(args.backend, args.workers, args.worker_tcp, args.token) as eksekutor:
+        jalankan_batch(
+            daftar_skenario,
+            args.output,
+            format_output=format_output,
+            resume=args.resume,
+            verbose=not args.quiet,
+            direktori_db=args.db,
+            eksekutor=eksekutor
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Jejak Event Biner Simulasi Drive-Thru
+=====================================
+
+Perekam opsional yang menulis setiap event perjalanan mobil sebagai record
+biner lebar tetap (waktu, ID mobil, stasiun, jenis event) ke sebuah file,
+beserta pembaca berbasis memory-map untuk akses acak.
+
+Format file:
+    - Header 16 byte: magic ``DTJEJAK1`` + ukuran record (uint32) + cadangan
+    - Record 14 byte: waktu (float64), id_mobil (uint32), stasiun (uint8),
+      jenis (uint8), little-endian, tersusun menurut waktu simulasi
+
+Karena record tersusun menurut waktu, potongan per jendela waktu cukup
+dengan binary search pada kolom waktu kontigu (``<path>.waktu.npy``); kolom
+``waktu`` di dalam record ber-stride 14 byte sehingga ``np.searchsorted``
+langsung di atasnya menyalin seluruh kolom setiap pemanggilan. Potongan per
+mobil memakai indeks (``<path>.idx.npy``). Kedua file samping dibangun sekali
+lalu dipetakan ke memori.
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import os
+import struct
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+MAGIC = b'DTJEJAK1'
+UKURAN_HEADER = 16
+
+DTYPE_RECORD = np.dtype([
+    ('waktu', '<f8'),
+    ('id_mobil', '<u4'),
+    ('stasiun', 'u1'),
+    ('jenis', 'u1'),
+])
+
+# Kode stasiun
+STASIUN_SISTEM = 0
+STASIUN_PESAN = 1
+STASIUN_BAYAR = 2
+STASIUN_AMBIL = 3
+NAMA_STASIUN = ['Sistem', 'Pesan', 'Bayar', 'Ambil']
+
+# Kode jenis event
+EVENT_DATANG = 0
+EVENT_MASUK_ANTREAN = 1
+EVENT_MULAI_LAYANAN = 2
+EVENT_SELESAI_LAYANAN = 3
+EVENT_KELUAR = 4
+NAMA_EVENT = ['Datang', 'Masuk_Antrean', 'Mulai_Layanan', 'Selesai_Layanan', 'Keluar']
+
+# File samping: indeks per mobil dan kolom waktu kontigu
+AKHIRAN_SAMPING = ('.idx.npy', '.waktu.npy')
+
+
+def hapus_jejak(path: str):
+    """Menghapus file jejak beserta file sampingnya (jika ada)."""
+    for path_file in (path, *(path + akhiran for akhiran in AKHIRAN_SAMPING)):
+        if os.path.exists(path_file):
+            os.remove(path_file)
+
+
+class PerekamJejak:
+    """
+    Penulis jejak event biner.
+
+    Event ditampung di list tuple (murah per event) lalu ditulis ke file
+    per blok saat buffer penuh atau saat perekam ditutup.
+
+    Contoh:
+        with PerekamJejak('run.jejak') as perekam:
+            jalankan_simulasi(perekam=perekam)
+    """
+
+    def __init__(self, path: str, ukuran_buffer: int = 65536):
+        """
+        Inisialisasi perekam dan tulis header file.
+
+        Args:
+            path: Lokasi file jejak (ditimpa jika sudah ada)
+            ukuran_buffer: Jumlah event per blok tulis
+        """
+        self.path = path
+        self.ukuran_buffer = ukuran_buffer
+        self.jumlah_event = 0
+        self._buffer: List[Tuple[float, int, int, int]] = []
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + struct.pack('<II', DTYPE_RECORD.itemsize, 0))
+
+        # Indeks mobil dan kolom waktu lama tidak lagi valid
+        for path_samping in (path + akhiran for akhiran in AKHIRAN_SAMPING):
+            if os.path.exists(path_samping):
+                os.remove(path_samping)
+
+    def catat(self, waktu: float, id_mobil: int, stasiun: int, jenis: int):
+        """Mencatat satu event."""
+        self._buffer.append((waktu, id_mobil, stasiun, jenis))
+        if len(self._buffer) >= self.ukuran_buffer:
+            self.flush()
+
+    def flush(self):
+        """Menulis isi buffer ke file."""
+        if not self._buffer:
+            return
+        blok = np.array(self._buffer, dtype=DTYPE_RECORD)
+        self._file.write(blok.tobytes())
+        self.jumlah_event += len(blok)
+        self._buffer = []
+
+    def tutup(self):
+        """Flush sisa buffer dan tutup file."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'PerekamJejak':
+        return self
+
+    def __exit__(self, *exc):
+        self.tutup()
+
+
+class BacaJejak:
+    """
+    Pembaca jejak event berbasis memory-map.
+
+    File tidak dibaca ke memori; slicing hanya menyentuh halaman yang perlu.
+
+    Attributes:
+        record: Structured array ``numpy.memmap`` seluruh event
+    """
+
+    def __init__(self, path: str):
+        """
+        Buka file jejak.
+
+        Args:
+            path: Lokasi file jejak
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(UKURAN_HEADER)
+        if len(header) < UKURAN_HEADER or header[:8] != MAGIC:
+            raise ValueError(f"Bukan file jejak event: {path}")
+        ukuran_record, _ = struct.unpack('<II', header[8:])
+        if ukuran_record != DTYPE_RECORD.itemsize:
+            raise ValueError(
+                f"Ukuran record {ukuran_record} tidak cocok dengan {DTYPE_RECORD.itemsize}"
+            )
+
+        jumlah = (os.path.getsize(path) - UKURAN_HEADER) // DTYPE_RECORD.itemsize
+        if jumlah > 0:
+            self.record = np.memmap(
+                path, dtype=DTYPE_RECORD, mode='r',
+                offset=UKURAN_HEADER, shape=(jumlah,)
+            )
+        else:
+            # np.memmap tidak bisa memetakan file kosong
+            self.record = np.empty(0, dtype=DTYPE_RECORD)
+        self._indeks_mobil: Optional[np.ndarray] = None
+        self._id_terurut: Optional[np.ndarray] = None
+        self._waktu: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.record)
+
+    def __getitem__(self, item):
+        return self.record[item]
+
+    @property
+    def waktu(self) -> np.ndarray:
+        """
+        Kolom waktu seluruh event sebagai array kontigu (float64).
+
+        Dibangun sekali dari record lalu disimpan di ``<path>.waktu.npy``;
+        pembukaan berikutnya hanya memetakan file itu ke memori.
+        """
+        if self._waktu is not None:
+            return self._waktu
+
+        path_waktu = self.path + '.waktu.npy'
+        if os.path.exists(path_waktu):
+            waktu = np.load(path_waktu, mmap_mode='r')
+            if len(waktu) == len(self.record):
+                self._waktu = waktu
+                return waktu
+
+        waktu = np.ascontiguousarray(self.record['waktu'], dtype=np.float64)
+        try:
+            np.save(path_waktu, waktu)
+        except OSError:
+            # Folder read-only: kolom tetap dipakai di memori saja
+            pass
+        self._waktu = waktu
+        return waktu
+
+    def rentang_waktu(self, mulai: float, selesai: float) -> np.ndarray:
+        """
+        Event dengan ``mulai <= waktu < selesai`` (binary search, O(log n)).
+
+        Returns:
+            View structured array tanpa salinan
+        """
+        waktu = self.waktu
+        kiri = np.searchsorted(waktu, mulai, side='left')
+        kanan = np.searchsorted(waktu, selesai, side='left')
+        return self.record[kiri:kanan]
+
+    def _get_indeks_mobil(self) -> np.ndarray:
+        """Indeks record terurut menurut (id_mobil, urutan waktu)."""
+        if self._indeks_mobil is not None:
+            return self._indeks_mobil
+
+        path_indeks = self.path + '.idx.npy'
+        if os.path.exists(path_indeks):
+            indeks = np.load(path_indeks, mmap_mode='r')
+            if len(indeks) == len(self.record):
+                self._indeks_mobil = indeks
+                return indeks
+
+        indeks = np.argsort(self.record['id_mobil'], kind='stable')
+        try:
+            np.save(path_indeks, indeks)
+        except OSError:
+            # Folder read-only: indeks tetap dipakai di memori saja
+            pass
+        self._indeks_mobil = indeks
+        return indeks
+
+    def mobil(self, id_mobil: int) -> np.ndarray:
+        """
+        Seluruh event satu mobil, terurut menurut waktu.
+
+        Returns:
+            Structured array (salinan kecil)
+        """
+        indeks = self._get_indeks_mobil()
+        if self._id_terurut is None:
+            self._id_terurut = self.record['id_mobil'][indeks]
+        id_terurut = self._id_terurut
+        kiri = np.searchsorted(id_terurut, id_mobil, side='left')
+        kanan = np.searchsorted(id_terurut, id_mobil, side='right')
+        return self.record[np.asarray(indeks[kiri:kanan])]
+
+    @staticmethod
+    def ke_dataframe(record: np.ndarray) -> pd.DataFrame:
+        """
+        Mengubah potongan record menjadi DataFrame yang mudah dibaca.
+
+        Args:
+            record: Structured array hasil slicing
+
+        Returns:
+            DataFrame dengan kolom Waktu, ID_Mobil, Stasiun, dan Event
+        """
+        return pd.DataFrame({
+            'Waktu': np.asarray(record['waktu']),
+            'ID_Mobil': np.asarray(record['id_mobil']),
+            'Stasiun': pd.Categorical.from_codes(
+                np.asarray(record['stasiun']), categories=NAMA_STASIUN
+            ),
+            'Event': pd.Categorical.from_codes(
+                np.asarray(record['jenis']), categories=NAMA_EVENT
+            ),
+        })
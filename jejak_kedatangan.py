@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Jejak Kedatangan Tercatat
+=========================
+
+Sumber kedatangan dari data nyata (log POS) sebagai pengganti waktu antar
+kedatangan eksponensial, sehingga hari sibuk yang sebenarnya dapat
+diputar ulang dengan staffing lain.
+
+- Waktu kedatangan dibaca dari CSV (``pandas.read_csv(chunksize=...)``)
+  atau Parquet (``pyarrow.parquet.ParquetFile.iter_batches``) per blok;
+  file berisi jutaan baris tidak pernah dimuat utuh, dan pembacaan
+  berhenti begitu kedatangan melewati durasi simulasi.
+- Kolom waktu boleh berupa menit sejak buka (angka) atau timestamp
+  (mis. ``2026-03-14 11:02:31``); timestamp diubah menjadi menit sejak
+  ``waktu_mulai`` (default: kedatangan pertama).
+- Durasi layanan yang teramati per stasiun bersifat opsional. Sel kosong
+  (NaN) diisi dari distribusi layanan konfigurasi, memakai stream acak
+  yang sama seperti run tanpa jejak.
+
+Contoh:
+    config = KonfigurasiSimulasi(
+        kapasitas_kasir=2,
+        jejak_kedatangan=JejakKedatangan('pos_sabtu.parquet', kolom_ambil='durasi_ambil'),
+    )
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+UKURAN_CHUNK = 100_000
+
+# Urutan stasiun durasi layanan teramati
+STASIUN_LAYANAN = ('Pesan', 'Bayar', 'Ambil')
+
+
+@dataclass(frozen=True)
+class JejakKedatangan:
+    """
+    Referensi ke file kedatangan tercatat (dibaca saat simulasi berjalan).
+
+    Attributes:
+        path: File CSV atau Parquet, satu baris per mobil, terurut menurut
+            waktu kedatangan
+        kolom_waktu: Kolom waktu kedatangan (menit atau timestamp)
+        kolom_pesan: Kolom durasi layanan pesan teramati (menit, opsional)
+        kolom_bayar: Kolom durasi layanan bayar teramati (menit, opsional)
+        kolom_ambil: Kolom durasi layanan ambil teramati (menit, opsional)
+        waktu_mulai: Timestamp menit ke-0 untuk kolom waktu bertipe timestamp
+            (default: kedatangan pertama)
+        ukuran_chunk: Jumlah baris per blok baca
+    """
+    path: str
+    kolom_waktu: str = 'waktu_datang'
+    kolom_pesan: Optional[str] = None
+    kolom_bayar: Optional[str] = None
+    kolom_ambil: Optional[str] = None
+    waktu_mulai: Optional[str] = None
+    ukuran_chunk: int = UKURAN_CHUNK
+
+    @property
+    def kolom_layanan(self) -> Dict[str, str]:
+        """Kolom durasi layanan teramati per stasiun yang diisi."""
+        kolom = dict(zip(STASIUN_LAYANAN, (self.kolom_pesan, self.kolom_bayar, self.kolom_ambil)))
+        return {stasiun: nama for stasiun, nama in kolom.items() if nama is not None}
+
+    def ke_dict(self) -> Dict:
+        """
+        Representasi kanonik untuk hash konfigurasi.
+
+        Ukuran dan waktu modifikasi file ikut dimasukkan agar hasil tersimpan
+        dari versi file lama tidak dipakai ulang.
+        """
+        info = os.stat(self.path)
+        data = asdict(self)
+        data.pop('ukuran_chunk')
+        return {**data, 'ukuran_file': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+    def _baca_tabel(self) -> Iterator[pd.DataFrame]:
+        """Blok DataFrame mentah berisi kolom yang dipakai saja."""
+        kolom = [self.kolom_waktu, *self.kolom_layanan.values()]
+        if str(self.path).lower().endswith('.parquet'):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError(f"Jejak Parquet membutuhkan pyarrow (pip install pyarrow): {e}")
+            for batch in pq.ParquetFile(self.path).iter_batches(
+                batch_size=self.ukuran_chunk, columns=kolom
+            ):
+                yield batch.to_pandas()
+        else:
+            with pd.read_csv(self.path, usecols=kolom, chunksize=self.ukuran_chunk) as pembaca:
+                yield from pembaca
+
+    def baca_blok(self, durasi: Optional[float] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Membaca kedatangan per blok.
+
+        Args:
+            durasi: Berhenti sebelum kedatangan pertama >= durasi (menit)
+
+        Yields:
+            Dictionary array sepanjang blok: ``datang`` (menit) dan durasi
+            teramati per stasiun di ``kolom_layanan`` (NaN = tidak tercatat)
+
+        Raises:
+            ValueError: Jika waktu kedatangan tidak terurut, negatif, atau
+                kosong, atau durasi layanan negatif
+        """
+        asal = pd.Timestamp(self.waktu_mulai) if self.waktu_mulai is not None else None
+        terakhir = -np.inf
+        for df in self._baca_tabel():
+            waktu = df[self.kolom_waktu]
+            if pd.api.types.is_numeric_dtype(waktu):
+                datang = waktu.to_numpy(dtype=float)
+            else:
+                waktu = pd.to_datetime(waktu)
+                if asal is None and len(waktu):
+                    asal = waktu.iloc[0]
+                datang = ((waktu - asal) / pd.Timedelta(minutes=1)).to_numpy(dtype=float)
+
+            if np.isnan(datang).any():
+                raise ValueError(f"Waktu kedatangan kosong di {self.path}")
+            if len(datang) and (datang[0] < terakhir or np.any(np.diff(datang) < 0)):
+                raise ValueError(f"Waktu kedatangan di {self.path} harus terurut naik")
+            if len(datang) and datang[0] < 0:
+                raise ValueError(f"Waktu kedatangan sebelum waktu_mulai di {self.path}")
+
+            blok = {'datang': datang}
+            for stasiun, nama in self.kolom_layanan.items():
+                durasi_layanan = pd.to_numeric(df[nama], errors='coerce').to_numpy(dtype=float)
+                if np.any(durasi_layanan < 0):
+                    raise ValueError(f"Durasi layanan negatif di kolom {nama} ({self.path})")
+                blok[stasiun] = durasi_layanan
+
+            if durasi is not None and len(datang) and datang[-1] >= durasi:
+                n = int(np.searchsorted(datang, durasi, side='left'))
+                yield {nama: nilai[:n] for nama, nilai in blok.items()}
+                return
+            if len(datang):
+                terakhir = datang[-1]
+                yield blok
+
+    def muat(self, durasi: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Seluruh kedatangan (< durasi) sebagai satu set array (untuk engine batch)."""
+        daftar_blok: List[Dict[str, np.ndarray]] = list(self.baca_blok(durasi))
+        nama_kolom = ['datang', *self.kolom_layanan]
+        if not daftar_blok:
+            return {nama: np.empty(0) for nama in nama_kolom}
+        return {nama: np.concatenate([blok[nama] for blok in daftar_blok]) for nama in nama_kolom}
+
+
+def isi_layanan(teramati: Optional[np.ndarray], penyampel, jumlah: int) -> np.ndarray:
+    """
+    Durasi layanan ``jumlah`` mobil sesuai urutan dilayani.
+
+    Nilai NaN (atau semua, jika ``teramati`` None) diambil berurutan dari
+    ``penyampel``, sama seperti engine SimPy yang hanya menyampel mobil
+    tanpa durasi teramati.
+
+    Args:
+        teramati: Durasi teramati sesuai urutan dilayani (boleh NaN)
+        penyampel: ``PenyampelBlok`` stasiun
+        jumlah: Jumlah mobil
+
+    Returns:
+        Array durasi layanan
+    """
+    if teramati is None:
+        return penyampel.ambil(jumlah)
+    hasil = np.array(teramati, dtype=float)
+    kosong = np.isnan(hasil)
+    if kosong.any():
+        hasil[kosong] = penyampel.ambil(int(kosong.sum()))
+    return hasil
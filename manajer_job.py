@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Manajer Job Simulasi di Latar Belakang
+======================================
+
+Menjalankan simulasi di worker pool persisten agar script Streamlit tidak
+terblokir. Halaman mengirim job, menyimpan ID job di ``st.session_state``,
+lalu mem-polling progres dan hasilnya pada setiap rerun. Interaksi widget
+tidak lagi membuang pekerjaan yang sedang berjalan, dan job dapat dibatalkan.
+
+Satu job berisi satu atau beberapa ``TugasSimulasi`` (mis. skenario A & B
+atau replikasi) yang dikerjakan berurutan oleh satu worker.
+
+Contoh:
+    manajer = ManajerJob()
+    id_job = manajer.kirim([TugasSimulasi({'laju_kedatangan': 1.5})])
+    manajer.status(id_job).progres
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import atexit
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from jejak_event import PerekamJejak
+from penyimpanan_hasil import PenyimpananHasil, jalankan_simulasi_tersimpan
+from profiler import ProfilerSimulasi
+from simulation import ProgresSimulasi, SimulasiDibatalkan
+
+
+# Jeda minimum antar update progres ke proses Manager (detik)
+INTERVAL_PROGRES = 0.1
+
+# Status job
+STATUS_ANTRE = 'antre'
+STATUS_BERJALAN = 'berjalan'
+STATUS_SELESAI = 'selesai'
+STATUS_GAGAL = 'gagal'
+STATUS_DIBATALKAN = 'dibatalkan'
+STATUS_AKTIF = (STATUS_ANTRE, STATUS_BERJALAN)
+
+
+@dataclass
+class TugasSimulasi:
+    """Satu run simulasi di dalam job."""
+    parameter: Dict = field(default_factory=dict)  # Argumen jalankan_simulasi
+    profil: bool = False                  # Kumpulkan ProfilSimulasi
+    path_cprofile: Optional[str] = None   # Dump cProfile (butuh profil=True)
+    path_jejak: Optional[str] = None      # Rekam jejak event ke file ini
+
+
+@dataclass
+class StatusJob:
+    """Snapshot status sebuah job."""
+    id_job: str
+    status: str
+    progres: float = 0.0        # 0.0 - 1.0
+    tugas_selesai: int = 0
+    jumlah_tugas: int = 0
+    pesan: str = ''
+    waktu_berjalan: float = 0.0  # Detik sejak job mulai dikerjakan
+
+    @property
+    def aktif(self) -> bool:
+        """True jika job masih antre atau berjalan."""
+        return self.status in STATUS_AKTIF
+
+
+def _kerjakan_job(
+    daftar_tugas: List[TugasSimulasi],
+    direktori_db: Optional[str],
+    status: Dict,
+    batal
+) -> Optional[List[Dict]]:
+    """
+    Mengerjakan seluruh tugas sebuah job di proses worker.
+
+    Args:
+        daftar_tugas: Tugas yang dijalankan berurutan
+        direktori_db: Folder ``PenyimpananHasil`` (opsional)
+        status: Dictionary bersama (proxy Manager) untuk progres
+        batal: Event bersama; jika di-set, job berhenti di langkah simulasi berikutnya
+
+    Returns:
+        List hasil per tugas, atau None jika dibatalkan
+    """
+    if batal.is_set():
+        status['status'] = STATUS_DIBATALKAN
+        return None
+
+    status.update(status=STATUS_BERJALAN, mulai=time.time())
+    penyimpanan = PenyimpananHasil(direktori_db) if direktori_db else None
+    daftar_hasil = []
+
+    try:
+        for nomor, tugas in enumerate(daftar_tugas):
+            if batal.is_set():
+                status['status'] = STATUS_DIBATALKAN
+                return None
+
+            profiler = None
+            if tugas.profil:
+                profiler = ProfilerSimulasi(
+                    ukur_memori=True,
+                    cprofile=tugas.path_cprofile is not None,
+                    path_cprofile=tugas.path_cprofile
+                )
+            perekam = PerekamJejak(tugas.path_jejak) if tugas.path_jejak else None
+
+            terakhir = [0.0]
+
+            def laporkan(progres: ProgresSimulasi, nomor=nomor, terakhir=terakhir):
+                # Update ke Manager lewat IPC, jadi dibatasi frekuensinya
+                sekarang = time.monotonic()
+                if sekarang - terakhir[0] < INTERVAL_PROGRES and progres.fraksi < 1.0:
+                    return
+                terakhir[0] = sekarang
+                status.update(
+                    progres=(nomor + progres.fraksi) / len(daftar_tugas),
+                    pesan=f"{progres.mobil_selesai} mobil selesai"
+                )
+
+            try:
+                df_log, df_antrean, utilisasi, statistik = jalankan_simulasi_tersimpan(
+                    penyimpanan,
+                    profiler=profiler,
+                    perekam=perekam,
+                    callback_progres=laporkan,
+                    token_batal=batal,
+                    **tugas.parameter
+                )
+            except SimulasiDibatalkan:
+                status['status'] = STATUS_DIBATALKAN
+                return None
+            finally:
+                if perekam is not None:
+                    perekam.tutup()
+
+            daftar_hasil.append({
+                'df_log': df_log,
+                'df_antrean': df_antrean,
+                'utilisasi': utilisasi,
+                'statistik': statistik,
+                'profil': profiler.profil if profiler is not None else None,
+            })
+            status.update(
+                tugas_selesai=nomor + 1,
+                progres=(nomor + 1) / len(daftar_tugas)
+            )
+    except Exception as e:
+        status.update(status=STATUS_GAGAL, pesan=f"{type(e).__name__}: {e}")
+        raise
+
+    status['status'] = STATUS_SELESAI
+    return daftar_hasil
+
+
+@dataclass
+class _Job:
+    future: Future
+    status: Dict
+    batal: object
+    jumlah_tugas: int
+
+
+class ManajerJob:
+    """
+    Worker pool persisten yang menerima job simulasi.
+
+    Dibuat sekali per proses server (mis. lewat ``st.cache_resource``) dan
+    dipakai bersama oleh semua sesi. Aman dipanggil dari banyak thread.
+    """
+
+    def __init__(self, workers: Optional[int] = None, direktori_db: Optional[str] = None):
+        """
+        Inisialisasi worker pool.
+
+        Args:
+            workers: Jumlah proses worker (default: jumlah CPU)
+            direktori_db: Folder ``PenyimpananHasil`` yang dipakai worker
+        """
+        self.direktori_db = direktori_db
+        self._manager = multiprocessing.Manager()
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.tutup)
+
+    def kirim(self, daftar_tugas: List[TugasSimulasi]) -> str:
+        """
+        Mengirim job ke worker pool.
+
+        Args:
+            daftar_tugas: Satu atau beberapa tugas simulasi
+
+        Returns:
+            ID job untuk polling status dan hasil
+        """
+        id_job = uuid.uuid4().hex
+        status = self._manager.dict(
+            status=STATUS_ANTRE, progres=0.0, tugas_selesai=0, pesan='', mulai=None
+        )
+        batal = self._manager.Event()
+        future = self._pool.submit(
+            _kerjakan_job, list(daftar_tugas), self.direktori_db, status, batal
+        )
+        with self._lock:
+            self._jobs[id_job] = _Job(future, status, batal, len(daftar_tugas))
+        return id_job
+
+    def _get_job(self, id_job: str) -> _Job:
+        with self._lock:
+            if id_job not in self._jobs:
+                raise KeyError(f"Job tidak ditemukan: {id_job}")
+            return self._jobs[id_job]
+
+    def status(self, id_job: str) -> StatusJob:
+        """
+        Membaca status terkini sebuah job.
+
+        Args:
+            id_job: ID dari ``kirim``
+
+        Returns:
+            Objek ``StatusJob``
+        """
+        job = self._get_job(id_job)
+        data = dict(job.status)
+
+        status = data['status']
+        pesan = data.get('pesan', '')
+        if job.future.cancelled():
+            status = STATUS_DIBATALKAN
+        elif job.future.done() and job.future.exception() is not None and status != STATUS_GAGAL:
+            # Worker mati sebelum sempat menulis status
+            status = STATUS_GAGAL
+            pesan = pesan or repr(job.future.exception())
+        elif job.future.done() and status in STATUS_AKTIF:
+            # Status dari worker belum tersinkron
+            status = STATUS_SELESAI
+
+        mulai = data.get('mulai')
+        return StatusJob(
+            id_job=id_job,
+            status=status,
+            progres=data.get('progres', 0.0),
+            tugas_selesai=data.get('tugas_selesai', 0),
+            jumlah_tugas=job.jumlah_tugas,
+            pesan=pesan,
+            waktu_berjalan=time.time() - mulai if mulai else 0.0
+        )
+
+    def hasil(self, id_job: str, timeout: Optional[float] = None) -> Optional[List[Dict]]:
+        """
+        Mengambil hasil job (menunggu jika belum selesai).
+
+        Returns:
+            List hasil per tugas, atau None jika job dibatalkan
+        """
+        try:
+            return self._get_job(id_job).future.result(timeout=timeout)
+        except CancelledError:
+            return None
+
+    def batalkan(self, id_job: str) -> bool:
+        """
+        Membatalkan job.
+
+        Job yang masih antre langsung dibatalkan; job yang sedang berjalan
+        berhenti pada langkah simulasi berikutnya (satu menit simulasi).
+
+        Returns:
+            True jika job masih aktif saat pembatalan diminta
+        """
+        job = self._get_job(id_job)
+        job.batal.set()
+        if job.future.cancel():
+            return True
+        return not job.future.done()
+
+    def hapus(self, id_job: str):
+        """Melupakan job yang sudah tidak diperlukan (hasil dibebaskan)."""
+        with self._lock:
+            self._jobs.pop(id_job, None)
+
+    def tutup(self):
+        """Membatalkan semua job dan mematikan worker pool."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            try:
+                job.batal.set()
+            except (EOFError, OSError):
+                # Proses Manager sudah mati saat interpreter keluar
+                pass
+            job.future.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
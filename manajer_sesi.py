@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+Manajer Hasil Sesi Dashboard
+============================
+
+Menyimpan DataFrame hasil per sesi (log pelanggan, monitoring antrean,
+skenario perbandingan) di luar ``st.session_state`` dengan anggaran memori.
+
+- Setiap DataFrame dikemas per kolom: kolom numerik di-byte-shuffle lalu
+  dikompresi zlib, kolom lain di-pickle.
+- Anggaran byte per sesi dan global (ukuran terkompresi). Jika terlampaui,
+  hasil yang paling lama tidak dilihat di-spill ke disk.
+- ``ambil`` memulihkan hasil dari disk secara transparan; hasil yang
+  baru dilihat kembali masuk memori.
+- Hasil sesi yang tidak diakses lebih dari ``umur_maks`` detik dihapus,
+  termasuk berkas run sesi itu (jejak event, dump cProfile) di folder sesi.
+- Ringkasan turunan (mis. ``analitik``) disimpan bersama hasil, dikunci
+  sidik jari isi hasil, sehingga hanya dihitung sekali per hasil.
+
+Satu instance dipakai bersama semua sesi (lihat ``sumber_daya``) dan aman
+dipakai dari banyak thread.
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import hashlib
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from tabel_skenario import acak_byte, pulihkan_byte
+
+
+def kemas_dataframe(df: pd.DataFrame, tingkat_kompresi: int = 6) -> bytes:
+    """
+    Mengemas DataFrame ke bentuk kolumnar terkompresi.
+
+    Args:
+        df: DataFrame hasil
+        tingkat_kompresi: Level zlib (1-9)
+
+    Returns:
+        Bytes untuk ``buka_dataframe``
+    """
+    kolom = []
+    for nama in df.columns:
+        nilai = df[nama].to_numpy()
+        if nilai.dtype.kind in 'biuf':
+            data = acak_byte(nilai.ravel())
+            kolom.append((nama, nilai.dtype.str, zlib.compress(data, tingkat_kompresi)))
+        else:
+            data = pickle.dumps(nilai.tolist(), protocol=pickle.HIGHEST_PROTOCOL)
+            kolom.append((nama, None, zlib.compress(data, tingkat_kompresi)))
+
+    indeks = None if df.index.equals(pd.RangeIndex(len(df))) else df.index
+    return pickle.dumps(
+        {'kolom': kolom, 'indeks': indeks, 'panjang': len(df)},
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+
+def buka_dataframe(data: bytes) -> pd.DataFrame:
+    """Kebalikan ``kemas_dataframe`` (dtype kolom dipertahankan)."""
+    paket = pickle.loads(data)
+    kolom = {}
+    for nama, dtype, isi in paket['kolom']:
+        isi = zlib.decompress(isi)
+        kolom[nama] = pulihkan_byte(isi, dtype) if dtype is not None else pickle.loads(isi)
+    return pd.DataFrame(kolom, index=paket['indeks'] if paket['indeks'] is not None else None)
+
+
+@dataclass
+class _Entri:
+    ukuran: int            # Byte terkompresi
+    data: Optional[bytes]  # None = hanya ada di disk
+    path: Path
+    di_disk: bool          # Salinan di disk masih sama dengan data
+    diakses: float
+    sidik: str             # Sidik jari isi (hash bytes terkemas)
+
+
+class ManajerSesi:
+    """
+    Penyimpanan hasil per sesi dengan anggaran memori dan spill ke disk.
+
+    Contoh:
+        manajer = ManajerSesi()
+        manajer.simpan(id_sesi, 'df_hasil', df_log)
+        df_log = manajer.ambil(id_sesi, 'df_hasil')
+    """
+
+    def __init__(
+        self,
+        direktori: Optional[str] = None,
+        anggaran_sesi: int = 4 * 2 ** 20,
+        anggaran_global: int = 64 * 2 ** 20,
+        umur_maks: float = 6 * 3600
+    ):
+        """
+        Args:
+            direktori: Folder spill (default: folder sementara sistem)
+            anggaran_sesi: Byte terkompresi maksimum di memori per sesi
+            anggaran_global: Byte terkompresi maksimum di memori semua sesi
+            umur_maks: Detik tanpa akses sebelum hasil sesi dihapus
+        """
+        self.direktori = Path(direktori or Path(tempfile.gettempdir()) / 'drivethru_sesi')
+        self.direktori.mkdir(parents=True, exist_ok=True)
+        self.anggaran_sesi = anggaran_sesi
+        self.anggaran_global = anggaran_global
+        self.umur_maks = umur_maks
+        self.jumlah_spill = 0
+        self.jumlah_rehidrasi = 0
+
+        # Urutan = urutan akses terakhir (paling lama di depan)
+        self._entri: 'OrderedDict[Tuple[str, str], _Entri]' = OrderedDict()
+        self._byte_memori = 0
+        self._byte_sesi: Dict[str, int] = {}
+        # (sidik, kunci turunan) -> ringkasan; hidup selama hasilnya ada
+        self._turunan: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.RLock()
+
+    def simpan(self, id_sesi: str, nama: str, df: pd.DataFrame):
+        """
+        Menyimpan (atau mengganti) satu hasil sesi.
+
+        Args:
+            id_sesi: ID sesi pemilik
+            nama: Nama hasil, mis. ``'df_hasil'``
+            df: DataFrame hasil
+        """
+        data = kemas_dataframe(df)
+        kunci = (id_sesi, nama)
+        with self._lock:
+            self._hapus_entri(kunci, hapus_file=False)
+            self._entri[kunci] = _Entri(
+                ukuran=len(data),
+                data=data,
+                path=self.direktori / id_sesi / f'{nama}.kol',
+                di_disk=False,
+                diakses=time.time(),
+                sidik=hashlib.blake2b(data, digest_size=16).hexdigest()
+            )
+            self._tambah_byte(id_sesi, len(data))
+            self._tegakkan_anggaran(id_sesi, kunci)
+            self._bersihkan_kedaluwarsa()
+
+    def ambil(self, id_sesi: str, nama: str) -> Optional[pd.DataFrame]:
+        """
+        Mengambil hasil sesi, memulihkannya dari disk jika sudah di-spill.
+
+        Returns:
+            DataFrame, atau None jika tidak ada (belum disimpan/kedaluwarsa)
+        """
+        kunci = (id_sesi, nama)
+        with self._lock:
+            entri = self._entri.get(kunci)
+            if entri is None:
+                return None
+            self._entri.move_to_end(kunci)
+            entri.diakses = time.time()
+
+            data = entri.data
+            if data is None:
+                try:
+                    data = entri.path.read_bytes()
+                except OSError:
+                    # File spill hilang (mis. folder sementara dibersihkan)
+                    self._hapus_entri(kunci)
+                    return None
+                entri.data = data
+                self._tambah_byte(id_sesi, entri.ukuran)
+                self.jumlah_rehidrasi += 1
+                self._tegakkan_anggaran(id_sesi, kunci)
+        # Dekompresi di luar lock agar sesi lain tidak menunggu
+        return buka_dataframe(data)
+
+    def sidik(self, id_sesi: str, nama: str) -> Optional[str]:
+        """Sidik jari isi hasil, atau None jika tidak ada."""
+        with self._lock:
+            entri = self._entri.get((id_sesi, nama))
+            return entri.sidik if entri is not None else None
+
+    def turunan(
+        self,
+        id_sesi: str,
+        nama: str,
+        kunci: str,
+        fungsi: Callable[[pd.DataFrame], Any]
+    ) -> Optional[Any]:
+        """
+        Ringkasan turunan hasil sesi, dihitung sekali per isi hasil.
+
+        Ringkasan dikunci sidik jari hasil: selama hasil tidak diganti,
+        pemanggilan berikutnya (juga dari sesi lain dengan hasil identik)
+        tidak perlu memulihkan DataFrame maupun menghitung ulang.
+
+        Args:
+            id_sesi: ID sesi pemilik
+            nama: Nama hasil, mis. ``'df_hasil'``
+            kunci: Nama ringkasan, mis. ``'analitik'``
+            fungsi: Penghitung ringkasan dari DataFrame hasil
+
+        Returns:
+            Ringkasan, atau None jika hasil tidak ada
+        """
+        with self._lock:
+            entri = self._entri.get((id_sesi, nama))
+            if entri is None:
+                return None
+            sidik = entri.sidik
+            if (sidik, kunci) in self._turunan:
+                self._entri.move_to_end((id_sesi, nama))
+                entri.diakses = time.time()
+                return self._turunan[(sidik, kunci)]
+
+        df = self.ambil(id_sesi, nama)
+        if df is None:
+            return None
+        hasil = fungsi(df)
+        with self._lock:
+            # Hasil bisa saja diganti/dihapus selama ringkasan dihitung
+            if any(e.sidik == sidik for e in self._entri.values()):
+                self._turunan[(sidik, kunci)] = hasil
+        return hasil
+
+    def ada(self, id_sesi: str, nama: str) -> bool:
+        """True jika hasil tersimpan (di memori atau disk)."""
+        with self._lock:
+            return (id_sesi, nama) in self._entri
+
+    def hapus(self, id_sesi: str, nama: Optional[str] = None):
+        """Menghapus satu hasil, atau semua hasil sesi jika ``nama`` None."""
+        with self._lock:
+            if nama is not None:
+                self._hapus_entri((id_sesi, nama))
+                return
+            for kunci in [k for k in self._entri if k[0] == id_sesi]:
+                self._hapus_entri(kunci)
+        shutil.rmtree(self.direktori / id_sesi, ignore_errors=True)
+
+    def path_berkas(self, id_sesi: str, akhiran: str) -> Path:
+        """
+        Path baru untuk berkas run milik sesi (mis. ``'.jejak'``, ``'.prof'``).
+
+        Berkas berada di folder sesi sehingga ikut terhapus oleh ``hapus``
+        dan saat hasil sesi kedaluwarsa.
+        """
+        folder = self.direktori / id_sesi / 'berkas'
+        folder.mkdir(parents=True, exist_ok=True)
+        return folder / f'drivethru_{uuid.uuid4().hex}{akhiran}'
+
+    def ukuran_sesi(self, id_sesi: str) -> Tuple[int, int]:
+        """Byte terkompresi sesi: (di memori, total termasuk disk)."""
+        with self._lock:
+            total = sum(e.ukuran for k, e in self._entri.items() if k[0] == id_sesi)
+            return self._byte_sesi.get(id_sesi, 0), total
+
+    def statistik(self) -> Dict[str, int]:
+        """Ringkasan pemakaian memori dan disk semua sesi."""
+        with self._lock:
+            return {
+                'jumlah_sesi': len({k[0] for k in self._entri}),
+                'jumlah_hasil': len(self._entri),
+                'jumlah_turunan': len(self._turunan),
+                'byte_memori': self._byte_memori,
+                'byte_disk': sum(e.ukuran for e in self._entri.values() if e.data is None),
+                'jumlah_spill': self.jumlah_spill,
+                'jumlah_rehidrasi': self.jumlah_rehidrasi,
+            }
+
+    def _tambah_byte(self, id_sesi: str, ukuran: int):
+        self._byte_memori += ukuran
+        self._byte_sesi[id_sesi] = self._byte_sesi.get(id_sesi, 0) + ukuran
+        if self._byte_sesi[id_sesi] == 0:
+            del self._byte_sesi[id_sesi]
+
+    def _spill(self, kunci: Tuple[str, str], entri: _Entri):
+        """Memindahkan data entri ke disk dan melepasnya dari memori."""
+        if not entri.di_disk:
+            entri.path.parent.mkdir(parents=True, exist_ok=True)
+            path_sementara = entri.path.with_suffix('.tmp')
+            path_sementara.write_bytes(entri.data)
+            path_sementara.replace(entri.path)
+            entri.di_disk = True
+        entri.data = None
+        self._tambah_byte(kunci[0], -entri.ukuran)
+        self.jumlah_spill += 1
+
+    def _tegakkan_anggaran(self, id_sesi: str, kecuali: Tuple[str, str]):
+        """Spill hasil paling lama tidak dilihat sampai anggaran terpenuhi."""
+        for kunci, entri in list(self._entri.items()):
+            lewat_global = self._byte_memori > self.anggaran_global
+            lewat_sesi = self._byte_sesi.get(id_sesi, 0) > self.anggaran_sesi
+            if not lewat_global and not lewat_sesi:
+                break
+            # Hasil yang sedang disimpan/dilihat tetap di memori
+            if kunci == kecuali or entri.data is None:
+                continue
+            if lewat_global or kunci[0] == id_sesi:
+                self._spill(kunci, entri)
+
+    def _bersihkan_kedaluwarsa(self):
+        batas = time.time() - self.umur_maks
+        kedaluwarsa = [k for k, e in self._entri.items() if e.diakses < batas]
+        for kunci in kedaluwarsa:
+            self._hapus_entri(kunci)
+        # Folder sesi tanpa hasil tersisa (termasuk berkas run) ikut dihapus
+        aktif = {k[0] for k in self._entri}
+        for id_sesi in {k[0] for k in kedaluwarsa} - aktif:
+            shutil.rmtree(self.direktori / id_sesi, ignore_errors=True)
+
+    def _hapus_entri(self, kunci: Tuple[str, str], hapus_file: bool = True):
+        entri = self._entri.pop(kunci, None)
+        if entri is None:
+            return
+        if entri.data is not None:
+            self._tambah_byte(kunci[0], -entri.ukuran)
+        if hapus_file:
+            entri.path.unlink(missing_ok=True)
+        if not any(e.sidik == entri.sidik for e in self._entri.values()):
+            for k in [k for k in self._turunan if k[0] == entri.sidik]:
+                del self._turunan[k]
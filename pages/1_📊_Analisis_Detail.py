@@ -17,6 +17,8 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from simulation import jalankan_simulasi, identifikasi_bottleneck
+from sumber_daya import turunan_hasil_sesi
+from analitik import hitung_analitik_log, hitung_analitik_antrean
 
 # Page Config
 st.set_page_config(
@@ -78,14 +80,18 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Check if simulation data exists
-if 'simulation_run' in st.session_state and st.session_state.simulation_run:
-    df_hasil = st.session_state.df_hasil
-    df_antrean = st.session_state.df_antrean
+# Check if simulation data exists. Ringkasan dihitung sekali per hasil dan
+# disimpan bersamanya; rerun berikutnya tidak menyentuh DataFrame mentah.
+analitik_log = analitik_antrean = None
+if st.session_state.get('simulation_run'):
+    analitik_log = turunan_hasil_sesi('df_hasil', 'analitik', hitung_analitik_log)
+    analitik_antrean = turunan_hasil_sesi('df_antrean', 'analitik', hitung_analitik_antrean)
+
+if analitik_log is not None and analitik_antrean is not None:
     utilisasi = st.session_state.utilisasi
     statistik = st.session_state.statistik
     
-    if len(df_hasil) > 0:
+    if analitik_log.jumlah_mobil > 0:
         # =====================================================================
         # STATISTIK DESKRIPTIF
         # =====================================================================
@@ -95,7 +101,7 @@ if 'simulation_run' in st.session_state and st.session_state.simulation_run:
         
         with col1:
             st.markdown("### Ringkasan Waktu Tunggu")
-            stats_tunggu = df_hasil['Total_Waktu_Tunggu'].describe()
+            stats_tunggu = analitik_log.ringkasan_tunggu
             
             fig, ax = plt.subplots(figsize=(8, 6))
             plt.style.use('dark_background')
@@ -132,13 +138,7 @@ if 'simulation_run' in st.session_state and st.session_state.simulation_run:
             fig.patch.set_facecolor('#1a1a2e')
             ax.set_facecolor('#1a1a2e')
             
-            data_to_plot = [
-                df_hasil['Waktu_Tunggu_Pesan'],
-                df_hasil['Waktu_Tunggu_Bayar'],
-                df_hasil['Waktu_Tunggu_Ambil']
-            ]
-            
-            bp = ax.boxplot(data_to_plot, labels=['Pesan', 'Bayar', 'Ambil'], patch_artist=True)
+            bp = ax.bxp(analitik_log.statistik_box, patch_artist=True)
             
             colors = ['#00d2ff', '#ffd700', '#ff4757']
             for patch, color in zip(bp['boxes'], colors):
@@ -175,9 +175,7 @@ if 'simulation_run' in st.session_state and st.session_state.simulation_run:
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            corr_cols = ['Waktu_Datang', 'Waktu_Tunggu_Pesan', 'Waktu_Tunggu_Bayar', 
-                        'Waktu_Tunggu_Ambil', 'Total_Waktu_Tunggu', 'Total_Waktu_Sistem']
-            corr_matrix = df_hasil[corr_cols].corr()
+            corr_matrix = analitik_log.korelasi
             
             fig, ax = plt.subplots(figsize=(10, 8))
             plt.style.use('dark_background')
@@ -230,11 +228,7 @@ if 'simulation_run' in st.session_state and st.session_state.simulation_run:
         col1, col2 = st.columns(2)
         
         with col1:
-            avg_queues = {
-                'Pesan': df_antrean['Antrean_Pesan'].mean(),
-                'Bayar': df_antrean['Antrean_Bayar'].mean(),
-                'Ambil': df_antrean['Antrean_Ambil'].mean()
-            }
+            avg_queues = analitik_antrean.rata
             
             fig, ax = plt.subplots(figsize=(8, 5))
             plt.style.use('dark_background')
@@ -262,11 +256,7 @@ if 'simulation_run' in st.session_state and st.session_state.simulation_run:
             plt.close(fig)
         
         with col2:
-            max_queues = {
-                'Pesan': df_antrean['Antrean_Pesan'].max(),
-                'Bayar': df_antrean['Antrean_Bayar'].max(),
-                'Ambil': df_antrean['Antrean_Ambil'].max()
-            }
+            max_queues = analitik_antrean.maks
             
             fig, ax = plt.subplots(figsize=(8, 5))
             plt.style.use('dark_background')
@@ -4,6 +4,11 @@
 ================================
 
 Halaman untuk membandingkan beberapa skenario simulasi (What-If Analysis).
+
+Setiap skenario dikirim sebagai job terpisah sehingga dikerjakan paralel oleh
+worker pool. Semua skenario memakai seed yang sama; karena kedatangan dan
+waktu layanan tiap stasiun punya stream acak sendiri, perbedaan KPI berasal
+dari konfigurasi, bukan dari keberuntungan sampel (common random numbers).
 """
 
 import streamlit as st
@@ -12,11 +17,15 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import sys
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from simulation import jalankan_simulasi, identifikasi_bottleneck
+from simulation import identifikasi_bottleneck
+from manajer_job import TugasSimulasi, STATUS_ANTRE, STATUS_SELESAI, STATUS_GAGAL
+from replikasi import hitung_interval
+from sumber_daya import get_manajer_job, simpan_hasil_sesi, ambil_hasil_sesi
 
 # Page Config
 st.set_page_config(
@@ -74,16 +83,6 @@ st.markdown("""
         margin: 0.25rem 0;
     }
     
-    .vs-badge {
-        background: linear-gradient(135deg, #ffd700 0%, #ffaa00 100%);
-        color: #1a1a2e;
-        font-weight: 800;
-        padding: 0.75rem 1.25rem;
-        border-radius: 50%;
-        display: inline-block;
-        font-size: 1.2rem;
-    }
-    
     .golden-divider {
         height: 2px;
         background: linear-gradient(90deg, transparent 0%, #ffd700 50%, transparent 100%);
@@ -154,10 +153,25 @@ st.markdown("""
 st.markdown("""
 <div class="main-header">
     <h1>📈 Perbandingan Skenario What-If</h1>
-    <p>Bandingkan dampak perubahan konfigurasi terhadap performa sistem</p>
+    <p>Bandingkan banyak konfigurasi sekaligus dan temukan yang terbaik</p>
 </div>
 """, unsafe_allow_html=True)
 
+# KPI peringkat -> (kolom, label, True jika makin kecil makin baik)
+OPSI_PERINGKAT = {
+    'Rata-rata Waktu Tunggu': ('rata_waktu_tunggu', 'Waktu Tunggu (menit)', True),
+    'Rata-rata Waktu Sistem': ('rata_waktu_sistem', 'Waktu Sistem (menit)', True),
+    'P90 Waktu Tunggu': ('p90_waktu_tunggu', 'P90 Waktu Tunggu (menit)', True),
+    'P95 Waktu Tunggu': ('p95_waktu_tunggu', 'P95 Waktu Tunggu (menit)', True),
+    'Throughput': ('throughput', 'Throughput (mobil/jam)', False),
+}
+
+SKENARIO_DEFAULT = pd.DataFrame({
+    'Skenario': ['A (Baseline)', 'B (Optimasi)'],
+    'Kasir': [1, 2],
+    'Staff Ambil': [1, 2],
+})
+
 # Sidebar Configuration
 with st.sidebar:
     st.markdown("# ⚙️ Konfigurasi Skenario")
@@ -182,17 +196,24 @@ with st.sidebar:
         help="Berapa lama simulasi akan berjalan"
     )
     
-    st.markdown("---")
-    st.markdown("### 🅰️ Skenario A (Baseline)")
+    st.markdown("### 🎲 Random Number Bersama")
+    
+    seed_bersama = st.number_input(
+        "Seed Bersama", min_value=1, max_value=9999, value=42,
+        help="Semua skenario memakai kedatangan dan waktu layanan yang sama"
+    )
     
-    kasir_a = st.number_input("Jumlah Kasir A", min_value=1, max_value=5, value=1)
-    staff_a = st.number_input("Jumlah Staff Ambil A", min_value=1, max_value=5, value=1)
+    replikasi = st.slider(
+        "Replikasi per Skenario",
+        min_value=1,
+        max_value=10,
+        value=1,
+        help="Seed berurutan mulai dari Seed Bersama; >1 memberi CI selisih terhadap baseline"
+    )
     
-    st.markdown("---")
-    st.markdown("### 🅱️ Skenario B (Optimasi)")
+    st.markdown("### 🏆 Peringkat")
     
-    kasir_b = st.number_input("Jumlah Kasir B", min_value=1, max_value=5, value=2)
-    staff_b = st.number_input("Jumlah Staff Ambil B", min_value=1, max_value=5, value=2)
+    label_peringkat = st.selectbox("Urutkan Berdasarkan", list(OPSI_PERINGKAT.keys()))
     
     st.markdown("---")
     
@@ -202,133 +223,265 @@ with st.sidebar:
         type="primary"
     )
 
+# Scenario Table
+st.markdown("""
+<div class="section-header">
+    <h2>📝 Daftar Skenario</h2>
+</div>
+""", unsafe_allow_html=True)
+
+df_skenario = st.data_editor(
+    SKENARIO_DEFAULT,
+    num_rows="dynamic",
+    hide_index=True,
+    use_container_width=True,
+    key="editor_skenario",
+    column_config={
+        'Skenario': st.column_config.TextColumn("Skenario", required=True),
+        'Kasir': st.column_config.NumberColumn("Kasir", min_value=1, max_value=5, step=1, required=True),
+        'Staff Ambil': st.column_config.NumberColumn("Staff Ambil", min_value=1, max_value=5, step=1, required=True),
+    }
+)
+st.caption("Baris pertama menjadi baseline. Tambah baris untuk menguji opsi staffing lain.")
+
 # Main Content
 if run_comparison:
-    with st.spinner("🔄 Menjalankan simulasi Skenario A & B..."):
-        # Run both scenarios
-        df_a, df_q_a, util_a, stats_a = jalankan_simulasi(
-            laju_kedatangan=laju_kedatangan,
-            durasi_simulasi=durasi,
-            jumlah_kasir=kasir_a,
-            jumlah_staff_ambil=staff_a,
-            random_seed=42
-        )
+    skenario = df_skenario.dropna().drop_duplicates(subset='Skenario')
+    
+    if len(skenario) < 2:
+        st.warning("⚠️ Isi minimal dua skenario dengan nama berbeda.")
+    else:
+        manajer = get_manajer_job()
+        job_lama = st.session_state.get('job_perbandingan')
+        if job_lama is not None:
+            for id_job in job_lama['id']:
+                try:
+                    manajer.batalkan(id_job)
+                    manajer.hapus(id_job)
+                except KeyError:
+                    pass
         
-        df_b, df_q_b, util_b, stats_b = jalankan_simulasi(
-            laju_kedatangan=laju_kedatangan,
-            durasi_simulasi=durasi,
-            jumlah_kasir=kasir_b,
-            jumlah_staff_ambil=staff_b,
-            random_seed=42
-        )
+        seeds = list(range(seed_bersama, seed_bersama + replikasi))
+        daftar_skenario = [
+            {'nama': str(baris['Skenario']), 'kasir': int(baris['Kasir']), 'staff': int(baris['Staff Ambil'])}
+            for _, baris in skenario.iterrows()
+        ]
         
-        st.session_state.comparison_run = True
-        st.session_state.scenario_a = {'df': df_a, 'util': util_a, 'stats': stats_a, 'kasir': kasir_a, 'staff': staff_a}
-        st.session_state.scenario_b = {'df': df_b, 'util': util_b, 'stats': stats_b, 'kasir': kasir_b, 'staff': staff_b}
+        # Satu job per skenario: worker pool mengerjakan semua skenario bersamaan
+        st.session_state.job_perbandingan = {
+            'id': [
+                manajer.kirim([
+                    TugasSimulasi(parameter={
+                        'laju_kedatangan': laju_kedatangan,
+                        'durasi_simulasi': durasi,
+                        'jumlah_kasir': s['kasir'],
+                        'jumlah_staff_ambil': s['staff'],
+                        'random_seed': seed,
+                    })
+                    for seed in seeds
+                ])
+                for s in daftar_skenario
+            ],
+            'skenario': daftar_skenario,
+            'seeds': seeds,
+        }
 
-if 'comparison_run' in st.session_state and st.session_state.comparison_run:
-    scen_a = st.session_state.scenario_a
-    scen_b = st.session_state.scenario_b
-    
-    st.markdown('<div class="golden-divider"></div>', unsafe_allow_html=True)
-    
-    # Scenario Cards
-    col1, col2, col3 = st.columns([2, 1, 2])
-    
-    with col1:
-        st.markdown(f"""
-        <div class="scenario-card">
-            <h4>🅰️ Skenario A (Baseline)</h4>
-            <p><strong>Kasir:</strong> {scen_a['kasir']} | <strong>Staff Ambil:</strong> {scen_a['staff']}</p>
-            <p><strong>Total Mobil:</strong> {scen_a['stats']['total_mobil']}</p>
-            <p><strong>Avg. Tunggu:</strong> {scen_a['stats']['rata_waktu_tunggu']:.1f} menit</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div style="text-align: center; padding: 2rem;">
-            <span class="vs-badge">VS</span>
-        </div>
-        """, unsafe_allow_html=True)
+# Poll background jobs
+perlu_polling = False
+job = st.session_state.get('job_perbandingan')
+if job is not None:
+    manajer = get_manajer_job()
+    try:
+        daftar_status = [manajer.status(id_job) for id_job in job['id']]
+    except KeyError:
+        daftar_status = None
+        st.session_state.job_perbandingan = None
+    
+    if daftar_status is not None and any(s.aktif for s in daftar_status):
+        selesai = sum(s.tugas_selesai for s in daftar_status)
+        total = sum(s.jumlah_tugas for s in daftar_status)
+        berjalan = sum(s.aktif and s.status != STATUS_ANTRE for s in daftar_status)
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.progress(
+                min(max(sum(s.progres for s in daftar_status) / len(daftar_status), 0.0), 1.0),
+                text=f"🔄 Menjalankan {len(daftar_status)} skenario ({berjalan} berjalan paralel, {selesai}/{total} run selesai)"
+            )
+        with col2:
+            if st.button("⛔ Batalkan", use_container_width=True):
+                for id_job in job['id']:
+                    manajer.batalkan(id_job)
+        perlu_polling = True
+    elif daftar_status is not None:
+        gagal = [s for s in daftar_status if s.status == STATUS_GAGAL]
+        if all(s.status == STATUS_SELESAI for s in daftar_status):
+            baris_kpi = []
+            for nomor, (s, id_job) in enumerate(zip(job['skenario'], job['id'])):
+                hasil = manajer.hasil(id_job)
+                # Log replikasi pertama untuk distribusi; disimpan terkompresi lewat ManajerSesi
+                simpan_hasil_sesi(f'skenario_{nomor}', hasil[0]['df_log'])
+                for seed, h in zip(job['seeds'], hasil):
+                    bottleneck, _ = identifikasi_bottleneck(h['utilisasi'])
+                    baris_kpi.append({
+                        'nomor': nomor,
+                        'seed': seed,
+                        **h['statistik'],
+                        'max_utilisasi': max(h['utilisasi'].values()) if h['utilisasi'] else 0.0,
+                        'bottleneck': bottleneck,
+                    })
+            st.session_state.perbandingan = {
+                'skenario': job['skenario'],
+                'kpi': pd.DataFrame(baris_kpi),
+                'replikasi': len(job['seeds']),
+            }
+        elif gagal:
+            st.error(f"❌ Simulasi gagal: {gagal[0].pesan}")
+        else:
+            st.warning("⛔ Perbandingan dibatalkan.")
+        
+        for id_job in job['id']:
+            manajer.hapus(id_job)
+        st.session_state.job_perbandingan = None
+
+perbandingan = st.session_state.get('perbandingan')
+if perbandingan is not None:
+    daftar_log = [ambil_hasil_sesi(f'skenario_{i}') for i in range(len(perbandingan['skenario']))]
+    if any(df is None for df in daftar_log):
+        perbandingan = None
+
+if perbandingan is not None:
+    skenario = perbandingan['skenario']
+    df_kpi = perbandingan['kpi']
+    kolom, label_kpi, kecil_lebih_baik = OPSI_PERINGKAT[label_peringkat]
+    
+    # Selisih berpasangan per seed terhadap baseline (CRN -> CI sempit)
+    baseline = df_kpi[df_kpi['nomor'] == 0].set_index('seed')[kolom]
+    ringkasan = []
+    for nomor, s in enumerate(skenario):
+        kpi_s = df_kpi[df_kpi['nomor'] == nomor]
+        selisih, setengah_lebar = hitung_interval(
+            (kpi_s.set_index('seed')[kolom] - baseline).to_numpy()
+        )
+        ringkasan.append({
+            'Skenario': s['nama'],
+            'Kasir': s['kasir'],
+            'Staff Ambil': s['staff'],
+            'Total Staff': s['kasir'] + s['staff'],
+            'Tunggu (menit)': kpi_s['rata_waktu_tunggu'].mean(),
+            'Sistem (menit)': kpi_s['rata_waktu_sistem'].mean(),
+            'Throughput (/jam)': kpi_s['throughput'].mean(),
+            'Max Utilisasi (%)': kpi_s['max_utilisasi'].mean(),
+            'Bottleneck': kpi_s['bottleneck'].mode().iat[0],
+            'nilai': kpi_s[kolom].mean(),
+            'Δ vs Baseline': selisih,
+            '± CI 95%': setengah_lebar if np.isfinite(setengah_lebar) else np.nan,
+        })
     
-    with col3:
-        st.markdown(f"""
-        <div class="scenario-card">
-            <h4>🅱️ Skenario B (Optimasi)</h4>
-            <p><strong>Kasir:</strong> {scen_b['kasir']} | <strong>Staff Ambil:</strong> {scen_b['staff']}</p>
-            <p><strong>Total Mobil:</strong> {scen_b['stats']['total_mobil']}</p>
-            <p><strong>Avg. Tunggu:</strong> {scen_b['stats']['rata_waktu_tunggu']:.1f} menit</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # Peringkat: KPI terbaik dulu, seri dipecah dengan staff lebih sedikit
+    df_ringkas = pd.DataFrame(ringkasan).sort_values(
+        ['nilai', 'Total Staff'], ascending=[kecil_lebih_baik, True], ignore_index=True
+    )
+    df_ringkas.insert(0, 'Peringkat', np.arange(1, len(df_ringkas) + 1))
+    terbaik = df_ringkas.iloc[0]
     
-    # Improvement Metrics
-    wait_improvement = ((scen_a['stats']['rata_waktu_tunggu'] - scen_b['stats']['rata_waktu_tunggu']) 
-                       / scen_a['stats']['rata_waktu_tunggu'] * 100) if scen_a['stats']['rata_waktu_tunggu'] > 0 else 0
+    st.markdown('<div class="golden-divider"></div>', unsafe_allow_html=True)
     
-    st.markdown("""
+    st.markdown(f"""
     <div class="section-header">
-        <h2>📊 Perbandingan Metrik</h2>
+        <h2>🏆 Peringkat Skenario ({label_peringkat})</h2>
     </div>
     """, unsafe_allow_html=True)
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        delta_wait = scen_b['stats']['rata_waktu_tunggu'] - scen_a['stats']['rata_waktu_tunggu']
-        st.metric("⏱️ Waktu Tunggu", f"{scen_b['stats']['rata_waktu_tunggu']:.1f} min", 
-                 f"{delta_wait:+.1f} menit", delta_color="inverse")
+        st.metric("🥇 Skenario Terbaik", terbaik['Skenario'])
     
     with col2:
-        delta_throughput = scen_b['stats']['throughput'] - scen_a['stats']['throughput']
-        st.metric("📈 Throughput", f"{scen_b['stats']['throughput']:.0f}/jam", 
-                 f"{delta_throughput:+.0f} mobil")
+        st.metric(f"📊 {label_kpi}", f"{terbaik['nilai']:.2f}",
+                 f"{terbaik['Δ vs Baseline']:+.2f} vs baseline",
+                 delta_color="inverse" if kecil_lebih_baik else "normal")
     
     with col3:
-        max_util_b = max(scen_b['util'].values()) if scen_b['util'] else 0
-        max_util_a = max(scen_a['util'].values()) if scen_a['util'] else 0
-        st.metric("🎯 Max Utilisasi", f"{max_util_b:.1f}%", 
-                 f"{max_util_b - max_util_a:+.1f}%", delta_color="inverse")
+        st.metric("👥 Total Staff", f"{terbaik['Total Staff']}",
+                 f"{terbaik['Total Staff'] - (skenario[0]['kasir'] + skenario[0]['staff']):+d} vs baseline",
+                 delta_color="off")
     
     with col4:
-        extra_staff = (scen_b['kasir'] - scen_a['kasir']) + (scen_b['staff'] - scen_a['staff'])
-        st.metric("👥 Tambahan Resource", f"+{extra_staff} staff", 
-                 f"Hemat {abs(wait_improvement):.0f}%" if wait_improvement > 0 else "")
-    
-    # Improvement Summary
-    if wait_improvement > 10:
-        st.success(f"✅ **Skenario B menghemat {wait_improvement:.1f}% waktu tunggu!** Penambahan resource sangat efektif.")
-    elif wait_improvement > 0:
-        st.info(f"ℹ️ **Skenario B menghemat {wait_improvement:.1f}% waktu tunggu.** Peningkatan moderat.")
-    else:
-        st.warning(f"⚠️ **Penambahan resource tidak efektif** ({wait_improvement:.1f}%). Bottleneck mungkin di stasiun lain.")
+        st.metric("🎯 Max Utilisasi", f"{terbaik['Max Utilisasi (%)']:.1f}%")
+    
+    tampil = df_ringkas.drop(columns='nilai')
+    if perbandingan['replikasi'] < 2:
+        tampil = tampil.drop(columns='± CI 95%')
+    st.dataframe(
+        tampil.style.format({
+            'Tunggu (menit)': '{:.2f}',
+            'Sistem (menit)': '{:.2f}',
+            'Throughput (/jam)': '{:.1f}',
+            'Max Utilisasi (%)': '{:.1f}',
+            'Δ vs Baseline': '{:+.2f}',
+            '± CI 95%': '{:.2f}',
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption(
+        f"{len(skenario)} skenario × {perbandingan['replikasi']} replikasi dengan random number bersama. "
+        f"Δ adalah selisih {label_kpi.lower()} berpasangan per seed terhadap baseline."
+    )
     
     st.markdown('<div class="golden-divider"></div>', unsafe_allow_html=True)
     
-    # Boxplot Comparison
+    # Charts
     st.markdown("""
     <div class="section-header">
         <h2>📦 Perbandingan Distribusi</h2>
     </div>
     """, unsafe_allow_html=True)
     
-    col1, col2 = st.columns([2, 1])
+    col1, col2 = st.columns(2)
+    warna = sns.color_palette('viridis', len(skenario)).as_hex()
     
     with col1:
+        plt.style.use('dark_background')
         fig, ax = plt.subplots(figsize=(10, 6))
+        fig.patch.set_facecolor('#1a1a2e')
+        ax.set_facecolor('#1a1a2e')
+        
+        urutan = [next(i for i, s in enumerate(skenario) if s['nama'] == nama) for nama in df_ringkas['Skenario']]
+        galat = df_ringkas['± CI 95%'].fillna(0) if perbandingan['replikasi'] > 1 else None
+        bars = ax.barh(df_ringkas['Skenario'][::-1], df_ringkas['nilai'][::-1],
+                       xerr=None if galat is None else galat[::-1],
+                       color=[warna[i] for i in urutan][::-1], alpha=0.85,
+                       ecolor='white', capsize=4)
+        bars[-1].set_edgecolor('#ffd700')
+        bars[-1].set_linewidth(2)
+        
+        ax.set_xlabel(label_kpi, fontsize=12, color='white')
+        ax.set_title('Peringkat Skenario', fontsize=14, color='#ffd700', fontweight='bold')
+        ax.tick_params(colors='white')
+        ax.grid(True, alpha=0.2, axis='x')
+        sns.despine(ax=ax, top=True, right=True)
+        ax.spines['bottom'].set_color('#666')
+        ax.spines['left'].set_color('#666')
+        
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+    
+    with col2:
         plt.style.use('dark_background')
+        fig, ax = plt.subplots(figsize=(10, 6))
         fig.patch.set_facecolor('#1a1a2e')
         ax.set_facecolor('#1a1a2e')
         
         bp = ax.boxplot(
-            [scen_a['df']['Total_Waktu_Tunggu'], scen_b['df']['Total_Waktu_Tunggu']],
-            labels=[f"Skenario A\n({scen_a['kasir']}K, {scen_a['staff']}S)", 
-                   f"Skenario B\n({scen_b['kasir']}K, {scen_b['staff']}S)"],
+            [df['Total_Waktu_Tunggu'] for df in daftar_log],
+            labels=[f"{s['nama']}\n({s['kasir']}K, {s['staff']}S)" for s in skenario],
             patch_artist=True
         )
         
-        colors = ['#00d2ff', '#ffd700']
-        for patch, color in zip(bp['boxes'], colors):
+        for patch, color in zip(bp['boxes'], warna):
             patch.set_facecolor(color)
             patch.set_alpha(0.7)
         
@@ -341,8 +494,10 @@ if 'comparison_run' in st.session_state and st.session_state.comparison_run:
             median.set_linewidth(2)
         
         ax.set_ylabel('Total Waktu Tunggu (Menit)', fontsize=12, color='white')
-        ax.set_title('Perbandingan Distribusi Waktu Tunggu', fontsize=14, color='#ffd700', fontweight='bold')
+        ax.set_title(f'Distribusi Waktu Tunggu (seed {perbandingan["kpi"]["seed"].min()})',
+                     fontsize=14, color='#ffd700', fontweight='bold')
         ax.tick_params(colors='white')
+        plt.setp(ax.get_xticklabels(), rotation=20 if len(skenario) > 4 else 0, ha='right' if len(skenario) > 4 else 'center')
         ax.grid(True, alpha=0.2, axis='y')
         sns.despine(ax=ax, top=True, right=True)
         ax.spines['bottom'].set_color('#666')
@@ -352,27 +507,6 @@ if 'comparison_run' in st.session_state and st.session_state.comparison_run:
         st.pyplot(fig)
         plt.close(fig)
     
-    with col2:
-        st.markdown("#### 📊 Statistik Ringkas")
-        
-        comparison_data = pd.DataFrame({
-            'Metrik': ['Median', 'Mean', 'Max', 'Std Dev'],
-            'Skenario A': [
-                f"{scen_a['df']['Total_Waktu_Tunggu'].median():.2f}",
-                f"{scen_a['df']['Total_Waktu_Tunggu'].mean():.2f}",
-                f"{scen_a['df']['Total_Waktu_Tunggu'].max():.2f}",
-                f"{scen_a['df']['Total_Waktu_Tunggu'].std():.2f}"
-            ],
-            'Skenario B': [
-                f"{scen_b['df']['Total_Waktu_Tunggu'].median():.2f}",
-                f"{scen_b['df']['Total_Waktu_Tunggu'].mean():.2f}",
-                f"{scen_b['df']['Total_Waktu_Tunggu'].max():.2f}",
-                f"{scen_b['df']['Total_Waktu_Tunggu'].std():.2f}"
-            ]
-        })
-        
-        st.dataframe(comparison_data, use_container_width=True, hide_index=True)
-    
     # Recommendation
     st.markdown('<div class="golden-divider"></div>', unsafe_allow_html=True)
     
@@ -382,25 +516,29 @@ if 'comparison_run' in st.session_state and st.session_state.comparison_run:
     </div>
     """, unsafe_allow_html=True)
     
-    if wait_improvement > 15:
-        st.success(f"""
-        ### ✅ Implementasikan Skenario B
+    nilai_baseline = df_ringkas.loc[df_ringkas['Skenario'] == skenario[0]['nama'], 'nilai'].iat[0]
+    perbaikan = ((nilai_baseline - terbaik['nilai']) if kecil_lebih_baik else (terbaik['nilai'] - nilai_baseline))
+    perbaikan_persen = perbaikan / abs(nilai_baseline) * 100 if nilai_baseline else 0.0
+    
+    if terbaik['Skenario'] == skenario[0]['nama']:
+        bottleneck_baseline = df_ringkas.iloc[0]['Bottleneck']
+        st.warning(f"""
+        ### ⚠️ Baseline Sudah Terbaik
         
-        Dengan menambah resource, Anda dapat mengurangi waktu tunggu sebesar **{wait_improvement:.1f}%**.
-        ROI positif jika biaya staff sebanding dengan kepuasan pelanggan.
+        Tidak ada skenario yang mengungguli baseline. Fokus perbaiki proses di stasiun **{bottleneck_baseline}**.
         """)
-    elif wait_improvement > 5:
-        st.info(f"""
-        ### ℹ️ Pertimbangkan Skenario B
+    elif perbaikan_persen > 15:
+        st.success(f"""
+        ### ✅ Implementasikan {terbaik['Skenario']}
         
-        Peningkatan {wait_improvement:.1f}% mungkin layak jika volume pelanggan tinggi.
+        {label_kpi} membaik **{perbaikan_persen:.1f}%** dibanding baseline
+        dengan {terbaik['Kasir']} kasir dan {terbaik['Staff Ambil']} staff ambil.
         """)
     else:
-        bottleneck_a, _ = identifikasi_bottleneck(scen_a['util'])
-        st.warning(f"""
-        ### ⚠️ Jangan Tambah Resource
+        st.info(f"""
+        ### ℹ️ Pertimbangkan {terbaik['Skenario']}
         
-        Penambahan staff tidak efektif. Fokus perbaiki proses di stasiun **{bottleneck_a}**.
+        Peningkatan {perbaikan_persen:.1f}% mungkin layak jika volume pelanggan tinggi.
         """)
 
 else:
@@ -410,15 +548,15 @@ else:
                 border-radius: 20px; margin: 2rem 0; border: 1px solid rgba(212, 175, 55, 0.2);">
         <h2 style="color: #ffd700; margin-bottom: 1rem;">🎯 Siap untuk Membandingkan?</h2>
         <p style="color: #b8b8b8; font-size: 1.1rem; max-width: 600px; margin: 0 auto;">
-            Konfigurasi dua skenario berbeda di <strong style="color: #ffd700;">Panel Konfigurasi</strong>, 
+            Isi <strong style="color: #ffd700;">Daftar Skenario</strong> di atas, 
             kemudian klik <strong style="color: #00d26a;">JALANKAN PERBANDINGAN</strong>.
         </p>
         <div style="margin-top: 2rem; padding: 1.5rem; background: rgba(255, 215, 0, 0.1); border-radius: 12px; border: 1px solid rgba(255, 215, 0, 0.3);">
             <h4 style="color: #ffd700; margin-bottom: 0.75rem;">💡 Tips:</h4>
             <ul style="color: #d0d0d0; text-align: left; list-style-type: none; padding: 0; margin: 0;">
-                <li>🅰️ <strong>Skenario A</strong> - Konfigurasi baseline (kondisi saat ini)</li>
-                <li>🅱️ <strong>Skenario B</strong> - Konfigurasi yang ingin diuji</li>
-                <li>📊 <strong>Perbandingan</strong> - Lihat dampak perubahan resource</li>
+                <li>🅰️ <strong>Baris pertama</strong> - Konfigurasi baseline (kondisi saat ini)</li>
+                <li>➕ <strong>Baris berikutnya</strong> - Opsi staffing yang ingin diuji</li>
+                <li>🏆 <strong>Peringkat</strong> - Skenario diurutkan dari yang terbaik</li>
             </ul>
         </div>
     </div>
@@ -431,3 +569,8 @@ st.markdown("""
     📈 Halaman Perbandingan Skenario • Dashboard Simulasi Drive-Thru
 </div>
 """, unsafe_allow_html=True)
+
+# Job masih berjalan: rerun berkala untuk memperbarui progres
+if perlu_polling:
+    time.sleep(0.5)
+    st.rerun()
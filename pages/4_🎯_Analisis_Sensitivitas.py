@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+🎯 Halaman Analisis Sensitivitas
+================================
+
+Halaman untuk mengukur faktor mana yang paling memengaruhi KPI
+(screening Morris dan indeks Sobol).
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sensitivitas import FAKTOR_DEFAULT, LABEL_FAKTOR, Faktor, analisis_morris, analisis_sobol
+from sumber_daya import get_eksekutor
+
+# Page Config
+st.set_page_config(
+    page_title="Analisis Sensitivitas - Drive-Thru Simulator",
+    page_icon="🎯",
+    layout="wide"
+)
+
+# Custom CSS
+st.markdown("""
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
+
+    .stApp {
+        font-family: 'Inter', sans-serif;
+    }
+
+    .main-header {
+        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
+        padding: 1.5rem 2rem;
+        border-radius: 16px;
+        margin-bottom: 2rem;
+        border: 1px solid rgba(212, 175, 55, 0.3);
+    }
+
+    .main-header h1 {
+        color: #ffd700;
+        font-size: 2rem;
+        font-weight: 800;
+        margin: 0;
+    }
+
+    .main-header p {
+        color: #b8b8b8;
+        margin: 0.5rem 0 0 0;
+    }
+
+    .golden-divider {
+        height: 2px;
+        background: linear-gradient(90deg, transparent 0%, #ffd700 50%, transparent 100%);
+        margin: 2rem 0;
+        border: none;
+    }
+
+    /* Sidebar Styling */
+    section[data-testid="stSidebar"] {
+        background: linear-gradient(180deg, #0f0f1a 0%, #1a1a2e 100%);
+    }
+
+    section[data-testid="stSidebar"] .stMarkdown h1 {
+        color: #ffd700;
+        font-size: 1.4rem;
+        font-weight: 700;
+        border-bottom: 2px solid rgba(212, 175, 55, 0.3);
+        padding-bottom: 0.75rem;
+    }
+
+    section[data-testid="stSidebar"] .stMarkdown h3 {
+        color: #ffffff;
+        font-size: 1rem;
+        font-weight: 600;
+        margin-top: 1.5rem;
+    }
+
+    /* Button Styling */
+    .stButton > button {
+        width: 100%;
+        background: linear-gradient(135deg, #ffd700 0%, #ffaa00 100%);
+        color: #1a1a2e;
+        font-weight: 700;
+        font-size: 1rem;
+        padding: 0.75rem 1.5rem;
+        border-radius: 12px;
+        border: none;
+        transition: all 0.3s ease;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+
+    .stButton > button:hover {
+        background: linear-gradient(135deg, #ffcc00 0%, #ff9900 100%);
+        transform: translateY(-2px);
+        box-shadow: 0 8px 25px rgba(255, 215, 0, 0.4);
+    }
+
+    .section-header {
+        display: flex;
+        align-items: center;
+        gap: 0.75rem;
+        margin: 2rem 0 1rem 0;
+        padding-bottom: 0.75rem;
+        border-bottom: 2px solid rgba(212, 175, 55, 0.3);
+    }
+
+    .section-header h2 {
+        color: #ffffff;
+        font-size: 1.4rem;
+        font-weight: 700;
+        margin: 0;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# Header
+st.markdown("""
+<div class="main-header">
+    <h1>🎯 Analisis Sensitivitas Global</h1>
+    <p>Faktor mana yang paling menentukan performa drive-thru?</p>
+</div>
+""", unsafe_allow_html=True)
+
+OPSI_KPI = {
+    'Rata-rata Waktu Tunggu': 'rata_waktu_tunggu',
+    'Rata-rata Waktu Sistem': 'rata_waktu_sistem',
+    'Maksimum Waktu Tunggu': 'max_waktu_tunggu',
+    'P90 Waktu Tunggu': 'p90_waktu_tunggu',
+    'P95 Waktu Tunggu': 'p95_waktu_tunggu',
+    'Throughput': 'throughput',
+}
+
+
+def _gaya_axes(fig, ax):
+    """Tema gelap yang sama dengan halaman lain."""
+    fig.patch.set_facecolor('#1a1a2e')
+    ax.set_facecolor('#1a1a2e')
+    ax.tick_params(colors='white')
+    ax.grid(True, alpha=0.2, axis='y')
+    sns.despine(ax=ax, top=True, right=True)
+    ax.spines['bottom'].set_color('#666')
+    ax.spines['left'].set_color('#666')
+
+
+# Sidebar Configuration
+with st.sidebar:
+    st.markdown("# ⚙️ Konfigurasi Analisis")
+
+    metode = st.radio(
+        "Metode",
+        ["Morris (screening)", "Sobol (varians)"],
+        help="Morris murah untuk menyaring faktor; Sobol mengukur porsi varians KPI"
+    )
+
+    label_kpi = st.selectbox("KPI", list(OPSI_KPI.keys()))
+
+    st.markdown("### 🎲 Sampel")
+
+    if metode.startswith("Morris"):
+        ukuran = st.slider(
+            "Jumlah Trajektori", min_value=5, max_value=100, value=20, step=5,
+            help="Evaluasi = trajektori × (jumlah faktor + 1)"
+        )
+    else:
+        ukuran = st.select_slider(
+            "Sampel Dasar (N)", options=[32, 64, 128, 256, 512], value=128,
+            help="Evaluasi = N × (jumlah faktor + 2)"
+        )
+
+    replikasi = st.slider(
+        "Replikasi per Titik", min_value=1, max_value=30, value=10,
+        help="Seed yang sama dipakai di semua titik (common random numbers)"
+    )
+
+    durasi = st.slider(
+        "Durasi Simulasi (menit)",
+        min_value=60,
+        max_value=480,
+        value=240,
+        step=30
+    )
+
+    st.markdown("### 📐 Rentang Faktor")
+
+    df_faktor = st.data_editor(
+        pd.DataFrame({
+            'Faktor': [LABEL_FAKTOR[f.nama] for f in FAKTOR_DEFAULT],
+            'Bawah': [float(f.bawah) for f in FAKTOR_DEFAULT],
+            'Atas': [float(f.atas) for f in FAKTOR_DEFAULT],
+            'Aktif': [True] * len(FAKTOR_DEFAULT),
+        }),
+        disabled=['Faktor'],
+        hide_index=True,
+        use_container_width=True
+    )
+
+    st.markdown("---")
+
+    run_analisis = st.button(
+        "🎯 JALANKAN ANALISIS",
+        use_container_width=True,
+        type="primary"
+    )
+
+# Main Content
+if run_analisis:
+    faktor = [
+        Faktor(f.nama, baris.Bawah, baris.Atas, f.bulat)
+        for f, baris in zip(FAKTOR_DEFAULT, df_faktor.itertuples())
+        if baris.Aktif and baris.Atas > baris.Bawah
+    ]
+
+    if len(faktor) < 2:
+        st.warning("⚠️ Aktifkan minimal dua faktor dengan batas atas lebih besar dari batas bawah.")
+    else:
+        argumen = dict(
+            kpi=OPSI_KPI[label_kpi], faktor=faktor, durasi_simulasi=durasi,
+            replikasi=replikasi, eksekutor=get_eksekutor()
+        )
+        with st.spinner("🔄 Mensimulasikan titik sampel secara paralel..."):
+            if metode.startswith("Morris"):
+                hasil = analisis_morris(jumlah_trajektori=ukuran, **argumen)
+            else:
+                hasil = analisis_sobol(jumlah_sampel=ukuran, **argumen)
+        st.session_state.hasil_sensitivitas = hasil
+
+hasil = st.session_state.get('hasil_sensitivitas')
+if hasil is not None:
+    df = hasil.indeks.copy()
+    df['label'] = df['faktor'].map(LABEL_FAKTOR)
+    nama_kpi = next((k for k, v in OPSI_KPI.items() if v == hasil.kpi), hasil.kpi)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📐 Metode", hasil.metode.capitalize())
+    with col2:
+        st.metric("🔢 Titik Dievaluasi", f"{hasil.jumlah_evaluasi:,}")
+    with col3:
+        st.metric("⏱️ Waktu Komputasi", f"{hasil.waktu_komputasi:.1f} detik")
+
+    st.markdown('<div class="golden-divider"></div>', unsafe_allow_html=True)
+
+    if hasil.metode == 'morris':
+        st.markdown("""
+        <div class="section-header">
+            <h2>🔍 Screening Morris</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            plt.style.use('dark_background')
+            fig, ax = plt.subplots(figsize=(8, 5))
+            _gaya_axes(fig, ax)
+
+            galat = np.vstack([df['mu_star'] - df['mu_star_bawah'], df['mu_star_atas'] - df['mu_star']])
+            ax.bar(df['label'], df['mu_star'], yerr=galat, color='#ffd700', alpha=0.8,
+                   ecolor='white', capsize=5)
+            ax.set_ylabel('μ* (efek per rentang faktor)', fontsize=11, color='white')
+            ax.set_title(f'Pengaruh Faktor terhadap {nama_kpi}', fontsize=13, color='#ffd700', fontweight='bold')
+            plt.setp(ax.get_xticklabels(), rotation=30, ha='right')
+
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
+
+        with col2:
+            plt.style.use('dark_background')
+            fig, ax = plt.subplots(figsize=(8, 5))
+            _gaya_axes(fig, ax)
+            ax.grid(True, alpha=0.2)
+
+            ax.scatter(df['mu_star'], df['sigma'], s=120, color='#00d2ff', edgecolor='white', zorder=3)
+            for _, baris in df.iterrows():
+                ax.annotate(baris['label'], (baris['mu_star'], baris['sigma']),
+                            textcoords='offset points', xytext=(6, 6), color='white', fontsize=9)
+            batas = max(df['mu_star'].max(), df['sigma'].max()) * 1.1 or 1
+            ax.plot([0, batas], [0, batas], '--', color='#666', linewidth=1)
+            ax.set_xlabel('μ*', fontsize=11, color='white')
+            ax.set_ylabel('σ (nonlinier / interaksi)', fontsize=11, color='white')
+            ax.set_title('μ* vs σ', fontsize=13, color='#ffd700', fontweight='bold')
+
+            plt.tight_layout()
+            st.pyplot(fig)
+            plt.close(fig)
+
+        st.info("ℹ️ Faktor di kanan berpengaruh besar; faktor di atas garis putus-putus efeknya "
+                "nonlinier atau bergantung pada faktor lain.")
+    else:
+        st.markdown("""
+        <div class="section-header">
+            <h2>📊 Indeks Sobol</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+        plt.style.use('dark_background')
+        fig, ax = plt.subplots(figsize=(12, 5))
+        _gaya_axes(fig, ax)
+
+        posisi = np.arange(len(df))
+        lebar = 0.38
+        for offset, kolom, warna, label in [
+            (-lebar / 2, 'S1', '#00d2ff', 'Orde pertama (S1)'),
+            (lebar / 2, 'ST', '#ffd700', 'Total (ST)'),
+        ]:
+            galat = np.vstack([
+                (df[kolom] - df[f'{kolom}_bawah']).clip(lower=0),
+                (df[f'{kolom}_atas'] - df[kolom]).clip(lower=0),
+            ])
+            ax.bar(posisi + offset, df[kolom], lebar, yerr=galat, color=warna, alpha=0.8,
+                   ecolor='white', capsize=4, label=label)
+        ax.set_xticks(posisi)
+        ax.set_xticklabels(df['label'], rotation=20, ha='right')
+        ax.set_ylabel('Porsi Varians', fontsize=11, color='white')
+        ax.set_title(f'Indeks Sobol untuk {nama_kpi}', fontsize=13, color='#ffd700', fontweight='bold')
+        ax.legend(facecolor='#1a1a2e', edgecolor='#666')
+
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
+        interaksi = (df['ST'] - df['S1']).clip(lower=0).sum()
+        st.info(f"ℹ️ Selisih ST − S1 menunjukkan efek interaksi (total ±{interaksi:.2f} porsi varians).")
+
+    st.markdown("#### 📋 Tabel Indeks")
+    st.dataframe(
+        df.drop(columns='faktor').set_index('label').round(3),
+        use_container_width=True
+    )
+
+    st.download_button(
+        "📥 Download Sampel (CSV)",
+        hasil.sampel.to_csv(index=False).encode('utf-8'),
+        file_name=f"sensitivitas_{hasil.metode}_{hasil.kpi}.csv",
+        mime="text/csv"
+    )
+
+else:
+    # Initial state
+    st.markdown("""
+    <div style="text-align: center; padding: 3rem; background: linear-gradient(145deg, #1e1e2f 0%, #252540 100%);
+                border-radius: 20px; margin: 2rem 0; border: 1px solid rgba(212, 175, 55, 0.2);">
+        <h2 style="color: #ffd700; margin-bottom: 1rem;">🎯 Faktor Mana yang Paling Penting?</h2>
+        <p style="color: #b8b8b8; font-size: 1.1rem; max-width: 600px; margin: 0 auto;">
+            Pilih metode dan rentang faktor di <strong style="color: #ffd700;">Panel Konfigurasi</strong>,
+            kemudian klik <strong style="color: #00d26a;">JALANKAN ANALISIS</strong>.
+        </p>
+        <div style="margin-top: 2rem; padding: 1.5rem; background: rgba(255, 215, 0, 0.1); border-radius: 12px; border: 1px solid rgba(255, 215, 0, 0.3);">
+            <h4 style="color: #ffd700; margin-bottom: 0.75rem;">💡 Tips:</h4>
+            <ul style="color: #d0d0d0; text-align: left; list-style-type: none; padding: 0; margin: 0;">
+                <li>🔍 <strong>Morris</strong> - Cepat, untuk menyaring faktor yang tidak berpengaruh</li>
+                <li>📊 <strong>Sobol</strong> - Lebih mahal, memisahkan efek langsung dan interaksi</li>
+                <li>📐 <strong>Rentang</strong> - Nonaktifkan faktor yang tidak bisa diubah di lapangan</li>
+            </ul>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+# Footer
+st.markdown("---")
+st.markdown("""
+<div style="text-align: center; color: #666; padding: 1rem;">
+    🎯 Halaman Analisis Sensitivitas • Dashboard Simulasi Drive-Thru
+</div>
+""", unsafe_allow_html=True)
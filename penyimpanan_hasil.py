@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+"""
+Penyimpanan Hasil Simulasi Lokal
+================================
+
+Database SQLite ter-index untuk menyimpan hasil setiap run simulasi agar
+studi staffing minggu lalu dapat dibandingkan tanpa menjalankan ulang.
+
+Setiap run dicatat dengan hash konfigurasi, seed, versi engine, KPI, dan
+pointer ke log yang disimpan terkompresi (gzip) di folder ``log/``.
+Dashboard dan runner batch memeriksa penyimpanan ini sebelum menghitung ulang.
+
+Contoh query:
+    penyimpanan.query(jumlah_kasir=2, rata_waktu_tunggu__lt=5)
+    penyimpanan.query(p90_waktu_tunggu__lt=5)
+
+Database lama tanpa kolom persentil dimigrasi otomatis saat dibuka: kolom
+ditambahkan dan diisi dari ``kpi_json`` run yang sudah tersimpan.
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import uuid
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from distribusi import Distribusi
+from jejak_event import PerekamJejak
+from jejak_kedatangan import JejakKedatangan
+from profiler import ProfilerSimulasi
+from simulation import VERSI_ENGINE, ProgresSimulasi, jalankan_simulasi
+
+
+# Lokasi default database, bisa diganti lewat environment variable
+DIREKTORI_DEFAULT = os.environ.get(
+    'DRIVETHRU_HASIL_DIR',
+    str(Path(__file__).parent / 'hasil_simulasi')
+)
+
+# Parameter jalankan_simulasi yang membentuk hash konfigurasi (seed terpisah)
+KOLOM_PARAMETER = ['laju_kedatangan', 'durasi_simulasi', 'jumlah_kasir', 'jumlah_staff_ambil']
+
+# KPI yang disimpan sebagai kolom agar bisa di-query dan di-index
+KOLOM_KPI = [
+    'total_mobil', 'rata_waktu_tunggu', 'max_waktu_tunggu', 'min_waktu_tunggu',
+    'rata_waktu_sistem', 'throughput', 'std_waktu_tunggu',
+    'utilisasi_pesan', 'utilisasi_bayar', 'utilisasi_ambil',
+    'p50_waktu_tunggu', 'p90_waktu_tunggu', 'p95_waktu_tunggu', 'p99_waktu_tunggu',
+    'p50_waktu_sistem', 'p90_waktu_sistem', 'p95_waktu_sistem', 'p99_waktu_sistem',
+    'persen_tunggu_di_atas_batas',
+]
+
+# Kolom KPI yang ditambahkan setelah skema awal (dimigrasi dengan ALTER TABLE)
+KOLOM_KPI_MIGRASI = KOLOM_KPI[KOLOM_KPI.index('p50_waktu_tunggu'):]
+
+_OPERATOR = {'lt': '<', 'le': '<=', 'gt': '>', 'ge': '>=', 'ne': '!='}
+
+_SKEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    config_hash TEXT NOT NULL,
+    random_seed INTEGER,
+    versi_engine TEXT NOT NULL,
+    dibuat TEXT NOT NULL,
+    laju_kedatangan REAL NOT NULL,
+    durasi_simulasi INTEGER NOT NULL,
+    jumlah_kasir INTEGER NOT NULL,
+    jumlah_staff_ambil INTEGER NOT NULL,
+    total_mobil INTEGER,
+    rata_waktu_tunggu REAL,
+    max_waktu_tunggu REAL,
+    min_waktu_tunggu REAL,
+    rata_waktu_sistem REAL,
+    throughput REAL,
+    std_waktu_tunggu REAL,
+    utilisasi_pesan REAL,
+    utilisasi_bayar REAL,
+    utilisasi_ambil REAL,
+    p50_waktu_tunggu REAL,
+    p90_waktu_tunggu REAL,
+    p95_waktu_tunggu REAL,
+    p99_waktu_tunggu REAL,
+    p50_waktu_sistem REAL,
+    p90_waktu_sistem REAL,
+    p95_waktu_sistem REAL,
+    p99_waktu_sistem REAL,
+    persen_tunggu_di_atas_batas REAL,
+    kpi_json TEXT NOT NULL,
+    utilisasi_json TEXT NOT NULL,
+    path_log TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_runs_kunci
+    ON runs (config_hash, random_seed, versi_engine)
+    WHERE random_seed IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_runs_resource
+    ON runs (jumlah_kasir, jumlah_staff_ambil, rata_waktu_tunggu);
+CREATE INDEX IF NOT EXISTS idx_runs_tunggu ON runs (rata_waktu_tunggu);
+CREATE INDEX IF NOT EXISTS idx_runs_kedatangan ON runs (laju_kedatangan, durasi_simulasi);
+"""
+
+# Index kolom hasil migrasi; dibuat setelah ``_migrasi`` agar kolomnya sudah ada
+_SKEMA_INDEKS_PERSENTIL = """
+CREATE INDEX IF NOT EXISTS idx_runs_p90_tunggu ON runs (p90_waktu_tunggu);
+"""
+
+
+def normalisasi_parameter(parameter: Dict) -> Dict:
+    """Menyamakan tipe parameter agar hash konsisten (mis. 2 vs 2.0)."""
+    return {
+        'laju_kedatangan': round(float(parameter['laju_kedatangan']), 6),
+        'durasi_simulasi': int(parameter['durasi_simulasi']),
+        'jumlah_kasir': int(parameter['jumlah_kasir']),
+        'jumlah_staff_ambil': int(parameter['jumlah_staff_ambil']),
+    }
+
+
+def hash_konfigurasi(parameter: Dict) -> str:
+    """
+    Menghitung hash konfigurasi simulasi (tanpa seed).
+
+    Distribusi layanan non-default ikut di-hash; tanpa distribusi, hash sama
+    dengan konfigurasi eksponensial bawaan. Jejak kedatangan tercatat (path,
+    kolom, ukuran, dan waktu modifikasi file) juga ikut di-hash.
+
+    Args:
+        parameter: Dictionary parameter ``jalankan_simulasi``
+
+    Returns:
+        String hex SHA-256 (16 karakter pertama)
+    """
+    data = normalisasi_parameter(parameter)
+    if parameter.get('distribusi_layanan'):
+        data['distribusi_layanan'] = {
+            stasiun: distribusi.ke_dict()
+            for stasiun, distribusi in parameter['distribusi_layanan'].items()
+        }
+    if parameter.get('jejak_kedatangan') is not None:
+        data['jejak_kedatangan'] = parameter['jejak_kedatangan'].ke_dict()
+    kanonik = json.dumps(data, sort_keys=True)
+    return hashlib.sha256(kanonik.encode('utf-8')).hexdigest()[:16]
+
+
+class PenyimpananHasil:
+    """
+    Database hasil simulasi berbasis SQLite.
+
+    Koneksi dibuka per operasi sehingga aman dipakai dari thread Streamlit
+    maupun dari beberapa proses worker sekaligus.
+
+    Attributes:
+        direktori: Folder berisi ``runs.db`` dan subfolder ``log/``
+    """
+
+    def __init__(self, direktori: Optional[str] = None):
+        """
+        Inisialisasi penyimpanan dan buat skema bila belum ada.
+
+        Args:
+            direktori: Folder penyimpanan (default: ``DIREKTORI_DEFAULT``)
+        """
+        self.direktori = Path(direktori or DIREKTORI_DEFAULT)
+        (self.direktori / 'log').mkdir(parents=True, exist_ok=True)
+        self.path_db = self.direktori / 'runs.db'
+
+        with closing(self._koneksi()) as conn, conn:
+            conn.executescript(_SKEMA)
+            self._migrasi(conn)
+            conn.executescript(_SKEMA_INDEKS_PERSENTIL)
+
+    @staticmethod
+    def _migrasi(conn: sqlite3.Connection):
+        """
+        Menambahkan kolom ``KOLOM_KPI_MIGRASI`` ke database lama.
+
+        Nilai run lama diisi dari ``kpi_json``; run tanpa KPI tersebut
+        (engine lama) tetap NULL.
+        """
+        ada = {baris['name'] for baris in conn.execute("PRAGMA table_info(runs)")}
+        kurang = [k for k in KOLOM_KPI_MIGRASI if k not in ada]
+        if not kurang:
+            return
+        for nama in kurang:
+            try:
+                conn.execute(f"ALTER TABLE runs ADD COLUMN {nama} REAL")
+            except sqlite3.OperationalError as e:
+                # Proses lain sudah menambahkannya lebih dulu
+                if 'duplicate column' not in str(e):
+                    raise
+
+        pembaruan = []
+        for baris in conn.execute("SELECT id, kpi_json FROM runs"):
+            kpi = json.loads(baris['kpi_json'])
+            nilai = [kpi.get(k) for k in kurang]
+            if any(v is not None for v in nilai):
+                pembaruan.append((*nilai, baris['id']))
+        if pembaruan:
+            penugasan = ', '.join(f"{k} = ?" for k in kurang)
+            conn.executemany(f"UPDATE runs SET {penugasan} WHERE id = ?", pembaruan)
+
+    def _koneksi(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path_db), timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def cari(self, parameter: Dict, random_seed: Optional[int]) -> Optional[Dict]:
+        """
+        Mencari run tersimpan dengan konfigurasi, seed, dan versi engine sama.
+
+        Run tanpa seed tidak reproducible sehingga tidak pernah dipakai ulang.
+
+        Args:
+            parameter: Dictionary parameter ``jalankan_simulasi``
+            random_seed: Seed run
+
+        Returns:
+            Dictionary baris run, atau None jika belum ada
+        """
+        if random_seed is None:
+            return None
+
+        with closing(self._koneksi()) as conn:
+            baris = conn.execute(
+                "SELECT * FROM runs WHERE config_hash = ? AND random_seed = ? "
+                "AND versi_engine = ?",
+                (hash_konfigurasi(parameter), int(random_seed), VERSI_ENGINE)
+            ).fetchone()
+        return dict(baris) if baris is not None else None
+
+    def simpan(
+        self,
+        parameter: Dict,
+        random_seed: Optional[int],
+        df_log: pd.DataFrame,
+        df_antrean: pd.DataFrame,
+        utilisasi: Dict[str, float],
+        statistik: Dict[str, float]
+    ) -> int:
+        """
+        Menyimpan satu run beserta log terkompresinya.
+
+        Args:
+            parameter: Dictionary parameter ``jalankan_simulasi``
+            random_seed: Seed run (boleh None)
+            df_log: DataFrame log pelanggan
+            df_antrean: DataFrame monitoring antrean
+            utilisasi: Dictionary utilisasi setiap stasiun
+            statistik: Dictionary statistik KPI
+
+        Returns:
+            ID run di database
+        """
+        norm = normalisasi_parameter(parameter)
+        nama_log = uuid.uuid4().hex
+        df_log.to_pickle(self.direktori / 'log' / f'{nama_log}_log.pkl.gz')
+        df_antrean.to_pickle(self.direktori / 'log' / f'{nama_log}_antrean.pkl.gz')
+
+        kolom = {
+            'config_hash': hash_konfigurasi(parameter),
+            'random_seed': None if random_seed is None else int(random_seed),
+            'versi_engine': VERSI_ENGINE,
+            'dibuat': datetime.now().isoformat(timespec='seconds'),
+            **norm,
+            **{k: statistik.get(k) for k in KOLOM_KPI if k in statistik},
+            'utilisasi_pesan': utilisasi.get('Pesan'),
+            'utilisasi_bayar': utilisasi.get('Bayar'),
+            'utilisasi_ambil': utilisasi.get('Ambil'),
+            'kpi_json': json.dumps(statistik),
+            'utilisasi_json': json.dumps(utilisasi),
+            'path_log': nama_log,
+        }
+
+        nama_kolom = ', '.join(kolom)
+        placeholder = ', '.join('?' for _ in kolom)
+        with closing(self._koneksi()) as conn, conn:
+            # Run lain (mis. worker paralel) bisa menyimpan kunci yang sama lebih dulu
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO runs ({nama_kolom}) VALUES ({placeholder})",
+                tuple(kolom.values())
+            )
+            if cursor.rowcount:
+                return cursor.lastrowid
+
+        self._hapus_log(nama_log)
+        return self.cari(parameter, random_seed)['id']
+
+    def muat(self, run: Dict) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], Dict[str, float]]:
+        """
+        Memuat kembali hasil lengkap sebuah run.
+
+        Args:
+            run: Dictionary baris run dari ``cari`` atau ``query``
+
+        Returns:
+            Tuple sama seperti ``jalankan_simulasi``
+        """
+        folder_log = self.direktori / 'log'
+        df_log = pd.read_pickle(folder_log / f"{run['path_log']}_log.pkl.gz")
+        df_antrean = pd.read_pickle(folder_log / f"{run['path_log']}_antrean.pkl.gz")
+        utilisasi = json.loads(run['utilisasi_json'])
+        statistik = json.loads(run['kpi_json'])
+        return df_log, df_antrean, utilisasi, statistik
+
+    def query(self, **kriteria) -> pd.DataFrame:
+        """
+        Mencari run berdasarkan parameter dan KPI.
+
+        Nama filter mengikuti kolom tabel; akhiran ``__lt``, ``__le``,
+        ``__gt``, ``__ge``, dan ``__ne`` untuk perbandingan, misalnya
+        ``query(jumlah_kasir=2, rata_waktu_tunggu__lt=5)``.
+
+        Returns:
+            DataFrame run yang cocok, terbaru di atas
+        """
+        kolom_valid = set(KOLOM_PARAMETER) | set(KOLOM_KPI) | {
+            'config_hash', 'random_seed', 'versi_engine'
+        }
+        kondisi = []
+        nilai = []
+        for kunci, isi in kriteria.items():
+            nama, _, op = kunci.partition('__')
+            if nama not in kolom_valid:
+                raise ValueError(f"Kolom filter tidak dikenal: {nama}")
+            if op and op not in _OPERATOR:
+                raise ValueError(f"Operator filter tidak dikenal: {op}")
+            kondisi.append(f"{nama} {_OPERATOR.get(op, '=')} ?")
+            nilai.append(isi)
+
+        sql = "SELECT * FROM runs"
+        if kondisi:
+            sql += " WHERE " + " AND ".join(kondisi)
+        sql += " ORDER BY id DESC"
+
+        with closing(self._koneksi()) as conn:
+            return pd.read_sql_query(sql, conn, params=nilai)
+
+    def _hapus_log(self, nama_log: str):
+        for akhiran in ('_log.pkl.gz', '_antrean.pkl.gz'):
+            path = self.direktori / 'log' / f'{nama_log}{akhiran}'
+            if path.exists():
+                path.unlink()
+
+
+def jalankan_simulasi_tersimpan(
+    penyimpanan: Optional[PenyimpananHasil],
+    laju_kedatangan: float = 2.0,
+    durasi_simulasi: int = 240,
+    jumlah_kasir: int = 1,
+    jumlah_staff_ambil: int = 1,
+    random_seed: Optional[int] = 42,
+    profiler: Optional[ProfilerSimulasi] = None,
+    perekam: Optional[PerekamJejak] = None,
+    callback_progres: Optional[Callable[[ProgresSimulasi], None]] = None,
+    token_batal=None,
+    distribusi_layanan: Optional[Dict[str, Distribusi]] = None,
+    jejak_kedatangan: Optional[JejakKedatangan] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], Dict[str, float]]:
+    """
+    Seperti ``jalankan_simulasi``, tetapi memakai hasil tersimpan bila ada.
+
+    Run baru otomatis disimpan. Jika ``penyimpanan`` None, fungsi ini sama
+    persis dengan ``jalankan_simulasi``. Jika ``profiler`` atau ``perekam``
+    diberikan, simulasi selalu dijalankan ulang agar ada yang diukur/direkam.
+
+    Returns:
+        Tuple sama seperti ``jalankan_simulasi``
+    """
+    parameter = {
+        'laju_kedatangan': laju_kedatangan,
+        'durasi_simulasi': durasi_simulasi,
+        'jumlah_kasir': jumlah_kasir,
+        'jumlah_staff_ambil': jumlah_staff_ambil,
+    }
+    if distribusi_layanan:
+        parameter['distribusi_layanan'] = distribusi_layanan
+    if jejak_kedatangan is not None:
+        parameter['jejak_kedatangan'] = jejak_kedatangan
+    opsi = {
+        'random_seed': random_seed,
+        'profiler': profiler,
+        'perekam': perekam,
+        'callback_progres': callback_progres,
+        'token_batal': token_batal,
+    }
+    if penyimpanan is None:
+        return jalankan_simulasi(**opsi, **parameter)
+
+    run = None
+    if profiler is None and perekam is None:
+        run = penyimpanan.cari(parameter, random_seed)
+    if run is not None:
+        return penyimpanan.muat(run)
+
+    hasil = jalankan_simulasi(**opsi, **parameter)
+    penyimpanan.simpan(parameter, random_seed, *hasil)
+    return hasil
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Profiler Fase Simulasi Drive-Thru
+=================================
+
+Instrumentasi opsional untuk mengetahui ke mana waktu sebuah run habis:
+``env.run``, pembentukan DataFrame, ``hitung_statistik``, atau render chart.
+
+Profiler mencatat waktu wall-clock per fase, jumlah event SimPy, ukuran
+puncak antrean event, puncak memori (tracemalloc), dan dapat menyimpan dump
+cProfile. Tanpa profiler, simulasi berjalan tanpa overhead tambahan.
+
+Contoh:
+    profiler = ProfilerSimulasi(ukur_memori=True)
+    jalankan_simulasi(laju_kedatangan=1.5, profiler=profiler)
+    print(profiler.profil.ringkasan())
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import pandas as pd
+import simpy
+
+
+class EnvironmentTerprofil(simpy.Environment):
+    """
+    SimPy Environment yang menghitung event dan puncak antrean event.
+
+    Hanya dipakai saat profiling karena override ``step`` menambah sedikit
+    overhead per event.
+    """
+
+    def __init__(self, initial_time: float = 0):
+        super().__init__(initial_time)
+        self.jumlah_event = 0
+        self.puncak_antrean_event = 0
+
+    def step(self):
+        antrean = len(self._queue)
+        if antrean > self.puncak_antrean_event:
+            self.puncak_antrean_event = antrean
+        self.jumlah_event += 1
+        super().step()
+
+
+@dataclass
+class ProfilSimulasi:
+    """Hasil profiling satu run simulasi."""
+    waktu_fase: Dict[str, float] = field(default_factory=dict)  # Detik per fase
+    jumlah_event: int = 0             # Event SimPy yang diproses
+    puncak_antrean_event: int = 0     # Ukuran maksimum heap event SimPy
+    puncak_memori: Optional[int] = None   # Byte, None jika tidak diukur
+    statistik_cprofile: Optional[str] = None  # Ringkasan pstats (teks)
+    path_cprofile: Optional[str] = None       # Lokasi file dump .prof
+
+    @property
+    def total_waktu(self) -> float:
+        """Total waktu seluruh fase dalam detik."""
+        return sum(self.waktu_fase.values())
+
+    def ringkasan(self) -> pd.DataFrame:
+        """
+        Tabel waktu per fase.
+
+        Returns:
+            DataFrame dengan kolom Fase, Waktu_ms, dan Persen
+        """
+        total = self.total_waktu or 1.0
+        return pd.DataFrame({
+            'Fase': list(self.waktu_fase.keys()),
+            'Waktu_ms': [round(t * 1000, 2) for t in self.waktu_fase.values()],
+            'Persen': [round(t / total * 100, 1) for t in self.waktu_fase.values()],
+        })
+
+
+class ProfilerSimulasi:
+    """
+    Pengumpul data profiling yang diteruskan ke ``SimulasiDriveThru`` dan
+    ``jalankan_simulasi``.
+
+    Attributes:
+        profil: Objek ``ProfilSimulasi`` yang terisi selama run
+    """
+
+    def __init__(
+        self,
+        ukur_memori: bool = False,
+        cprofile: bool = False,
+        path_cprofile: Optional[str] = None
+    ):
+        """
+        Inisialisasi profiler.
+
+        Args:
+            ukur_memori: Ukur puncak memori dengan tracemalloc (lebih lambat)
+            cprofile: Jalankan cProfile selama simulasi
+            path_cprofile: Simpan dump cProfile ke file ini (opsional)
+        """
+        self.ukur_memori = ukur_memori
+        self.cprofile = cprofile
+        self.path_cprofile = path_cprofile
+        self.profil = ProfilSimulasi()
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._memori_dimulai = False
+        self._kedalaman = 0
+
+    def mulai(self):
+        """
+        Mulai pengukuran memori dan cProfile (dipanggil di awal run).
+
+        Pemanggilan bersarang (``jalankan_simulasi`` lalu
+        ``SimulasiDriveThru.jalankan``) hanya diukur sekali oleh yang terluar.
+        """
+        self._kedalaman += 1
+        if self._kedalaman > 1:
+            return
+
+        self.profil = ProfilSimulasi()
+        if self.ukur_memori and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._memori_dimulai = True
+        elif self.ukur_memori:
+            tracemalloc.reset_peak()
+        if self.cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def selesai(self):
+        """Hentikan pengukuran dan isi profil (dipanggil di akhir run)."""
+        self._kedalaman -= 1
+        if self._kedalaman > 0:
+            return
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            buffer = io.StringIO()
+            stats = pstats.Stats(self._cprofile, stream=buffer)
+            stats.sort_stats('cumulative').print_stats(25)
+            self.profil.statistik_cprofile = buffer.getvalue()
+            if self.path_cprofile:
+                stats.dump_stats(self.path_cprofile)
+                self.profil.path_cprofile = self.path_cprofile
+            self._cprofile = None
+
+        if self.ukur_memori and tracemalloc.is_tracing():
+            _, puncak = tracemalloc.get_traced_memory()
+            self.profil.puncak_memori = puncak
+            if self._memori_dimulai:
+                tracemalloc.stop()
+                self._memori_dimulai = False
+
+    @contextmanager
+    def fase(self, nama: str):
+        """
+        Context manager untuk mengukur waktu satu fase.
+
+        Pemanggilan berulang dengan nama sama dijumlahkan.
+        """
+        mulai = time.perf_counter()
+        try:
+            yield
+        finally:
+            durasi = time.perf_counter() - mulai
+            self.profil.waktu_fase[nama] = self.profil.waktu_fase.get(nama, 0.0) + durasi
+
+    def catat_environment(self, env: EnvironmentTerprofil):
+        """Salin penghitung event dari environment setelah ``env.run``."""
+        self.profil.jumlah_event += env.jumlah_event
+        self.profil.puncak_antrean_event = max(
+            self.profil.puncak_antrean_event, env.puncak_antrean_event
+        )
+
+
+@contextmanager
+def fase_opsional(profiler: Optional[ProfilerSimulasi], nama: str):
+    """Seperti ``ProfilerSimulasi.fase`` tetapi no-op jika profiler None."""
+    if profiler is None:
+        yield
+    else:
+        with profiler.fase(nama):
+            yield
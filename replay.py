@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Replay Simulasi dari Jejak Event
+================================
+
+Membangun ulang keadaan setiap stasiun (panjang antrean, mobil yang sedang
+dilayani) pada sembarang waktu simulasi dari file jejak event, tanpa
+menjalankan ulang SimPy.
+
+Keadaan disimpan sebagai snapshot periodik setiap ``interval_snapshot``
+event. Untuk mencari keadaan pada waktu ``t``: binary search posisi event,
+ambil snapshot terdekat sebelumnya, lalu terapkan delta sisa event
+(paling banyak ``interval_snapshot``). Dengan begitu seek bernilai
+O(log n) terhadap panjang jejak.
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from jejak_event import (
+    BacaJejak,
+    STASIUN_SISTEM, STASIUN_PESAN, STASIUN_BAYAR, STASIUN_AMBIL,
+    EVENT_DATANG, EVENT_MASUK_ANTREAN, EVENT_MULAI_LAYANAN,
+    EVENT_SELESAI_LAYANAN, EVENT_KELUAR
+)
+
+
+# Kolom vektor keadaan
+KOLOM_KEADAAN = [
+    'Antrean_Pesan', 'Dilayani_Pesan',
+    'Antrean_Bayar', 'Dilayani_Bayar',
+    'Antrean_Ambil', 'Dilayani_Ambil',
+    'Di_Sistem', 'Selesai',
+]
+
+_KOLOM_STASIUN = {
+    STASIUN_PESAN: (0, 1),
+    STASIUN_BAYAR: (2, 3),
+    STASIUN_AMBIL: (4, 5),
+}
+
+
+def _buat_tabel_delta() -> np.ndarray:
+    """Tabel perubahan keadaan per (stasiun, jenis event)."""
+    tabel = np.zeros((4, 5, len(KOLOM_KEADAAN)), dtype=np.int32)
+    tabel[STASIUN_SISTEM, EVENT_DATANG, 6] = 1
+    tabel[STASIUN_SISTEM, EVENT_KELUAR, 6] = -1
+    tabel[STASIUN_SISTEM, EVENT_KELUAR, 7] = 1
+    for stasiun, (kol_antre, kol_layan) in _KOLOM_STASIUN.items():
+        tabel[stasiun, EVENT_MASUK_ANTREAN, kol_antre] = 1
+        tabel[stasiun, EVENT_MULAI_LAYANAN, kol_antre] = -1
+        tabel[stasiun, EVENT_MULAI_LAYANAN, kol_layan] = 1
+        tabel[stasiun, EVENT_SELESAI_LAYANAN, kol_layan] = -1
+    return tabel
+
+
+TABEL_DELTA = _buat_tabel_delta()
+
+
+class MesinReplay:
+    """
+    Mesin replay berbasis snapshot + delta di atas ``BacaJejak``.
+
+    Attributes:
+        jejak: Pembaca jejak event
+        interval_snapshot: Jumlah event antar snapshot
+        snapshot: Array (jumlah_snapshot, 8) keadaan sebelum event ke ``k * interval``
+    """
+
+    def __init__(
+        self,
+        jejak: BacaJejak,
+        interval_snapshot: int = 1024,
+        ukuran_chunk: int = 1_048_576
+    ):
+        """
+        Bangun snapshot dengan satu lintasan berpotongan (memori terbatas).
+
+        Args:
+            jejak: Pembaca jejak event
+            interval_snapshot: Jumlah event antar snapshot
+            ukuran_chunk: Jumlah event per potongan saat membangun snapshot
+        """
+        self.jejak = jejak
+        self.interval_snapshot = interval_snapshot
+        # Kolom waktu kontigu: searchsorted tanpa menyalin kolom ber-stride
+        self._waktu = jejak.waktu
+
+        n = len(jejak)
+        jumlah_snapshot = n // interval_snapshot + 1
+        self.snapshot = np.zeros((jumlah_snapshot, len(KOLOM_KEADAAN)), dtype=np.int32)
+
+        # Chunk kelipatan interval agar snapshot jatuh tepat di batas chunk
+        ukuran_chunk = max(interval_snapshot, ukuran_chunk // interval_snapshot * interval_snapshot)
+        keadaan = np.zeros(len(KOLOM_KEADAAN), dtype=np.int32)
+        for awal in range(0, n, ukuran_chunk):
+            potongan = jejak.record[awal:awal + ukuran_chunk]
+            delta = TABEL_DELTA[potongan['stasiun'], potongan['jenis']]
+            kumulatif = np.cumsum(delta, axis=0) + keadaan
+
+            # Snapshot k berisi keadaan setelah k * interval event
+            k_awal = awal // interval_snapshot + 1
+            posisi = np.arange(interval_snapshot - 1, len(potongan), interval_snapshot)
+            self.snapshot[k_awal:k_awal + len(posisi)] = kumulatif[posisi]
+            keadaan = kumulatif[-1]
+
+    @property
+    def waktu_akhir(self) -> float:
+        """Waktu event terakhir di jejak."""
+        return float(self._waktu[-1]) if len(self._waktu) else 0.0
+
+    def keadaan_pada(self, waktu: float) -> Dict[str, int]:
+        """
+        Keadaan seluruh stasiun setelah semua event dengan waktu <= ``waktu``.
+
+        Args:
+            waktu: Waktu simulasi (menit)
+
+        Returns:
+            Dictionary berkunci ``KOLOM_KEADAAN``
+        """
+        posisi = int(np.searchsorted(self._waktu, waktu, side='right'))
+        k = posisi // self.interval_snapshot
+        awal = k * self.interval_snapshot
+
+        keadaan = self.snapshot[k].copy()
+        if posisi > awal:
+            potongan = self.jejak.record[awal:posisi]
+            keadaan += TABEL_DELTA[potongan['stasiun'], potongan['jenis']].sum(axis=0)
+        return dict(zip(KOLOM_KEADAAN, keadaan.tolist()))
+
+    def deret_keadaan(self, daftar_waktu) -> pd.DataFrame:
+        """
+        Keadaan pada banyak titik waktu sekaligus (mis. frame animasi).
+
+        Args:
+            daftar_waktu: Iterable waktu simulasi
+
+        Returns:
+            DataFrame dengan kolom Waktu dan ``KOLOM_KEADAAN``
+        """
+        baris = []
+        for waktu in daftar_waktu:
+            keadaan = self.keadaan_pada(waktu)
+            keadaan['Waktu'] = waktu
+            baris.append(keadaan)
+        return pd.DataFrame(baris, columns=['Waktu'] + KOLOM_KEADAAN)
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Replikasi Sekuensial Simulasi Drive-Thru
+========================================
+
+Menjalankan replikasi independen (seed berbeda) sampai confidence interval
+sebuah KPI cukup sempit. Pengguna menentukan target setengah-lebar relatif
+(mis. 5% dari rata-rata waktu tunggu); replikasi dikirim paralel per batch
+dan berhenti begitu target tercapai atau batas maksimum replikasi habis.
+Jika rata-rata KPI 0 (mis. waktu tunggu saat beban ringan), target relatif
+tidak terdefinisi; sebagai gantinya setengah-lebar dibandingkan dengan
+target absolut (satuan KPI). Setengah-lebar 0 selalu memenuhi target.
+Batch dikirim lewat backend eksekutor (proses lokal atau worker TCP).
+
+Contoh:
+    python replikasi.py --laju 1.5 --kasir 2 --target 0.05
+    python replikasi.py --kpi rata_waktu_sistem --target 0.02 --maks 500
+    python replikasi.py --backend tcp --worker-tcp 127.0.0.1:9100,127.0.0.1:9101
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import functools
+import math
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from eksekutor import Eksekutor, EksekutorProses, buat_eksekutor
+from jalankan_batch import PARAMETER_SKENARIO, jalankan_skenario
+
+
+@dataclass
+class HasilReplikasi:
+    """Ringkasan replikasi sekuensial untuk satu KPI."""
+    kpi: str
+    rata_rata: float
+    setengah_lebar: float          # Setengah lebar CI (satuan KPI)
+    setengah_lebar_relatif: float  # setengah_lebar / |rata_rata| (inf jika rata-rata 0)
+    jumlah_replikasi: int
+    target_tercapai: bool
+    tingkat_kepercayaan: float
+    df_replikasi: pd.DataFrame = field(repr=False)  # KPI lengkap per replikasi
+
+    @property
+    def interval(self) -> tuple:
+        """Batas bawah dan atas confidence interval."""
+        return (self.rata_rata - self.setengah_lebar, self.rata_rata + self.setengah_lebar)
+
+
+def hitung_interval(
+    nilai: np.ndarray,
+    tingkat_kepercayaan: float = 0.95
+) -> tuple:
+    """
+    Confidence interval t-Student untuk rata-rata.
+
+    Args:
+        nilai: Sampel KPI dari replikasi independen
+        tingkat_kepercayaan: Misal 0.95
+
+    Returns:
+        Tuple (rata_rata, setengah_lebar)
+    """
+    n = len(nilai)
+    rata = float(np.mean(nilai))
+    if n < 2:
+        return rata, math.inf
+    t_kritis = stats.t.ppf(0.5 + tingkat_kepercayaan / 2, df=n - 1)
+    return rata, float(t_kritis * np.std(nilai, ddof=1) / math.sqrt(n))
+
+
+def target_tercapai(
+    rata: float,
+    setengah: float,
+    target_relatif: float,
+    target_absolut: float
+) -> bool:
+    """
+    Aturan berhenti replikasi sekuensial.
+
+    Setengah-lebar 0 selalu memenuhi target. Jika rata-rata 0, setengah-lebar
+    relatif tak hingga, sehingga dipakai ``setengah <= target_absolut``.
+    """
+    if setengah == 0:
+        return True
+    if rata == 0:
+        return setengah <= target_absolut
+    return setengah / abs(rata) <= target_relatif
+
+
+def _relatif(rata: float, setengah: float) -> float:
+    if setengah == 0:
+        return 0.0
+    return setengah / abs(rata) if rata != 0 else math.inf
+
+
+def replikasi_sekuensial(
+    parameter: Dict,
+    kpi: str = 'rata_waktu_tunggu',
+    target_relatif: float = 0.05,
+    tingkat_kepercayaan: float = 0.95,
+    minimal: int = 5,
+    maksimal: int = 200,
+    ukuran_batch: Optional[int] = None,
+    seed_awal: int = 1,
+    workers: Optional[int] = None,
+    direktori_db: Optional[str] = None,
+    verbose: bool = False,
+    eksekutor: Optional[Eksekutor] = None,
+    target_absolut: float = 0.01
+) -> HasilReplikasi:
+    """
+    Menjalankan replikasi per batch paralel sampai CI memenuhi target.
+
+    Replikasi ke-i memakai seed ``seed_awal + i`` sehingga hasil dapat
+    direproduksi dan tidak bergantung pada urutan selesai worker.
+
+    Args:
+        parameter: Argumen ``jalankan_simulasi`` tanpa ``random_seed``
+        kpi: Nama KPI di statistik atau ``utilisasi_<stasiun>``
+        target_relatif: Target setengah-lebar CI relatif terhadap rata-rata
+        tingkat_kepercayaan: Tingkat kepercayaan CI
+        minimal: Jumlah replikasi minimum sebelum aturan berhenti diperiksa
+        maksimal: Batas atas jumlah replikasi
+        ukuran_batch: Replikasi per batch (default: jumlah worker)
+        seed_awal: Seed replikasi pertama
+        workers: Jumlah proses worker jika ``eksekutor`` tidak diberikan
+        direktori_db: Folder ``PenyimpananHasil`` (opsional)
+        verbose: Cetak progres per batch ke stderr
+        eksekutor: Backend eksekusi (default: ``EksekutorProses(workers)``)
+        target_absolut: Target setengah-lebar (satuan KPI) jika rata-rata 0
+
+    Returns:
+        Objek ``HasilReplikasi``
+    """
+    milik_sendiri = eksekutor is None
+    if milik_sendiri:
+        eksekutor = EksekutorProses(workers)
+    if ukuran_batch is None:
+        ukuran_batch = eksekutor.jumlah_worker
+
+    fungsi = functools.partial(jalankan_skenario, direktori_db=direktori_db)
+    baris: List[Dict] = []
+    rata, setengah = math.nan, math.inf
+
+    try:
+        while len(baris) < maksimal:
+            jumlah = min(ukuran_batch, maksimal - len(baris))
+            if len(baris) < minimal:
+                jumlah = max(jumlah, min(minimal, maksimal) - len(baris))
+
+            daftar_skenario = [
+                {
+                    **PARAMETER_SKENARIO, **parameter,
+                    'random_seed': seed_awal + i, 'id': str(seed_awal + i)
+                }
+                for i in range(len(baris), len(baris) + jumlah)
+            ]
+            # Hasil tersusun menurut urutan seed, bukan urutan selesai worker
+            baris.extend(eksekutor.jalankan(fungsi, daftar_skenario, ukuran_chunk=1))
+
+            nilai = np.array([b[kpi] for b in baris], dtype=float)
+            rata, setengah = hitung_interval(nilai, tingkat_kepercayaan)
+            relatif = _relatif(rata, setengah)
+            if verbose:
+                print(
+                    f"n={len(baris)}: {kpi} = {rata:.3f} ± {setengah:.3f} "
+                    f"({relatif * 100:.1f}%)",
+                    file=sys.stderr
+                )
+            tercapai = target_tercapai(rata, setengah, target_relatif, target_absolut)
+            if len(baris) >= minimal and tercapai:
+                break
+    finally:
+        if milik_sendiri:
+            eksekutor.tutup()
+
+    return HasilReplikasi(
+        kpi=kpi,
+        rata_rata=rata,
+        setengah_lebar=setengah,
+        setengah_lebar_relatif=_relatif(rata, setengah),
+        jumlah_replikasi=len(baris),
+        target_tercapai=target_tercapai(rata, setengah, target_relatif, target_absolut),
+        tingkat_kepercayaan=tingkat_kepercayaan,
+        df_replikasi=pd.DataFrame(baris)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line."""
+    parser = argparse.ArgumentParser(
+        description="Replikasi sekuensial sampai CI KPI mencapai target lebar."
+    )
+    parser.add_argument('--laju', type=float, default=2.0, help="Interval kedatangan (menit)")
+    parser.add_argument('--durasi', type=int, default=240, help="Durasi simulasi (menit)")
+    parser.add_argument('--kasir', type=int, default=1, help="Jumlah kasir")
+    parser.add_argument('--staff', type=int, default=1, help="Jumlah staff ambil")
+    parser.add_argument('--kpi', default='rata_waktu_tunggu', help="KPI yang dipantau")
+    parser.add_argument('--target', type=float, default=0.05,
+                        help="Target setengah-lebar CI relatif (0.05 = 5%%)")
+    parser.add_argument('--target-absolut', type=float, default=0.01,
+                        help="Target setengah-lebar (satuan KPI) jika rata-rata KPI 0")
+    parser.add_argument('--kepercayaan', type=float, default=0.95, help="Tingkat kepercayaan")
+    parser.add_argument('--min', dest='minimal', type=int, default=5, help="Replikasi minimum")
+    parser.add_argument('--maks', type=int, default=200, help="Replikasi maksimum")
+    parser.add_argument('--batch', type=int, default=None, help="Replikasi per batch")
+    parser.add_argument('--seed', type=int, default=1, help="Seed replikasi pertama")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Jumlah proses worker")
+    parser.add_argument('--db', default=None, metavar='DIREKTORI', help="Folder penyimpanan hasil")
+    parser.add_argument('--backend', choices=['lokal', 'proses', 'tcp'], default='proses',
+                        help="Backend eksekusi (default: proses)")
+    parser.add_argument('--worker-tcp', default=None, metavar='HOST:PORT,...',
+                        help="Alamat worker untuk --backend tcp")
+    parser.add_argument('--token', default=None, help="Token worker TCP")
+    args = parser.parse_args(argv)
+
+    with buat_eksekutor(args.backend, args.workers, args.worker_tcp, args.token) as eksekutor:
+        hasil = replikasi_sekuensial(
+            {
+                'laju_kedatangan': args.laju,
+                'durasi_simulasi': args.durasi,
+                'jumlah_kasir': args.kasir,
+                'jumlah_staff_ambil': args.staff,
+            },
+            kpi=args.kpi,
+            target_relatif=args.target,
+            target_absolut=args.target_absolut,
+            tingkat_kepercayaan=args.kepercayaan,
+            minimal=args.minimal,
+            maksimal=args.maks,
+            ukuran_batch=args.batch,
+            seed_awal=args.seed,
+            direktori_db=args.db,
+            verbose=True,
+            eksekutor=eksekutor
+        )
+
+    bawah, atas = hasil.interval
+    status = "tercapai" if hasil.target_tercapai else "TIDAK tercapai (batas maksimum)"
+    print(f"{hasil.kpi}: {hasil.rata_rata:.3f} [{bawah:.3f}, {atas:.3f}] "
+          f"({hasil.tingkat_kepercayaan:.0%} CI)")
+    print(f"Setengah-lebar relatif: {hasil.setengah_lebar_relatif * 100:.2f}% - target {status}")
+    print(f"Replikasi dibutuhkan: {hasil.jumlah_replikasi}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+"""
+Analisis Sensitivitas Global Simulasi Drive-Thru
+================================================
+
+Mengukur seberapa besar setiap input (interval kedatangan, rata-rata
+layanan tiap stasiun, jumlah kasir, dan jumlah staff ambil) memengaruhi
+KPI seperti rata-rata waktu tunggu.
+
+- **Morris (elementary effects)**: screening murah; ``mu*`` besar berarti
+  faktor berpengaruh, ``sigma`` besar berarti efeknya nonlinier atau
+  berinteraksi dengan faktor lain.
+- **Sobol (estimator Saltelli/Jansen)**: indeks orde pertama ``S1`` (porsi
+  varians KPI dari faktor itu sendiri) dan total ``ST`` (termasuk interaksi),
+  memakai sampel kuasi-acak ``scipy.stats.qmc.Sobol``.
+
+Setiap titik sampel dievaluasi dengan ``engine_batch`` (beberapa replikasi
+dengan seed yang sama untuk semua titik / common random numbers) dan titik
+dikirim paralel lewat ``eksekutor``. Confidence interval indeks dihitung
+dengan bootstrap.
+
+Contoh:
+    python sensitivitas.py morris --trajektori 20
+    python sensitivitas.py sobol --sampel 256 --kpi rata_waktu_sistem
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from eksekutor import Eksekutor, EksekutorProses
+from engine_batch import simulasi_batch_konfigurasi
+from simulation import KonfigurasiSimulasi
+
+
+@dataclass(frozen=True)
+class Faktor:
+    """Satu input ``KonfigurasiSimulasi`` beserta rentang nilainya."""
+    nama: str
+    bawah: float
+    atas: float
+    bulat: bool = False  # Kapasitas: nilai bulat bawah..atas (inklusif)
+
+    def skala(self, u: np.ndarray) -> np.ndarray:
+        """Memetakan nilai [0, 1] ke rentang faktor."""
+        if self.bulat:
+            return np.minimum(np.floor(self.bawah + u * (self.atas - self.bawah + 1)), self.atas)
+        return self.bawah + u * (self.atas - self.bawah)
+
+
+FAKTOR_DEFAULT: Tuple[Faktor, ...] = (
+    Faktor('laju_kedatangan', 1.0, 4.0),
+    Faktor('waktu_layanan_pesan', 0.5, 2.5),
+    Faktor('waktu_layanan_bayar', 0.5, 2.0),
+    Faktor('waktu_layanan_ambil', 1.0, 3.0),
+    Faktor('kapasitas_kasir', 1, 4, bulat=True),
+    Faktor('kapasitas_ambil', 1, 4, bulat=True),
+)
+
+LABEL_FAKTOR = {
+    'laju_kedatangan': 'Interval Kedatangan',
+    'waktu_layanan_pesan': 'Layanan Pesan',
+    'waktu_layanan_bayar': 'Layanan Bayar',
+    'waktu_layanan_ambil': 'Layanan Ambil',
+    'kapasitas_kasir': 'Jumlah Kasir',
+    'kapasitas_ambil': 'Jumlah Staff Ambil',
+}
+
+
+@dataclass
+class HasilSensitivitas:
+    """Indeks sensitivitas satu KPI."""
+    metode: str                 # 'morris' atau 'sobol'
+    kpi: str
+    indeks: pd.DataFrame        # Satu baris per faktor
+    jumlah_evaluasi: int        # Titik sampel yang disimulasikan
+    waktu_komputasi: float      # Detik
+    sampel: pd.DataFrame = field(repr=False, default=None)  # Input + KPI per titik
+
+
+def _evaluasi_titik(tugas: Tuple[Dict, int, List[int]]) -> Dict[str, float]:
+    """Rata-rata KPI satu titik sampel (dieksekusi di worker)."""
+    nilai, durasi, seeds = tugas
+    config = KonfigurasiSimulasi(durasi_simulasi=durasi, random_seed=None, **nilai)
+    df = simulasi_batch_konfigurasi(config, seeds)
+    return df.drop(columns='random_seed').mean().to_dict()
+
+
+def evaluasi(
+    unit: np.ndarray,
+    faktor: Sequence[Faktor],
+    durasi_simulasi: int = 240,
+    replikasi: int = 10,
+    eksekutor: Optional[Eksekutor] = None
+) -> pd.DataFrame:
+    """
+    Mensimulasikan setiap baris matriks sampel di hypercube satuan.
+
+    Args:
+        unit: Array (n, k) bernilai [0, 1]
+        faktor: Definisi k faktor
+        durasi_simulasi: Durasi setiap replikasi (menit)
+        replikasi: Replikasi per titik (seed 1..replikasi untuk semua titik)
+        eksekutor: Backend eksekusi (default: ``EksekutorProses``)
+
+    Returns:
+        DataFrame nilai faktor dan rata-rata KPI per titik
+    """
+    kolom = {f.nama: f.skala(unit[:, i]) for i, f in enumerate(faktor)}
+    seeds = list(range(1, replikasi + 1))
+    daftar_tugas = [
+        (
+            {f.nama: int(kolom[f.nama][j]) if f.bulat else float(kolom[f.nama][j]) for f in faktor},
+            durasi_simulasi,
+            seeds,
+        )
+        for j in range(len(unit))
+    ]
+
+    if eksekutor is None:
+        with EksekutorProses() as eksekutor:
+            hasil = eksekutor.jalankan(_evaluasi_titik, daftar_tugas)
+    else:
+        hasil = eksekutor.jalankan(_evaluasi_titik, daftar_tugas)
+    return pd.concat([pd.DataFrame(kolom), pd.DataFrame(hasil)], axis=1)
+
+
+def _persentil(sampel: np.ndarray, tingkat_kepercayaan: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Batas CI persentil bootstrap per kolom."""
+    alpha = (1 - tingkat_kepercayaan) / 2
+    return (
+        np.nanquantile(sampel, alpha, axis=0),
+        np.nanquantile(sampel, 1 - alpha, axis=0),
+    )
+
+
+# =====================================================================
+# MORRIS
+# =====================================================================
+def sampel_morris(
+    jumlah_trajektori: int,
+    jumlah_faktor: int,
+    level: int = 4,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Trajektori one-at-a-time Morris di grid ``level`` titik.
+
+    Returns:
+        Tuple (unit, arah, urutan): ``unit`` berukuran (r * (k + 1), k);
+        ``arah`` (r, k) berisi +delta/-delta tiap faktor; ``urutan`` (r, k)
+        berisi faktor yang diubah pada langkah ke-j trajektori
+    """
+    rng = rng or np.random.default_rng()
+    delta = level / (2 * (level - 1))
+    grid = np.arange(level) / (level - 1)
+
+    titik = np.empty((jumlah_trajektori, jumlah_faktor + 1, jumlah_faktor))
+    arah = np.zeros((jumlah_trajektori, jumlah_faktor))
+    urutan = np.empty((jumlah_trajektori, jumlah_faktor), dtype=int)
+    for t in range(jumlah_trajektori):
+        x = rng.choice(grid, jumlah_faktor)
+        titik[t, 0] = x
+        urutan[t] = rng.permutation(jumlah_faktor)
+        for j, i in enumerate(urutan[t]):
+            x = x.copy()
+            arah[t, i] = delta if x[i] + delta <= 1 else -delta
+            x[i] += arah[t, i]
+            titik[t, j + 1] = x
+    return titik.reshape(-1, jumlah_faktor), arah, urutan
+
+
+def indeks_morris(
+    y: np.ndarray,
+    arah: np.ndarray,
+    urutan: np.ndarray,
+    jumlah_bootstrap: int = 1000,
+    tingkat_kepercayaan: float = 0.95,
+    rng: Optional[np.random.Generator] = None
+) -> pd.DataFrame:
+    """
+    Statistik elementary effect per faktor.
+
+    Args:
+        y: KPI per titik, urutan sama dengan ``sampel_morris``
+        arah, urutan: Keluaran kedua dan ketiga ``sampel_morris``
+
+    Returns:
+        DataFrame kolom mu, mu_star, sigma, mu_star_bawah, mu_star_atas
+    """
+    rng = rng or np.random.default_rng()
+    jumlah_trajektori, jumlah_faktor = arah.shape
+    y = y.reshape(jumlah_trajektori, jumlah_faktor + 1)
+
+    # Efek elementer per satuan rentang faktor
+    efek = np.empty((jumlah_trajektori, jumlah_faktor))
+    for t in range(jumlah_trajektori):
+        selisih = np.diff(y[t])
+        efek[t, urutan[t]] = selisih / arah[t, urutan[t]]
+
+    indeks = np.abs(efek)
+    pilihan = rng.integers(0, jumlah_trajektori, (jumlah_bootstrap, jumlah_trajektori))
+    bootstrap = indeks[pilihan].mean(axis=1)
+    bawah, atas = _persentil(bootstrap, tingkat_kepercayaan)
+
+    return pd.DataFrame({
+        'mu': efek.mean(axis=0),
+        'mu_star': indeks.mean(axis=0),
+        'sigma': efek.std(axis=0, ddof=1) if jumlah_trajektori > 1 else np.zeros(jumlah_faktor),
+        'mu_star_bawah': bawah,
+        'mu_star_atas': atas,
+    })
+
+
+def analisis_morris(
+    kpi: str = 'rata_waktu_tunggu',
+    faktor: Sequence[Faktor] = FAKTOR_DEFAULT,
+    jumlah_trajektori: int = 20,
+    level: int = 4,
+    durasi_simulasi: int = 240,
+    replikasi: int = 10,
+    seed: int = 0,
+    jumlah_bootstrap: int = 1000,
+    tingkat_kepercayaan: float = 0.95,
+    eksekutor: Optional[Eksekutor] = None
+) -> HasilSensitivitas:
+    """
+    Screening Morris untuk satu KPI.
+
+    Args:
+        kpi: Nama KPI (``hitung_statistik`` atau ``utilisasi_<stasiun>``)
+        faktor: Faktor yang dianalisis
+        jumlah_trajektori: Jumlah trajektori r (evaluasi = r * (k + 1))
+        level: Jumlah level grid
+        durasi_simulasi: Durasi setiap replikasi (menit)
+        replikasi: Replikasi per titik
+        seed: Seed desain sampel dan bootstrap
+        jumlah_bootstrap: Jumlah resample bootstrap
+        tingkat_kepercayaan: Tingkat kepercayaan CI
+        eksekutor: Backend eksekusi (default: ``EksekutorProses``)
+
+    Returns:
+        ``HasilSensitivitas`` dengan indeks per faktor
+    """
+    mulai = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    unit, arah, urutan = sampel_morris(jumlah_trajektori, len(faktor), level, rng)
+    sampel = evaluasi(unit, faktor, durasi_simulasi, replikasi, eksekutor)
+
+    indeks = indeks_morris(
+        sampel[kpi].to_numpy(), arah, urutan,
+        jumlah_bootstrap, tingkat_kepercayaan, rng
+    )
+    indeks.insert(0, 'faktor', [f.nama for f in faktor])
+    return HasilSensitivitas(
+        metode='morris',
+        kpi=kpi,
+        indeks=indeks.sort_values('mu_star', ascending=False, ignore_index=True),
+        jumlah_evaluasi=len(unit),
+        waktu_komputasi=time.perf_counter() - mulai,
+        sampel=sampel
+    )
+
+
+# =====================================================================
+# SOBOL
+# =====================================================================
+def sampel_saltelli(jumlah_sampel: int, jumlah_faktor: int, seed: int = 0) -> np.ndarray:
+    """
+    Matriks A, B, dan AB_i dari sekuens Sobol 2k dimensi.
+
+    ``jumlah_sampel`` dibulatkan ke pangkat dua terdekat ke atas agar sifat
+    keseimbangan sekuens Sobol terjaga.
+
+    Returns:
+        Array (n * (k + 2), k): blok A, blok B, lalu AB_1..AB_k
+    """
+    m = max(1, math.ceil(math.log2(jumlah_sampel)))
+    dasar = qmc.Sobol(d=2 * jumlah_faktor, scramble=True, seed=seed).random_base2(m)
+    a, b = dasar[:, :jumlah_faktor], dasar[:, jumlah_faktor:]
+    blok = [a, b]
+    for i in range(jumlah_faktor):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        blok.append(ab)
+    return np.vstack(blok)
+
+
+def _estimasi_sobol(fa: np.ndarray, fb: np.ndarray, fab: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimator Saltelli (2010) untuk S1 dan Jansen untuk ST.
+
+    Args:
+        fa, fb: Array (..., n)
+        fab: Array (..., k, n)
+    """
+    varians = np.var(np.concatenate([fa, fb], axis=-1), axis=-1, ddof=1)[..., None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s1 = np.mean(fb[..., None, :] * (fab - fa[..., None, :]), axis=-1) / varians
+        st_ = 0.5 * np.mean((fa[..., None, :] - fab) ** 2, axis=-1) / varians
+    return s1, st_
+
+
+def indeks_sobol(
+    y: np.ndarray,
+    jumlah_faktor: int,
+    jumlah_bootstrap: int = 1000,
+    tingkat_kepercayaan: float = 0.95,
+    rng: Optional[np.random.Generator] = None
+) -> pd.DataFrame:
+    """
+    Indeks Sobol orde pertama dan total beserta CI bootstrap.
+
+    Args:
+        y: KPI per titik, urutan sama dengan ``sampel_saltelli``
+
+    Returns:
+        DataFrame kolom S1, S1_bawah, S1_atas, ST, ST_bawah, ST_atas
+    """
+    rng = rng or np.random.default_rng()
+    blok = y.reshape(jumlah_faktor + 2, -1)
+    fa, fb, fab = blok[0], blok[1], blok[2:]
+    n = len(fa)
+
+    s1, st_ = _estimasi_sobol(fa, fb, fab)
+
+    # Resample baris yang sama di A, B, dan AB_i agar estimator tetap berpasangan
+    pilihan = rng.integers(0, n, (jumlah_bootstrap, n))
+    s1_boot, st_boot = _estimasi_sobol(fa[pilihan], fb[pilihan], fab[:, pilihan].transpose(1, 0, 2))
+    s1_bawah, s1_atas = _persentil(s1_boot, tingkat_kepercayaan)
+    st_bawah, st_atas = _persentil(st_boot, tingkat_kepercayaan)
+
+    return pd.DataFrame({
+        'S1': s1, 'S1_bawah': s1_bawah, 'S1_atas': s1_atas,
+        'ST': st_, 'ST_bawah': st_bawah, 'ST_atas': st_atas,
+    })
+
+
+def analisis_sobol(
+    kpi: str = 'rata_waktu_tunggu',
+    faktor: Sequence[Faktor] = FAKTOR_DEFAULT,
+    jumlah_sampel: int = 128,
+    durasi_simulasi: int = 240,
+    replikasi: int = 10,
+    seed: int = 0,
+    jumlah_bootstrap: int = 1000,
+    tingkat_kepercayaan: float = 0.95,
+    eksekutor: Optional[Eksekutor] = None
+) -> HasilSensitivitas:
+    """
+    Indeks Sobol untuk satu KPI.
+
+    Args:
+        kpi: Nama KPI (``hitung_statistik`` atau ``utilisasi_<stasiun>``)
+        faktor: Faktor yang dianalisis
+        jumlah_sampel: Ukuran sampel dasar N (evaluasi = N * (k + 2))
+        durasi_simulasi: Durasi setiap replikasi (menit)
+        replikasi: Replikasi per titik
+        seed: Seed sekuens Sobol dan bootstrap
+        jumlah_bootstrap: Jumlah resample bootstrap
+        tingkat_kepercayaan: Tingkat kepercayaan CI
+        eksekutor: Backend eksekusi (default: ``EksekutorProses``)
+
+    Returns:
+        ``HasilSensitivitas`` dengan indeks per faktor
+    """
+    mulai = time.perf_counter()
+    unit = sampel_saltelli(jumlah_sampel, len(faktor), seed)
+    sampel = evaluasi(unit, faktor, durasi_simulasi, replikasi, eksekutor)
+
+    indeks = indeks_sobol(
+        sampel[kpi].to_numpy(), len(faktor),
+        jumlah_bootstrap, tingkat_kepercayaan, np.random.default_rng(seed)
+    )
+    indeks.insert(0, 'faktor', [f.nama for f in faktor])
+    return HasilSensitivitas(
+        metode='sobol',
+        kpi=kpi,
+        indeks=indeks.sort_values('ST', ascending=False, ignore_index=True),
+        jumlah_evaluasi=len(unit),
+        waktu_komputasi=time.perf_counter() - mulai,
+        sampel=sampel
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line."""
+    parser = argparse.ArgumentParser(description="Analisis sensitivitas global simulasi Drive-Thru.")
+    parser.add_argument('metode', choices=['morris', 'sobol'])
+    parser.add_argument('--kpi', default='rata_waktu_tunggu', help="KPI yang dianalisis")
+    parser.add_argument('--trajektori', type=int, default=20, help="Trajektori Morris")
+    parser.add_argument('--sampel', type=int, default=128, help="Sampel dasar Sobol")
+    parser.add_argument('--durasi', type=int, default=240, help="Durasi simulasi (menit)")
+    parser.add_argument('--replikasi', type=int, default=10, help="Replikasi per titik")
+    parser.add_argument('--seed', type=int, default=0, help="Seed desain sampel")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Jumlah proses worker")
+    args = parser.parse_args(argv)
+
+    with EksekutorProses(args.workers) as eksekutor:
+        if args.metode == 'morris':
+            hasil = analisis_morris(
+                args.kpi, jumlah_trajektori=args.trajektori, durasi_simulasi=args.durasi,
+                replikasi=args.replikasi, seed=args.seed, eksekutor=eksekutor
+            )
+        else:
+            hasil = analisis_sobol(
+                args.kpi, jumlah_sampel=args.sampel, durasi_simulasi=args.durasi,
+                replikasi=args.replikasi, seed=args.seed, eksekutor=eksekutor
+            )
+
+    with pd.option_context('display.float_format', '{:.3f}'.format, 'display.width', 120):
+        print(hasil.indeks.to_string(index=False))
+    print(f"\n{hasil.jumlah_evaluasi} titik dalam {hasil.waktu_komputasi:.1f} detik")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
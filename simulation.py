@@ -10,13 +10,32 @@ Author: Simulation Dashboard
 Version: 1.0.0
 """
 
+import math
 import simpy
-import random
+import threading
+import time
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from operator import attrgetter
+from typing import Callable, Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+from distribusi import Distribusi, Eksponensial, PenyampelBlok, buat_generator
+from profiler import EnvironmentTerprofil, ProfilerSimulasi, fase_opsional
+from jejak_event import (
+    PerekamJejak,
+    STASIUN_SISTEM, STASIUN_PESAN, STASIUN_BAYAR, STASIUN_AMBIL,
+    EVENT_DATANG, EVENT_MASUK_ANTREAN, EVENT_MULAI_LAYANAN,
+    EVENT_SELESAI_LAYANAN, EVENT_KELUAR
+)
+from jejak_kedatangan import JejakKedatangan
+from sketsa_kuantil import BATAS_TUNGGU_SLA, KUANTIL_KPI, SketsaKPI
+
+
+# Versi engine simulasi. Naikkan setiap kali perubahan model membuat hasil
+# untuk seed yang sama berbeda, agar hasil tersimpan lama tidak dipakai ulang.
+VERSI_ENGINE = "1.4.0"
+
 
 @dataclass
 class KonfigurasiSimulasi:
@@ -29,6 +48,290 @@ class KonfigurasiSimulasi:
     waktu_layanan_bayar: float = 1.0  # Rata-rata waktu layanan bayar (menit)
     waktu_layanan_ambil: float = 2.0  # Rata-rata waktu layanan ambil (menit)
     random_seed: Optional[int] = 42   # Seed untuk reproduksibilitas
+    # Distribusi waktu layanan; None = eksponensial dengan rata-rata di atas
+    distribusi_pesan: Optional[Distribusi] = None
+    distribusi_bayar: Optional[Distribusi] = None
+    distribusi_ambil: Optional[Distribusi] = None
+    # Kedatangan (dan durasi layanan) tercatat; None = kedatangan eksponensial
+    # dengan rata-rata laju_kedatangan
+    jejak_kedatangan: Optional[JejakKedatangan] = None
+    
+    def get_distribusi(self) -> Dict[str, Distribusi]:
+        """Distribusi waktu layanan efektif setiap stasiun."""
+        return {
+            'Pesan': self.distribusi_pesan or Eksponensial(self.waktu_layanan_pesan),
+            'Bayar': self.distribusi_bayar or Eksponensial(self.waktu_layanan_bayar),
+            'Ambil': self.distribusi_ambil or Eksponensial(self.waktu_layanan_ambil),
+        }
+
+
+@dataclass
+class ProgresSimulasi:
+    """Laporan progres yang dikirim ke callback setiap langkah simulasi."""
+    fraksi: float          # Bagian durasi simulasi yang sudah dijalankan (0-1)
+    mobil_selesai: int     # Jumlah mobil yang sudah selesai dilayani
+    waktu_berjalan: float  # Waktu wall-clock sejak env.run dimulai (detik)
+
+
+class SimulasiDibatalkan(Exception):
+    """Dilempar ketika token pembatalan di-set di tengah simulasi."""
+
+
+class TokenPembatalan:
+    """
+    Token pembatalan sederhana untuk ``SimulasiDriveThru.jalankan``.
+    
+    Objek lain dengan method ``is_set()`` (``threading.Event`` atau
+    ``multiprocessing.Manager().Event()``) juga dapat dipakai sebagai token.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def batalkan(self):
+        """Meminta simulasi berhenti di langkah berikutnya."""
+        self._event.set()
+    
+    def is_set(self) -> bool:
+        """True jika pembatalan sudah diminta."""
+        return self._event.is_set()
+
+
+class CatatanMobil:
+    """
+    Timestamp mentah satu mobil (menit simulasi).
+    
+    Memakai ``__slots__`` agar setiap mobil hanya satu objek kecil tanpa
+    ``__dict__``; kolom turunan dihitung oleh ``buat_dataframe_log``.
+    """
+    
+    __slots__ = (
+        'id_mobil', 'datang',
+        'mulai_pesan', 'selesai_pesan',
+        'mulai_bayar', 'selesai_bayar',
+        'mulai_ambil', 'selesai',
+    )
+    
+    def __init__(self, id_mobil: int, datang: float):
+        self.id_mobil = id_mobil
+        self.datang = datang
+
+
+def hitung_kolom_waktu(waktu: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Kolom waktu tunggu dan total per mobil dari timestamp mentah.
+    
+    Args:
+        waktu: Array timestamp dengan kunci seperti ``CatatanMobil``
+            (``datang``, ``mulai_pesan``, ..., ``selesai``)
+    
+    Returns:
+        Dictionary kolom log (belum dibulatkan)
+    """
+    tunggu_pesan = waktu['mulai_pesan'] - waktu['datang']
+    tunggu_bayar = waktu['mulai_bayar'] - waktu['selesai_pesan']
+    tunggu_ambil = waktu['mulai_ambil'] - waktu['selesai_bayar']
+    total_tunggu = tunggu_pesan + tunggu_bayar + tunggu_ambil
+    total_sistem = waktu['selesai'] - waktu['datang']
+    return {
+        'Waktu_Tunggu_Pesan': tunggu_pesan,
+        'Waktu_Tunggu_Bayar': tunggu_bayar,
+        'Waktu_Tunggu_Ambil': tunggu_ambil,
+        'Total_Waktu_Tunggu': total_tunggu,
+        'Total_Waktu_Layanan': total_sistem - total_tunggu,
+        'Total_Waktu_Sistem': total_sistem,
+    }
+
+
+def buat_dataframe_log(id_mobil: np.ndarray, waktu: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Membangun DataFrame log pelanggan dari timestamp mentah.
+    
+    Semua kolom turunan dan pembulatan 2 desimal dihitung sekali secara
+    vektor, bukan per mobil di dalam simulasi. Agar hemat memori di
+    ``st.session_state``, ``ID_Mobil`` disimpan sebagai bilangan bulat
+    (diformat ``Mobil_001`` hanya saat ditampilkan, lihat
+    ``format_id_mobil``) dan kolom waktu sebagai float32.
+    
+    Args:
+        id_mobil: Nomor urut kedatangan setiap mobil
+        waktu: Array timestamp (lihat ``hitung_kolom_waktu``)
+    
+    Returns:
+        DataFrame log pelanggan
+    """
+    kolom = hitung_kolom_waktu(waktu)
+    return pd.DataFrame({
+        'ID_Mobil': np.asarray(id_mobil, dtype=np.uint32),
+        'Waktu_Datang': np.round(waktu['datang'], 2).astype(np.float32),
+        'Waktu_Selesai': np.round(waktu['selesai'], 2).astype(np.float32),
+        **{nama: np.round(nilai, 2).astype(np.float32) for nama, nilai in kolom.items()},
+    })
+
+
+def buat_dataframe_antrean(
+    waktu: np.ndarray,
+    antrean_pesan: np.ndarray,
+    antrean_bayar: np.ndarray,
+    antrean_ambil: np.ndarray
+) -> pd.DataFrame:
+    """
+    Membangun DataFrame monitoring antrean dengan dtype integer sekecil mungkin.
+    
+    Args:
+        waktu: Menit pengamatan
+        antrean_pesan: Panjang antrean Pesan per pengamatan
+        antrean_bayar: Panjang antrean Bayar per pengamatan
+        antrean_ambil: Panjang antrean Ambil per pengamatan
+    
+    Returns:
+        DataFrame kolom Waktu, Antrean_Pesan/Bayar/Ambil, Total_Antrean
+    """
+    antrean = {
+        'Antrean_Pesan': np.asarray(antrean_pesan, dtype=np.int64),
+        'Antrean_Bayar': np.asarray(antrean_bayar, dtype=np.int64),
+        'Antrean_Ambil': np.asarray(antrean_ambil, dtype=np.int64),
+    }
+    # Total dihitung sebelum downcast agar tidak overflow
+    antrean['Total_Antrean'] = sum(antrean.values())
+    return pd.DataFrame({
+        'Waktu': np.round(np.asarray(waktu, dtype=float), 2).astype(np.float32),
+        **{nama: pd.to_numeric(nilai, downcast='integer') for nama, nilai in antrean.items()},
+    })
+
+
+def format_id_mobil(id_mobil: pd.Series) -> pd.Series:
+    """
+    Format ID mobil untuk tampilan/unduhan (``7`` -> ``Mobil_007``).
+    
+    ID yang sudah berupa string (hasil tersimpan versi lama) dikembalikan apa adanya.
+    """
+    if not pd.api.types.is_integer_dtype(id_mobil):
+        return id_mobil
+    return 'Mobil_' + id_mobil.astype(str).str.zfill(3)
+
+
+def untuk_tampilan(df_log: pd.DataFrame) -> pd.DataFrame:
+    """Salinan DataFrame log dengan ID mobil terformat (untuk tabel dan CSV)."""
+    df = df_log.copy()
+    if 'ID_Mobil' in df:
+        df['ID_Mobil'] = format_id_mobil(df['ID_Mobil'])
+    return df
+
+
+def ukuran_memori(*daftar_df: pd.DataFrame) -> int:
+    """Total memori (byte) beberapa DataFrame, termasuk isi kolom object."""
+    return int(sum(df.memory_usage(deep=True).sum() for df in daftar_df if df is not None))
+
+
+def _waktu_sibuk_kumulatif(mulai: np.ndarray, selesai: np.ndarray, titik: np.ndarray) -> np.ndarray:
+    """
+    Total panjang interval ``[mulai, selesai)`` sebelum setiap titik waktu.
+    
+    ``sum_i max(0, t - mulai_i) - max(0, t - selesai_i)`` dihitung dengan
+    pengurutan + prefix sum, jadi O((n + m) log n) tanpa loop per mobil.
+    """
+    def _integral(batas: np.ndarray) -> np.ndarray:
+        batas = np.sort(batas)
+        jumlah = np.searchsorted(batas, titik, side='right')
+        prefix = np.concatenate(([0.0], np.cumsum(batas)))
+        return titik * jumlah - prefix[jumlah]
+    return _integral(mulai) - _integral(selesai)
+
+
+def hitung_kpi_window(
+    waktu: Dict[str, np.ndarray],
+    df_antrean: pd.DataFrame,
+    durasi_simulasi: float,
+    kapasitas: Dict[str, int],
+    ukuran_bucket: float
+) -> pd.DataFrame:
+    """
+    KPI per jendela waktu (mis. per 15 menit) dalam satu pass vektor.
+    
+    Waktu tunggu dihitung untuk mobil yang *datang* di jendela itu dan
+    selesai sebelum akhir simulasi (definisi sama dengan ``hitung_statistik``).
+    Utilisasi memakai interval layanan aktual, termasuk mobil yang masih
+    dilayani saat simulasi berakhir.
+    
+    Args:
+        waktu: Timestamp semua mobil yang datang (kunci seperti
+            ``CatatanMobil``); tahap yang belum dicapai berisi NaN
+        df_antrean: DataFrame monitoring antrean (sampel per menit)
+        durasi_simulasi: Durasi simulasi (menit)
+        kapasitas: Jumlah server per stasiun (``'Pesan'``, ``'Bayar'``, ``'Ambil'``)
+        ukuran_bucket: Lebar jendela (menit)
+    
+    Returns:
+        DataFrame satu baris per jendela: Waktu_Mulai, Waktu_Akhir,
+        Jumlah_Datang, Jumlah_Selesai, Rata_Waktu_Tunggu, P90_Waktu_Tunggu,
+        Rata_Antrean_<stasiun>, Utilisasi_<stasiun> (%)
+    """
+    if ukuran_bucket <= 0:
+        raise ValueError("ukuran_bucket harus > 0")
+    
+    jumlah_window = max(math.ceil(durasi_simulasi / ukuran_bucket), 1)
+    tepi = np.minimum(np.arange(jumlah_window + 1) * ukuran_bucket, durasi_simulasi)
+    tepi[-1] = durasi_simulasi
+    panjang = np.diff(tepi)
+    
+    def _window(t: np.ndarray) -> np.ndarray:
+        return np.minimum((t // ukuran_bucket).astype(np.int64), jumlah_window - 1)
+    
+    w_datang = _window(waktu['datang'])
+    with np.errstate(invalid='ignore'):
+        selesai = waktu['selesai'] < durasi_simulasi
+    
+    # Waktu tunggu per jendela kedatangan: rata-rata dan p90 (interpolasi linear)
+    kolom = hitung_kolom_waktu({nama: nilai[selesai] for nama, nilai in waktu.items()})
+    tunggu = np.round(kolom['Total_Waktu_Tunggu'], 2)
+    w_tunggu = w_datang[selesai]
+    jumlah = np.bincount(w_tunggu, minlength=jumlah_window)
+    p90 = np.full(jumlah_window, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rata_tunggu = np.bincount(w_tunggu, weights=tunggu, minlength=jumlah_window) / jumlah
+    if len(tunggu):
+        terurut = tunggu[np.lexsort((tunggu, w_tunggu))]
+        awal = np.concatenate(([0], np.cumsum(jumlah)[:-1]))
+        ada = jumlah > 0
+        posisi = 0.9 * (jumlah[ada] - 1)
+        bawah = np.floor(posisi).astype(np.int64)
+        atas = np.minimum(bawah + 1, jumlah[ada] - 1)
+        nilai_bawah = terurut[awal[ada] + bawah]
+        p90[ada] = nilai_bawah + (posisi - bawah) * (terurut[awal[ada] + atas] - nilai_bawah)
+    
+    # Antrean: rata-rata sampel per menit di setiap jendela
+    w_antrean = _window(df_antrean['Waktu'].to_numpy(dtype=np.float64))
+    jumlah_sampel = np.bincount(w_antrean, minlength=jumlah_window)
+    
+    hasil = {
+        'Waktu_Mulai': tepi[:-1],
+        'Waktu_Akhir': tepi[1:],
+        'Jumlah_Datang': np.bincount(w_datang, minlength=jumlah_window),
+        'Jumlah_Selesai': np.bincount(_window(waktu['selesai'][selesai]), minlength=jumlah_window),
+        'Rata_Waktu_Tunggu': np.round(rata_tunggu, 2),
+        'P90_Waktu_Tunggu': np.round(p90, 2),
+    }
+    for stasiun in ('Pesan', 'Bayar', 'Ambil'):
+        antrean = df_antrean[f'Antrean_{stasiun}'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rata = np.bincount(w_antrean, weights=antrean, minlength=jumlah_window) / jumlah_sampel
+        hasil[f'Rata_Antrean_{stasiun}'] = np.round(rata, 2)
+    
+    for stasiun, (kolom_mulai, kolom_selesai) in (
+        ('Pesan', ('mulai_pesan', 'selesai_pesan')),
+        ('Bayar', ('mulai_bayar', 'selesai_bayar')),
+        ('Ambil', ('mulai_ambil', 'selesai')),
+    ):
+        mulai = waktu[kolom_mulai]
+        dilayani = ~np.isnan(mulai)
+        # Layanan yang belum selesai dihitung sibuk sampai akhir simulasi
+        akhir = np.fmin(waktu[kolom_selesai][dilayani], durasi_simulasi)
+        sibuk = np.diff(_waktu_sibuk_kumulatif(mulai[dilayani], akhir, tepi))
+        util = np.minimum(sibuk / (panjang * kapasitas[stasiun]) * 100, 100)
+        hasil[f'Utilisasi_{stasiun}'] = np.round(util, 2)
+    
+    return pd.DataFrame(hasil)
 
 
 class DriveThru:
@@ -41,15 +344,23 @@ class DriveThru:
         stasiun_bayar: Resource untuk stasiun pembayaran
         stasiun_ambil: Resource untuk stasiun pengambilan
         config: Konfigurasi simulasi
+        antar_kedatangan: Penyampel waktu antar kedatangan
     """
     
-    def __init__(self, env: simpy.Environment, config: KonfigurasiSimulasi):
+    def __init__(
+        self,
+        env: simpy.Environment,
+        config: KonfigurasiSimulasi,
+        generator: Optional[List[np.random.Generator]] = None
+    ):
         """
         Inisialisasi sistem Drive-Thru.
         
         Args:
             env: SimPy Environment
             config: Konfigurasi parameter simulasi
+            generator: Stream acak sesuai ``distribusi.STREAM``
+                (default: diturunkan dari ``config.random_seed``)
         """
         self.env = env
         self.config = config
@@ -58,22 +369,35 @@ class DriveThru:
         self.stasiun_pesan = simpy.Resource(env, capacity=1)
         self.stasiun_bayar = simpy.Resource(env, capacity=config.kapasitas_kasir)
         self.stasiun_ambil = simpy.Resource(env, capacity=config.kapasitas_ambil)
+        
+        # Penyampel per stream: variat diambil per blok dari NumPy
+        if generator is None:
+            generator = buat_generator(config.random_seed)
+        rng_datang, rng_pesan, rng_bayar, rng_ambil = generator
+        distribusi = config.get_distribusi()
+        self.antar_kedatangan = PenyampelBlok(Eksponensial(config.laju_kedatangan), rng_datang)
+        self._sampel_pesan = PenyampelBlok(distribusi['Pesan'], rng_pesan)
+        self._sampel_bayar = PenyampelBlok(distribusi['Bayar'], rng_bayar)
+        self._sampel_ambil = PenyampelBlok(distribusi['Ambil'], rng_ambil)
     
-    def layanan_pesan(self) -> float:
-        """Generator waktu layanan stasiun pesan."""
-        waktu = random.expovariate(1.0 / self.config.waktu_layanan_pesan)
+    def layanan_pesan(self, waktu: Optional[float] = None) -> float:
+        """Generator waktu layanan stasiun pesan (``waktu`` = durasi teramati)."""
+        if waktu is None:
+            waktu = self._sampel_pesan()
         yield self.env.timeout(waktu)
         return waktu
     
-    def layanan_bayar(self) -> float:
-        """Generator waktu layanan stasiun bayar."""
-        waktu = random.expovariate(1.0 / self.config.waktu_layanan_bayar)
+    def layanan_bayar(self, waktu: Optional[float] = None) -> float:
+        """Generator waktu layanan stasiun bayar (``waktu`` = durasi teramati)."""
+        if waktu is None:
+            waktu = self._sampel_bayar()
         yield self.env.timeout(waktu)
         return waktu
     
-    def layanan_ambil(self) -> float:
-        """Generator waktu layanan stasiun ambil."""
-        waktu = random.expovariate(1.0 / self.config.waktu_layanan_ambil)
+    def layanan_ambil(self, waktu: Optional[float] = None) -> float:
+        """Generator waktu layanan stasiun ambil (``waktu`` = durasi teramati)."""
+        if waktu is None:
+            waktu = self._sampel_ambil()
         yield self.env.timeout(waktu)
         return waktu
 
@@ -85,96 +409,150 @@ class SimulasiDriveThru:
     Mengumpulkan data log setiap pelanggan dan monitoring antrean.
     """
     
-    def __init__(self, config: KonfigurasiSimulasi):
+    def __init__(
+        self, 
+        config: KonfigurasiSimulasi,
+        profiler: Optional[ProfilerSimulasi] = None,
+        perekam: Optional[PerekamJejak] = None,
+        sketsa: Optional[SketsaKPI] = None,
+        rekam_semua_mobil: bool = False
+    ):
         """
         Inisialisasi simulasi.
         
         Args:
             config: Konfigurasi parameter simulasi
+            profiler: Profiler opsional untuk mencatat waktu per fase
+            perekam: Perekam jejak event biner opsional
+            sketsa: Sketsa kuantil opsional yang diisi setiap mobil selesai
+                (persentil dapat dibaca selama simulasi berjalan)
+            rekam_semua_mobil: Simpan juga mobil yang belum selesai (untuk
+                ``get_kpi_window``)
         """
         self.config = config
-        self.log_data: List[Dict] = []
-        self.queue_data: List[Dict] = []
+        self.profiler = profiler
+        self.perekam = perekam
+        self.sketsa = sketsa
+        self.rekam_semua_mobil = rekam_semua_mobil
+        self.log_data: List[CatatanMobil] = []
+        self.semua_mobil: List[CatatanMobil] = []
+        self.queue_data: List[Tuple[float, int, int, int]] = []
         self.utilisasi_data: Dict[str, float] = {}
-        
-        # Set random seed jika tersedia
-        if config.random_seed is not None:
-            random.seed(config.random_seed)
-            np.random.seed(config.random_seed)
     
     def _proses_pelanggan(
         self, 
         env: simpy.Environment, 
-        nama_mobil: str, 
-        drivethru: DriveThru
+        drivethru: DriveThru,
+        id_mobil: int,
+        layanan: Tuple[Optional[float], Optional[float], Optional[float]] = (None, None, None)
     ):
         """
         Proses alur pelanggan dari datang hingga selesai.
         
-        Mencatat timestamp untuk setiap tahap layanan.
+        Mencatat timestamp mentah setiap tahap layanan ke ``CatatanMobil``;
+        waktu tunggu, total, dan pembulatan dihitung sekaligus di akhir run.
+        ``layanan`` berisi durasi teramati (Pesan, Bayar, Ambil) dari jejak
+        kedatangan; None berarti disampel dari distribusi stasiun.
         """
-        # 1. Datang ke sistem
-        waktu_datang = env.now
+        layanan_pesan, layanan_bayar, layanan_ambil = layanan
+        catat = self.perekam.catat if self.perekam is not None else None
+        
+        # 1. Datang ke sistem (langsung masuk antrean Pesan)
+        mobil = CatatanMobil(id_mobil, env.now)
+        if self.rekam_semua_mobil:
+            self.semua_mobil.append(mobil)
+        if catat:
+            catat(mobil.datang, id_mobil, STASIUN_SISTEM, EVENT_DATANG)
+            catat(mobil.datang, id_mobil, STASIUN_PESAN, EVENT_MASUK_ANTREAN)
         
         # 2. Proses di Stasiun Pesan
-        waktu_mulai_pesan = env.now
         with drivethru.stasiun_pesan.request() as request:
             yield request
-            waktu_mulai_layanan_pesan = env.now
-            waktu_tunggu_pesan = waktu_mulai_layanan_pesan - waktu_mulai_pesan
-            yield env.process(drivethru.layanan_pesan())
-            waktu_selesai_pesan = env.now
+            mobil.mulai_pesan = env.now
+            if catat:
+                catat(env.now, id_mobil, STASIUN_PESAN, EVENT_MULAI_LAYANAN)
+            yield env.process(drivethru.layanan_pesan(layanan_pesan))
+            mobil.selesai_pesan = env.now
+            if catat:
+                catat(env.now, id_mobil, STASIUN_PESAN, EVENT_SELESAI_LAYANAN)
         
         # 3. Proses di Stasiun Bayar
-        waktu_mulai_bayar = env.now
+        if catat:
+            catat(env.now, id_mobil, STASIUN_BAYAR, EVENT_MASUK_ANTREAN)
         with drivethru.stasiun_bayar.request() as request:
             yield request
-            waktu_mulai_layanan_bayar = env.now
-            waktu_tunggu_bayar = waktu_mulai_layanan_bayar - waktu_mulai_bayar
-            yield env.process(drivethru.layanan_bayar())
-            waktu_selesai_bayar = env.now
+            mobil.mulai_bayar = env.now
+            if catat:
+                catat(env.now, id_mobil, STASIUN_BAYAR, EVENT_MULAI_LAYANAN)
+            yield env.process(drivethru.layanan_bayar(layanan_bayar))
+            mobil.selesai_bayar = env.now
+            if catat:
+                catat(env.now, id_mobil, STASIUN_BAYAR, EVENT_SELESAI_LAYANAN)
         
         # 4. Proses di Stasiun Ambil
-        waktu_mulai_ambil = env.now
+        if catat:
+            catat(env.now, id_mobil, STASIUN_AMBIL, EVENT_MASUK_ANTREAN)
         with drivethru.stasiun_ambil.request() as request:
             yield request
-            waktu_mulai_layanan_ambil = env.now
-            waktu_tunggu_ambil = waktu_mulai_layanan_ambil - waktu_mulai_ambil
-            yield env.process(drivethru.layanan_ambil())
-            waktu_selesai = env.now
-        
-        # 5. Hitung total waktu
-        total_waktu = waktu_selesai - waktu_datang
-        total_tunggu = waktu_tunggu_pesan + waktu_tunggu_bayar + waktu_tunggu_ambil
-        total_layanan = total_waktu - total_tunggu
+            mobil.mulai_ambil = env.now
+            if catat:
+                catat(env.now, id_mobil, STASIUN_AMBIL, EVENT_MULAI_LAYANAN)
+            yield env.process(drivethru.layanan_ambil(layanan_ambil))
+            mobil.selesai = env.now
+            if catat:
+                catat(env.now, id_mobil, STASIUN_AMBIL, EVENT_SELESAI_LAYANAN)
+                catat(env.now, id_mobil, STASIUN_SISTEM, EVENT_KELUAR)
         
-        # 6. Simpan data log
-        self.log_data.append({
-            'ID_Mobil': nama_mobil,
-            'Waktu_Datang': round(waktu_datang, 2),
-            'Waktu_Selesai': round(waktu_selesai, 2),
-            'Waktu_Tunggu_Pesan': round(waktu_tunggu_pesan, 2),
-            'Waktu_Tunggu_Bayar': round(waktu_tunggu_bayar, 2),
-            'Waktu_Tunggu_Ambil': round(waktu_tunggu_ambil, 2),
-            'Total_Waktu_Tunggu': round(total_tunggu, 2),
-            'Total_Waktu_Layanan': round(total_layanan, 2),
-            'Total_Waktu_Sistem': round(total_waktu, 2)
-        })
+        # 5. Simpan catatan (urutan selesai)
+        self.log_data.append(mobil)
+        if self.sketsa is not None:
+            # Urutan operasi dan pembulatan sama dengan hitung_kolom_waktu +
+            # np.round(x, 2), sehingga bucket sketsa sama dengan hitung_statistik
+            tunggu = (
+                (mobil.mulai_pesan - mobil.datang)
+                + (mobil.mulai_bayar - mobil.selesai_pesan)
+                + (mobil.mulai_ambil - mobil.selesai_bayar)
+            )
+            sistem = mobil.selesai - mobil.datang
+            self.sketsa.catat(round(tunggu * 100) / 100, round(sistem * 100) / 100)
     
     def _generator_pelanggan(
         self, 
         env: simpy.Environment, 
         drivethru: DriveThru
     ):
-        """Generator pelanggan berdasarkan distribusi eksponensial."""
+        """Generator pelanggan berdasarkan distribusi eksponensial (atau jejak tercatat)."""
+        if self.config.jejak_kedatangan is not None:
+            yield from self._putar_jejak_kedatangan(env, drivethru)
+            return
         id_mobil = 0
+        antar_kedatangan = drivethru.antar_kedatangan
         while True:
             # Waktu antar kedatangan mengikuti distribusi eksponensial
-            yield env.timeout(random.expovariate(1.0 / self.config.laju_kedatangan))
+            yield env.timeout(antar_kedatangan())
             id_mobil += 1
-            env.process(
-                self._proses_pelanggan(env, f'Mobil_{id_mobil:03d}', drivethru)
-            )
+            env.process(self._proses_pelanggan(env, drivethru, id_mobil))
+    
+    def _putar_jejak_kedatangan(
+        self,
+        env: simpy.Environment,
+        drivethru: DriveThru
+    ):
+        """Generator pelanggan dari kedatangan tercatat (dibaca per blok)."""
+        jejak = self.config.jejak_kedatangan
+        id_mobil = 0
+        for blok in jejak.baca_blok(self.config.durasi_simulasi):
+            # NaN (tidak tercatat) -> None (disampel saat dilayani)
+            kolom = [
+                [None if math.isnan(x) else x for x in blok[stasiun].tolist()]
+                if stasiun in blok else [None] * len(blok['datang'])
+                for stasiun in ('Pesan', 'Bayar', 'Ambil')
+            ]
+            for datang, layanan in zip(blok['datang'].tolist(), zip(*kolom)):
+                # max: kedatangan bersamaan tidak boleh jadi delay negatif karena pembulatan
+                yield env.timeout(max(datang - env.now, 0.0))
+                id_mobil += 1
+                env.process(self._proses_pelanggan(env, drivethru, id_mobil, layanan))
     
     def _monitor_antrean(
         self, 
@@ -183,45 +561,114 @@ class SimulasiDriveThru:
     ):
         """Monitor panjang antrean setiap menit."""
         while True:
-            self.queue_data.append({
-                'Waktu': round(env.now, 2),
-                'Antrean_Pesan': len(drivethru.stasiun_pesan.queue),
-                'Antrean_Bayar': len(drivethru.stasiun_bayar.queue),
-                'Antrean_Ambil': len(drivethru.stasiun_ambil.queue),
-                'Total_Antrean': (
-                    len(drivethru.stasiun_pesan.queue) +
-                    len(drivethru.stasiun_bayar.queue) +
-                    len(drivethru.stasiun_ambil.queue)
-                )
-            })
+            self.queue_data.append((
+                env.now,
+                len(drivethru.stasiun_pesan.queue),
+                len(drivethru.stasiun_bayar.queue),
+                len(drivethru.stasiun_ambil.queue)
+            ))
             yield env.timeout(1)  # Cek setiap 1 menit
     
-    def jalankan(self) -> pd.DataFrame:
+    def jalankan(
+        self,
+        callback_progres: Optional[Callable[[ProgresSimulasi], None]] = None,
+        token_batal=None,
+        langkah_waktu: float = 1.0
+    ) -> pd.DataFrame:
         """
         Menjalankan simulasi dan mengembalikan hasil.
         
-        Returns:
-            DataFrame berisi log setiap pelanggan
-        """
-        # Reset data
-        self.log_data = []
-        self.queue_data = []
+        Jika ``callback_progres`` atau ``token_batal`` diberikan, simulasi
+        dimajukan per ``langkah_waktu`` menit simulasi; setelah setiap langkah
+        callback dipanggil dan token diperiksa. Tanpa keduanya, simulasi
+        dijalankan dengan satu pemanggilan ``env.run``.
         
-        # Setup environment
-        env = simpy.Environment()
-        drivethru = DriveThru(env, self.config)
+        Args:
+            callback_progres: Dipanggil dengan ``ProgresSimulasi`` tiap langkah
+            token_batal: Objek dengan ``is_set()``; jika True simulasi berhenti
+            langkah_waktu: Ukuran langkah dalam menit simulasi
         
-        # Aktifkan proses
-        env.process(self._generator_pelanggan(env, drivethru))
-        env.process(self._monitor_antrean(env, drivethru))
+        Returns:
+            DataFrame berisi log setiap pelanggan
         
-        # Jalankan simulasi
-        env.run(until=self.config.durasi_simulasi)
+        Raises:
+            SimulasiDibatalkan: Jika token pembatalan di-set
+        """
+        if self.profiler is not None:
+            self.profiler.mulai()
+        try:
+            with fase_opsional(self.profiler, 'setup'):
+                # Reset data
+                self.log_data = []
+                self.semua_mobil = []
+                self.queue_data = []
+                
+                # Setup environment
+                if self.profiler is not None:
+                    env = EnvironmentTerprofil()
+                else:
+                    env = simpy.Environment()
+                drivethru = DriveThru(env, self.config)
+                
+                # Aktifkan proses
+                env.process(self._generator_pelanggan(env, drivethru))
+                env.process(self._monitor_antrean(env, drivethru))
+            
+            # Jalankan simulasi
+            with fase_opsional(self.profiler, 'env_run'):
+                self._jalankan_env(env, callback_progres, token_batal, langkah_waktu)
+            if self.profiler is not None:
+                self.profiler.catat_environment(env)
+            
+            # Hitung utilisasi
+            with fase_opsional(self.profiler, 'utilisasi'):
+                self._hitung_utilisasi()
+            
+            with fase_opsional(self.profiler, 'dataframe_log'):
+                return self._buat_dataframe_log()
+        finally:
+            if self.profiler is not None:
+                self.profiler.selesai()
+    
+    def _jalankan_env(
+        self,
+        env: simpy.Environment,
+        callback_progres: Optional[Callable[[ProgresSimulasi], None]],
+        token_batal,
+        langkah_waktu: float
+    ):
+        """Menjalankan environment sekaligus atau per langkah waktu."""
+        durasi = self.config.durasi_simulasi
+        if callback_progres is None and token_batal is None:
+            env.run(until=durasi)
+            return
         
-        # Hitung utilisasi
-        self._hitung_utilisasi()
+        if langkah_waktu <= 0:
+            raise ValueError("langkah_waktu harus > 0")
         
-        return pd.DataFrame(self.log_data)
+        mulai = time.perf_counter()
+        batas = 0.0
+        while batas < durasi:
+            if token_batal is not None and token_batal.is_set():
+                raise SimulasiDibatalkan(f"Simulasi dibatalkan pada menit {env.now:.1f}")
+            
+            batas = min(batas + langkah_waktu, durasi)
+            env.run(until=batas)
+            
+            if callback_progres is not None:
+                callback_progres(ProgresSimulasi(
+                    fraksi=batas / durasi,
+                    mobil_selesai=len(self.log_data),
+                    waktu_berjalan=time.perf_counter() - mulai
+                ))
+    
+    def _buat_dataframe_log(self) -> pd.DataFrame:
+        """Mengubah catatan mentah menjadi DataFrame log (vektor)."""
+        ambil = attrgetter(*CatatanMobil.__slots__)
+        data = np.array([ambil(mobil) for mobil in self.log_data], dtype=float)
+        data = data.reshape(-1, len(CatatanMobil.__slots__))
+        waktu = {nama: data[:, i] for i, nama in enumerate(CatatanMobil.__slots__)}
+        return buat_dataframe_log(waktu.pop('id_mobil').astype(int), waktu)
     
     def _hitung_utilisasi(self):
         """Menghitung persentase utilisasi setiap stasiun."""
@@ -235,11 +682,12 @@ class SimulasiDriveThru:
         
         jumlah_mobil = len(self.log_data)
         waktu_simulasi = self.config.durasi_simulasi
+        distribusi = self.config.get_distribusi()
         
         # Estimasi waktu sibuk berdasarkan rata-rata layanan
-        busy_pesan = jumlah_mobil * self.config.waktu_layanan_pesan
-        busy_bayar = jumlah_mobil * self.config.waktu_layanan_bayar
-        busy_ambil = jumlah_mobil * self.config.waktu_layanan_ambil
+        busy_pesan = jumlah_mobil * distribusi['Pesan'].rata_rata
+        busy_bayar = jumlah_mobil * distribusi['Bayar'].rata_rata
+        busy_ambil = jumlah_mobil * distribusi['Ambil'].rata_rata
         
         # Hitung persentase utilisasi (mempertimbangkan kapasitas)
         util_pesan = min((busy_pesan / (waktu_simulasi * 1)) * 100, 100)
@@ -254,11 +702,47 @@ class SimulasiDriveThru:
     
     def get_dataframe_antrean(self) -> pd.DataFrame:
         """Mendapatkan DataFrame panjang antrean."""
-        return pd.DataFrame(self.queue_data)
+        data = np.array(self.queue_data, dtype=float).reshape(-1, 4)
+        return buat_dataframe_antrean(data[:, 0], data[:, 1], data[:, 2], data[:, 3])
     
     def get_utilisasi(self) -> Dict[str, float]:
         """Mendapatkan data utilisasi setiap stasiun."""
         return self.utilisasi_data
+    
+    def get_kpi_window(
+        self,
+        ukuran_bucket: float,
+        df_antrean: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        KPI per jendela waktu (lihat ``hitung_kpi_window``).
+        
+        Args:
+            ukuran_bucket: Lebar jendela (menit)
+            df_antrean: Hasil ``get_dataframe_antrean`` jika sudah dibuat
+        
+        Raises:
+            RuntimeError: Jika simulasi tidak dibuat dengan ``rekam_semua_mobil=True``
+        """
+        if not self.rekam_semua_mobil:
+            raise RuntimeError("KPI window membutuhkan rekam_semua_mobil=True")
+        # Tahap yang belum dicapai mobil (atribut slot belum di-set) menjadi NaN
+        waktu = {
+            nama: np.array([getattr(mobil, nama, np.nan) for mobil in self.semua_mobil], dtype=float)
+            for nama in CatatanMobil.__slots__[1:]
+        }
+        kapasitas = {
+            'Pesan': 1,
+            'Bayar': self.config.kapasitas_kasir,
+            'Ambil': self.config.kapasitas_ambil,
+        }
+        return hitung_kpi_window(
+            waktu,
+            df_antrean if df_antrean is not None else self.get_dataframe_antrean(),
+            self.config.durasi_simulasi,
+            kapasitas,
+            ukuran_bucket
+        )
 
 
 def jalankan_simulasi(
@@ -266,7 +750,14 @@ def jalankan_simulasi(
     durasi_simulasi: int = 240,
     jumlah_kasir: int = 1,
     jumlah_staff_ambil: int = 1,
-    random_seed: Optional[int] = 42
+    random_seed: Optional[int] = 42,
+    profiler: Optional[ProfilerSimulasi] = None,
+    perekam: Optional[PerekamJejak] = None,
+    callback_progres: Optional[Callable[[ProgresSimulasi], None]] = None,
+    token_batal=None,
+    distribusi_layanan: Optional[Dict[str, Distribusi]] = None,
+    sketsa: Optional[SketsaKPI] = None,
+    jejak_kedatangan: Optional[JejakKedatangan] = None
 ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], Dict[str, float]]:
     """
     Fungsi utama untuk menjalankan simulasi Drive-Thru.
@@ -277,6 +768,15 @@ def jalankan_simulasi(
         jumlah_kasir: Jumlah kasir di stasiun pembayaran
         jumlah_staff_ambil: Jumlah staff di stasiun pengambilan
         random_seed: Seed untuk reproduksibilitas hasil
+        profiler: Profiler opsional; hasilnya tersedia di ``profiler.profil``
+        perekam: Perekam jejak event biner opsional (ditutup oleh pemanggil)
+        callback_progres: Callback progres per langkah simulasi (opsional)
+        token_batal: Token pembatalan dengan method ``is_set()`` (opsional)
+        distribusi_layanan: Distribusi per stasiun (``'Pesan'``, ``'Bayar'``,
+            ``'Ambil'``); stasiun yang tidak disebut memakai eksponensial
+        sketsa: Sketsa kuantil opsional yang diisi setiap mobil selesai
+        jejak_kedatangan: Kedatangan tercatat yang diputar ulang; jika
+            diberikan, ``laju_kedatangan`` diabaikan
     
     Returns:
         Tuple berisi:
@@ -285,39 +785,181 @@ def jalankan_simulasi(
         - Dictionary utilisasi setiap stasiun
         - Dictionary statistik KPI
     """
+    hasil = _jalankan_simulasi(
+        None, laju_kedatangan, durasi_simulasi, jumlah_kasir, jumlah_staff_ambil,
+        random_seed, profiler, perekam, callback_progres, token_batal,
+        distribusi_layanan, sketsa, jejak_kedatangan
+    )
+    return hasil[:4]
+
+
+def jalankan_simulasi_window(
+    ukuran_bucket: float = 15.0,
+    laju_kedatangan: float = 2.0,
+    durasi_simulasi: int = 240,
+    jumlah_kasir: int = 1,
+    jumlah_staff_ambil: int = 1,
+    random_seed: Optional[int] = 42,
+    profiler: Optional[ProfilerSimulasi] = None,
+    perekam: Optional[PerekamJejak] = None,
+    callback_progres: Optional[Callable[[ProgresSimulasi], None]] = None,
+    token_batal=None,
+    distribusi_layanan: Optional[Dict[str, Distribusi]] = None,
+    sketsa: Optional[SketsaKPI] = None,
+    jejak_kedatangan: Optional[JejakKedatangan] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], Dict[str, float], pd.DataFrame]:
+    """
+    Seperti ``jalankan_simulasi``, ditambah tabel KPI per jendela waktu.
+    
+    Mobil yang belum selesai ikut direkam agar jumlah datang dan waktu sibuk
+    per jendela eksak (lihat ``hitung_kpi_window``).
+    
+    Args:
+        ukuran_bucket: Lebar jendela KPI intraday (menit)
+        Argumen lain: lihat ``jalankan_simulasi``
+    
+    Returns:
+        Tuple (df_log, df_antrean, utilisasi, statistik, df_window)
+    """
+    return _jalankan_simulasi(
+        ukuran_bucket, laju_kedatangan, durasi_simulasi, jumlah_kasir, jumlah_staff_ambil,
+        random_seed, profiler, perekam, callback_progres, token_batal,
+        distribusi_layanan, sketsa, jejak_kedatangan
+    )
+
+
+def _jalankan_simulasi(
+    ukuran_bucket: Optional[float],
+    laju_kedatangan: float,
+    durasi_simulasi: int,
+    jumlah_kasir: int,
+    jumlah_staff_ambil: int,
+    random_seed: Optional[int],
+    profiler: Optional[ProfilerSimulasi],
+    perekam: Optional[PerekamJejak],
+    callback_progres: Optional[Callable[[ProgresSimulasi], None]],
+    token_batal,
+    distribusi_layanan: Optional[Dict[str, Distribusi]],
+    sketsa: Optional[SketsaKPI],
+    jejak_kedatangan: Optional[JejakKedatangan]
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], Dict[str, float], Optional[pd.DataFrame]]:
+    """Badan bersama kedua fungsi di atas; ``df_window`` None tanpa ``ukuran_bucket``."""
     # Buat konfigurasi
+    distribusi_layanan = distribusi_layanan or {}
     config = KonfigurasiSimulasi(
         laju_kedatangan=laju_kedatangan,
         durasi_simulasi=durasi_simulasi,
         kapasitas_kasir=jumlah_kasir,
         kapasitas_ambil=jumlah_staff_ambil,
-        random_seed=random_seed
+        random_seed=random_seed,
+        distribusi_pesan=distribusi_layanan.get('Pesan'),
+        distribusi_bayar=distribusi_layanan.get('Bayar'),
+        distribusi_ambil=distribusi_layanan.get('Ambil'),
+        jejak_kedatangan=jejak_kedatangan
     )
     
-    # Jalankan simulasi
-    simulasi = SimulasiDriveThru(config)
-    df_log = simulasi.jalankan()
-    df_antrean = simulasi.get_dataframe_antrean()
-    utilisasi = simulasi.get_utilisasi()
+    df_window = None
+    if profiler is not None:
+        profiler.mulai()
+    try:
+        # Jalankan simulasi
+        simulasi = SimulasiDriveThru(
+            config, profiler=profiler, perekam=perekam, sketsa=sketsa,
+            rekam_semua_mobil=ukuran_bucket is not None
+        )
+        df_log = simulasi.jalankan(callback_progres=callback_progres, token_batal=token_batal)
+        with fase_opsional(profiler, 'dataframe_antrean'):
+            df_antrean = simulasi.get_dataframe_antrean()
+        utilisasi = simulasi.get_utilisasi()
+        
+        # Hitung statistik KPI
+        with fase_opsional(profiler, 'hitung_statistik'):
+            statistik = hitung_statistik(df_log, durasi_simulasi)
+        
+        if ukuran_bucket is not None:
+            with fase_opsional(profiler, 'kpi_window'):
+                df_window = simulasi.get_kpi_window(ukuran_bucket, df_antrean)
+    finally:
+        if profiler is not None:
+            profiler.selesai()
     
-    # Hitung statistik KPI
-    statistik = hitung_statistik(df_log, durasi_simulasi)
+    return df_log, df_antrean, utilisasi, statistik, df_window
+
+
+def hitung_persentil(
+    tunggu: np.ndarray,
+    sistem: np.ndarray,
+    valid: np.ndarray,
+    batas_tunggu: float = BATAS_TUNGGU_SLA
+) -> Dict[str, np.ndarray]:
+    """
+    Persentil eksak dan persen tunggu di atas batas untuk banyak replikasi.
     
-    return df_log, df_antrean, utilisasi, statistik
+    Setiap baris diurutkan sekali; kuantil memakai interpolasi linear
+    seperti ``np.quantile`` (metode default) dengan jumlah mobil per baris,
+    sehingga satu run (``hitung_statistik``) dan R replikasi
+    (``engine_batch``) memakai kode yang sama dan hasilnya identik.
+    
+    Args:
+        tunggu: Array (R, K) waktu tunggu (sudah dibulatkan)
+        sistem: Array (R, K) waktu sistem (sudah dibulatkan)
+        valid: Array bool (R, K) mobil yang dihitung
+        batas_tunggu: Ambang SLA waktu tunggu (menit)
+    
+    Returns:
+        Dictionary ``p50/p90/p95/p99_waktu_tunggu``, ``..._waktu_sistem``,
+        dan ``persen_tunggu_di_atas_batas``, masing-masing array (R,);
+        baris tanpa mobil bernilai 0
+    """
+    n = valid.sum(axis=1)
+    ada = n > 0
+    terakhir = np.maximum(n - 1, 0)
+    hasil = {}
+    for nama, nilai in (('waktu_tunggu', tunggu), ('waktu_sistem', sistem)):
+        urut = np.sort(np.where(valid, nilai, np.inf), axis=1)
+        for q in KUANTIL_KPI:
+            kunci = f'p{round(q * 100)}_{nama}'
+            if urut.shape[1] == 0:
+                hasil[kunci] = np.zeros(len(n))
+                continue
+            posisi = q * terakhir
+            bawah = np.floor(posisi).astype(np.int64)
+            atas = np.minimum(bawah + 1, terakhir)
+            a = np.take_along_axis(urut, bawah[:, None], axis=1)[:, 0]
+            b = np.take_along_axis(urut, atas[:, None], axis=1)[:, 0]
+            with np.errstate(invalid='ignore'):
+                kuantil = a + (b - a) * (posisi - bawah)
+            hasil[kunci] = np.where(ada, np.round(kuantil, 2), 0.0)
+    di_atas = (valid & (tunggu > batas_tunggu)).sum(axis=1)
+    hasil['persen_tunggu_di_atas_batas'] = np.where(
+        ada, np.round(di_atas / np.maximum(n, 1) * 100, 2), 0.0
+    )
+    return hasil
 
 
-def hitung_statistik(df: pd.DataFrame, durasi_simulasi: int) -> Dict[str, float]:
+def hitung_statistik(
+    df: pd.DataFrame,
+    durasi_simulasi: int,
+    batas_tunggu: float = BATAS_TUNGGU_SLA
+) -> Dict[str, float]:
     """
     Menghitung statistik KPI dari hasil simulasi.
     
+    Persentil (p50/p90/p95/p99) dan persen mobil menunggu lebih dari
+    ``batas_tunggu`` dihitung eksak dengan ``hitung_persentil``. ``SketsaKPI``
+    hanya dipakai untuk pengisian streaming dan penggabungan antar replikasi.
+    
     Args:
         df: DataFrame hasil simulasi
         durasi_simulasi: Durasi simulasi dalam menit
+        batas_tunggu: Ambang SLA waktu tunggu (menit)
     
     Returns:
         Dictionary berisi statistik KPI
     """
     if df.empty:
+        kosong = np.empty((1, 0))
+        persentil = hitung_persentil(kosong, kosong, kosong.astype(bool), batas_tunggu)
         return {
             'total_mobil': 0,
             'rata_waktu_tunggu': 0.0,
@@ -325,17 +967,28 @@ def hitung_statistik(df: pd.DataFrame, durasi_simulasi: int) -> Dict[str, float]
             'min_waktu_tunggu': 0.0,
             'rata_waktu_sistem': 0.0,
             'throughput': 0.0,
-            'std_waktu_tunggu': 0.0
+            'std_waktu_tunggu': 0.0,
+            **{kunci: float(nilai[0]) for kunci, nilai in persentil.items()}
         }
     
+    # Kolom float32 dibulatkan ulang di float64: nilai 2 desimal asli pulih
+    # persis, sehingga KPI sama dengan perhitungan dari float64
+    tunggu = df['Total_Waktu_Tunggu'].astype(np.float64).round(2)
+    sistem = df['Total_Waktu_Sistem'].astype(np.float64).round(2)
+    persentil = hitung_persentil(
+        tunggu.to_numpy()[None, :], sistem.to_numpy()[None, :],
+        np.ones((1, len(df)), dtype=bool), batas_tunggu
+    )
+    
     return {
         'total_mobil': len(df),
-        'rata_waktu_tunggu': round(df['Total_Waktu_Tunggu'].mean(), 2),
-        'max_waktu_tunggu': round(df['Total_Waktu_Tunggu'].max(), 2),
-        'min_waktu_tunggu': round(df['Total_Waktu_Tunggu'].min(), 2),
-        'rata_waktu_sistem': round(df['Total_Waktu_Sistem'].mean(), 2),
+        'rata_waktu_tunggu': round(tunggu.mean(), 2),
+        'max_waktu_tunggu': round(tunggu.max(), 2),
+        'min_waktu_tunggu': round(tunggu.min(), 2),
+        'rata_waktu_sistem': round(sistem.mean(), 2),
         'throughput': round(len(df) / (durasi_simulasi / 60), 2),  # Mobil per jam
-        'std_waktu_tunggu': round(df['Total_Waktu_Tunggu'].std(), 2)
+        'std_waktu_tunggu': round(tunggu.std(), 2),
+        **{kunci: float(nilai[0]) for kunci, nilai in persentil.items()}
     }
 
 
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Sketsa Kuantil Streaming
+========================
+
+Sketsa kuantil bergaya DDSketch untuk KPI ekor (p50/p90/p95/p99) waktu
+tunggu dan waktu sistem tanpa menyimpan log per mobil.
+
+- Nilai x > 0 masuk bucket ``i = ceil(log_gamma(x))`` dengan
+  ``gamma = (1 + a) / (1 - a)``; kuantil yang dilaporkan berselisih relatif
+  paling banyak ``a`` dari kuantil sebenarnya (default 1%).
+- Nilai di bawah ``nilai_minimum`` (waktu tunggu 0) dihitung di bucket nol.
+- Sketsa hanya berisi jumlah per bucket (plus min/max/jumlah), sehingga
+  penggabungan sketsa dari replikasi paralel *eksak*: bucket dan kuantil
+  hasil ``gabung`` identik dengan satu sketsa yang diisi semua nilai,
+  berapa pun urutan dan pembagiannya.
+- Memori tetap kecil berapa pun jumlah mobil (rentang 0,01 menit sampai
+  beberapa jam hanya butuh ratusan bucket).
+
+Semua nilai dipetakan ke bucket lewat satu jalur vektor (``_indeks``);
+``tambah`` per mobil hanya menampung nilai di buffer kecil, sehingga
+pengisian streaming dan pengisian dari array memberi bucket yang sama.
+
+Contoh:
+    sketsa = SketsaKPI()
+    sketsa.catat(tunggu, sistem)         # setiap mobil selesai
+    sketsa.ringkasan()['p90_waktu_tunggu']
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+AKURASI_DEFAULT = 0.01
+# Waktu dibulatkan 2 desimal: di bawah 0,005 menit berarti 0
+NILAI_MINIMUM = 0.005
+KUANTIL_KPI = (0.50, 0.90, 0.95, 0.99)
+# Ambang SLA default untuk "persen mobil menunggu lebih dari X menit"
+BATAS_TUNGGU_SLA = 5.0
+UKURAN_BUFFER = 1024
+
+
+class SketsaKuantil:
+    """
+    Sketsa kuantil mergeable dengan akurasi relatif tetap.
+
+    Contoh:
+        a, b = SketsaKuantil(), SketsaKuantil()
+        a.tambah_array(nilai_replikasi_1)
+        b.tambah_array(nilai_replikasi_2)
+        a.gabung(b).kuantil(0.95)
+    """
+
+    def __init__(self, akurasi_relatif: float = AKURASI_DEFAULT, nilai_minimum: float = NILAI_MINIMUM):
+        """
+        Args:
+            akurasi_relatif: Galat relatif maksimum kuantil (0 < a < 1)
+            nilai_minimum: Nilai di bawah ini dihitung sebagai 0
+        """
+        if not 0 < akurasi_relatif < 1:
+            raise ValueError("akurasi_relatif harus di antara 0 dan 1")
+        self.akurasi_relatif = akurasi_relatif
+        self.nilai_minimum = nilai_minimum
+        self.gamma = (1 + akurasi_relatif) / (1 - akurasi_relatif)
+        self._log_gamma = math.log(self.gamma)
+
+        self.bucket: Dict[int, int] = {}
+        self.jumlah_nol = 0
+        self._jumlah = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maksimum = -math.inf
+        self._buffer: List[float] = []
+
+    def _indeks(self, nilai: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(nilai) / self._log_gamma).astype(np.int64)
+
+    def tambah(self, nilai: float):
+        """Menambahkan satu nilai (mis. saat satu mobil selesai)."""
+        self._buffer.append(nilai)
+        if len(self._buffer) >= UKURAN_BUFFER:
+            self._kosongkan_buffer()
+
+    def tambah_array(self, nilai: Iterable[float]):
+        """Menambahkan banyak nilai sekaligus (vektor)."""
+        nilai = np.asarray(nilai, dtype=np.float64).ravel()
+        if len(nilai) == 0:
+            return
+        if np.any(nilai < 0) or np.any(np.isnan(nilai)):
+            raise ValueError("Nilai sketsa harus >= 0")
+        self._jumlah += len(nilai)
+        self.total += float(nilai.sum())
+        self.minimum = min(self.minimum, float(nilai.min()))
+        self.maksimum = max(self.maksimum, float(nilai.max()))
+
+        positif = nilai[nilai >= self.nilai_minimum]
+        self.jumlah_nol += len(nilai) - len(positif)
+        indeks, banyak = np.unique(self._indeks(positif), return_counts=True)
+        for i, k in zip(indeks.tolist(), banyak.tolist()):
+            self.bucket[i] = self.bucket.get(i, 0) + k
+
+    def _kosongkan_buffer(self):
+        if self._buffer:
+            buffer, self._buffer = self._buffer, []
+            self.tambah_array(buffer)
+
+    def gabung(self, lain: 'SketsaKuantil') -> 'SketsaKuantil':
+        """
+        Menggabungkan sketsa lain ke sketsa ini (eksak).
+
+        Raises:
+            ValueError: Jika parameter kedua sketsa berbeda
+        """
+        if (lain.akurasi_relatif, lain.nilai_minimum) != (self.akurasi_relatif, self.nilai_minimum):
+            raise ValueError("Sketsa dengan akurasi/nilai minimum berbeda tidak dapat digabung")
+        self._kosongkan_buffer()
+        lain._kosongkan_buffer()
+        for i, k in lain.bucket.items():
+            self.bucket[i] = self.bucket.get(i, 0) + k
+        self.jumlah_nol += lain.jumlah_nol
+        self._jumlah += lain._jumlah
+        self.total += lain.total
+        self.minimum = min(self.minimum, lain.minimum)
+        self.maksimum = max(self.maksimum, lain.maksimum)
+        return self
+
+    @property
+    def jumlah(self) -> int:
+        """Jumlah nilai, termasuk yang masih di buffer."""
+        self._kosongkan_buffer()
+        return self._jumlah
+
+    def kuantil(self, q: float) -> float:
+        """Kuantil ke-q (0-1); NaN jika sketsa kosong."""
+        return self.kuantil_banyak([q])[0]
+
+    def kuantil_banyak(self, daftar_q: Iterable[float]) -> List[float]:
+        """Beberapa kuantil sekaligus (satu kali pengurutan bucket)."""
+        self._kosongkan_buffer()
+        daftar_q = list(daftar_q)
+        if self.jumlah == 0:
+            return [math.nan] * len(daftar_q)
+
+        indeks = np.array(sorted(self.bucket), dtype=np.int64)
+        kumulatif = self.jumlah_nol + np.cumsum([self.bucket[i] for i in indeks.tolist()])
+        # Titik tengah (relatif) bucket: galat relatif <= akurasi
+        wakil = 2 * self.gamma ** indeks.astype(np.float64) / (self.gamma + 1)
+
+        hasil = []
+        for q in daftar_q:
+            if not 0 <= q <= 1:
+                raise ValueError("Kuantil harus di antara 0 dan 1")
+            peringkat = q * (self.jumlah - 1)
+            if peringkat < self.jumlah_nol:
+                nilai = 0.0
+            else:
+                nilai = float(wakil[np.searchsorted(kumulatif, peringkat, side='right')])
+            # Nilai ekstrem diketahui eksak
+            hasil.append(min(max(nilai, self.minimum), self.maksimum))
+        return hasil
+
+    def fraksi_di_atas(self, batas: float) -> float:
+        """
+        Fraksi nilai yang lebih besar dari ``batas`` (0-1).
+
+        Nilai di bucket yang memuat ``batas`` dianggap tidak melebihinya,
+        jadi galatnya terbatas pada nilai dalam rentang relatif ``akurasi``
+        di bawah ``batas``.
+        """
+        self._kosongkan_buffer()
+        if self.jumlah == 0:
+            return 0.0
+        if batas < self.nilai_minimum:
+            return (self.jumlah - self.jumlah_nol) / self.jumlah
+        batas_indeks = int(self._indeks(np.array([batas]))[0])
+        di_atas = sum(k for i, k in self.bucket.items() if i > batas_indeks)
+        return di_atas / self.jumlah
+
+    @property
+    def rata_rata(self) -> float:
+        """Rata-rata eksak semua nilai."""
+        self._kosongkan_buffer()
+        return self.total / self.jumlah if self.jumlah else math.nan
+
+    def __getstate__(self):
+        self._kosongkan_buffer()
+        return self.__dict__.copy()
+
+
+class SketsaKPI:
+    """Pasangan sketsa waktu tunggu dan waktu sistem per mobil."""
+
+    def __init__(self, akurasi_relatif: float = AKURASI_DEFAULT):
+        self.tunggu = SketsaKuantil(akurasi_relatif)
+        self.sistem = SketsaKuantil(akurasi_relatif)
+
+    @classmethod
+    def dari_array(
+        cls,
+        tunggu: np.ndarray,
+        sistem: np.ndarray,
+        akurasi_relatif: float = AKURASI_DEFAULT
+    ) -> 'SketsaKPI':
+        """Sketsa dari array waktu tunggu dan waktu sistem (sudah dibulatkan)."""
+        sketsa = cls(akurasi_relatif)
+        sketsa.tunggu.tambah_array(tunggu)
+        sketsa.sistem.tambah_array(sistem)
+        return sketsa
+
+    @classmethod
+    def gabung_semua(cls, daftar_sketsa: Iterable['SketsaKPI']) -> 'SketsaKPI':
+        """Menggabungkan sketsa banyak replikasi menjadi satu sketsa baru."""
+        hasil: Optional[SketsaKPI] = None
+        for sketsa in daftar_sketsa:
+            if hasil is None:
+                hasil = cls(sketsa.tunggu.akurasi_relatif)
+            hasil.gabung(sketsa)
+        return hasil if hasil is not None else cls()
+
+    def catat(self, tunggu: float, sistem: float):
+        """Mencatat satu mobil yang selesai."""
+        self.tunggu.tambah(tunggu)
+        self.sistem.tambah(sistem)
+
+    def gabung(self, lain: 'SketsaKPI') -> 'SketsaKPI':
+        """Menggabungkan sketsa lain ke sketsa ini (eksak)."""
+        self.tunggu.gabung(lain.tunggu)
+        self.sistem.gabung(lain.sistem)
+        return self
+
+    def ringkasan(self, batas_tunggu: float = BATAS_TUNGGU_SLA) -> Dict[str, float]:
+        """
+        KPI ekor dengan nama kunci seperti ``hitung_statistik``.
+
+        Args:
+            batas_tunggu: Ambang "persen mobil menunggu lebih dari X menit"
+
+        Returns:
+            ``p50/p90/p95/p99_waktu_tunggu``, ``p50/.../p99_waktu_sistem``,
+            dan ``persen_tunggu_di_atas_batas`` (0 semua jika kosong)
+        """
+        hasil = {}
+        for nama, sketsa in (('waktu_tunggu', self.tunggu), ('waktu_sistem', self.sistem)):
+            nilai = sketsa.kuantil_banyak(KUANTIL_KPI) if sketsa.jumlah else [0.0] * len(KUANTIL_KPI)
+            for q, v in zip(KUANTIL_KPI, nilai):
+                hasil[f'p{round(q * 100)}_{nama}'] = round(v, 2)
+        hasil['persen_tunggu_di_atas_batas'] = round(self.tunggu.fraksi_di_atas(batas_tunggu) * 100, 2)
+        return hasil
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Sumber Daya Bersama Dashboard
+=============================
+
+Objek berumur panjang (penyimpanan hasil, worker pool, mesin replay, hasil
+per sesi) yang dibuat sekali per proses server Streamlit dan dipakai bersama
+oleh semua halaman dan sesi. Didefinisikan di satu modul agar ``st.cache_resource``
+mengembalikan instance yang sama dari halaman mana pun.
+"""
+
+import uuid
+from typing import Any, Callable, Iterable, Optional
+
+import pandas as pd
+import streamlit as st
+
+from penyimpanan_hasil import PenyimpananHasil
+from manajer_job import ManajerJob
+from jejak_event import BacaJejak, hapus_jejak
+from replay import MesinReplay
+from eksekutor import EksekutorProses
+from surrogat import ModelSurrogat
+from tabel_skenario import TabelSkenario
+from simulation import VERSI_ENGINE
+from manajer_sesi import ManajerSesi
+
+
+@st.cache_resource
+def get_penyimpanan() -> PenyimpananHasil:
+    """Penyimpanan hasil bersama untuk semua sesi."""
+    return PenyimpananHasil()
+
+
+@st.cache_resource
+def get_manajer_job() -> ManajerJob:
+    """Worker pool persisten bersama untuk semua sesi."""
+    return ManajerJob(direktori_db=str(get_penyimpanan().direktori))
+
+
+@st.cache_resource
+def get_eksekutor() -> EksekutorProses:
+    """Process pool bersama untuk analisis banyak titik (sensitivitas)."""
+    return EksekutorProses()
+
+
+@st.cache_resource
+def get_surrogat() -> Optional[ModelSurrogat]:
+    """
+    Model surrogat (``python surrogat.py latih -o hasil_simulasi/surrogat.npz``).
+
+    None jika file belum dibangun atau dilatih dengan versi engine lain;
+    pelatihan tidak pernah dijalankan di dalam render dashboard.
+    """
+    path = get_penyimpanan().direktori / 'surrogat.npz'
+    if not path.exists():
+        return None
+    try:
+        model = ModelSurrogat.muat(str(path))
+    except (ValueError, KeyError, OSError):
+        return None
+    return model if model.versi_engine == VERSI_ENGINE else None
+
+
+@st.cache_resource
+def get_tabel_skenario() -> Optional[TabelSkenario]:
+    """
+    Tabel skenario prakomputasi (``python tabel_skenario.py bangun``).
+
+    None jika file belum dibangun atau dibangun dengan versi engine lain.
+    """
+    path = get_penyimpanan().direktori / 'tabel_skenario.bin'
+    if not path.exists():
+        return None
+    try:
+        tabel = TabelSkenario(str(path))
+    except (ValueError, OSError):
+        return None
+    return tabel if tabel.versi_engine == VERSI_ENGINE else None
+
+
+@st.cache_resource(max_entries=4)
+def get_mesin_replay(path_jejak: str) -> MesinReplay:
+    """Mesin replay untuk satu file jejak (snapshot dibangun sekali)."""
+    return MesinReplay(BacaJejak(path_jejak))
+
+
+@st.cache_resource
+def get_manajer_sesi() -> ManajerSesi:
+    """Hasil per sesi dengan anggaran memori bersama."""
+    return ManajerSesi(direktori=str(get_penyimpanan().direktori / 'sesi'))
+
+
+def get_id_sesi() -> str:
+    """ID sesi browser saat ini (dibuat saat pertama kali dipanggil)."""
+    if 'id_sesi' not in st.session_state:
+        st.session_state.id_sesi = uuid.uuid4().hex
+    return st.session_state.id_sesi
+
+
+def simpan_hasil_sesi(nama: str, df: pd.DataFrame):
+    """Menyimpan DataFrame hasil milik sesi ini lewat ``ManajerSesi``."""
+    get_manajer_sesi().simpan(get_id_sesi(), nama, df)
+
+
+def ambil_hasil_sesi(nama: str) -> Optional[pd.DataFrame]:
+    """DataFrame hasil milik sesi ini, atau None jika tidak ada/kedaluwarsa."""
+    return get_manajer_sesi().ambil(get_id_sesi(), nama)
+
+
+def turunan_hasil_sesi(nama: str, kunci: str, fungsi: Callable[[pd.DataFrame], Any]) -> Optional[Any]:
+    """Ringkasan turunan hasil sesi ini (dihitung sekali per isi hasil)."""
+    return get_manajer_sesi().turunan(get_id_sesi(), nama, kunci, fungsi)
+
+
+def path_berkas_sesi(akhiran: str) -> str:
+    """Path baru di folder sesi ini untuk berkas run (jejak event, dump cProfile)."""
+    return str(get_manajer_sesi().path_berkas(get_id_sesi(), akhiran))
+
+
+def hapus_berkas_run(daftar_path: Iterable[Optional[str]]):
+    """Menghapus berkas run yang tidak lagi dipakai (jejak beserta file sampingnya)."""
+    for path in daftar_path:
+        if path:
+            hapus_jejak(path)
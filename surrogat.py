@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+Model Surrogat Simulasi Drive-Thru
+==================================
+
+Metamodel Gaussian process untuk menjawab "what-if" dari sidebar tanpa
+menjalankan simulasi: rata-rata waktu tunggu, throughput, dan utilisasi
+setiap stasiun sebagai fungsi parameter ``jalankan_simulasi``.
+
+- Dilatih dari hasil sweep (``jalankan_batch.jalankan_sweep`` atau
+  ``buat_data_latih``); replikasi per konfigurasi dirata-ratakan dan
+  variansnya dipakai sebagai noise per titik.
+- Kernel RBF dengan panjang skala per input (ARD); hyperparameter dipilih
+  dengan memaksimalkan log marginal likelihood.
+- Prediksi satu titik hanya beberapa perkalian matriks kecil (orde
+  mikrodetik) dan disertai simpangan baku prediksi.
+- ``estimasi`` kembali ke simulasi nyata (``engine_batch``) bila
+  ketidakpastian terlalu besar, mis. di luar daerah data latih.
+- File model mencatat ``VERSI_ENGINE``; dashboard mengabaikan model dari
+  versi engine lain dan memakai simulasi cepat sampai model dilatih ulang.
+
+Contoh:
+    python surrogat.py latih -o hasil_simulasi/surrogat.npz --titik 128
+    python surrogat.py prediksi surrogat.npz --laju 1.5 --kasir 2
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize
+from scipy.stats import qmc
+
+from eksekutor import Eksekutor, EksekutorProses
+from engine_batch import simulasi_batch
+from simulation import VERSI_ENGINE
+
+
+# Parameter jalankan_simulasi -> (batas bawah, batas atas) daerah data latih
+INPUT_SURROGAT = {
+    'laju_kedatangan': (0.5, 5.0),
+    'durasi_simulasi': (60, 480),
+    'jumlah_kasir': (1, 5),
+    'jumlah_staff_ambil': (1, 5),
+}
+
+OUTPUT_SURROGAT = (
+    'rata_waktu_tunggu',
+    'throughput',
+    'utilisasi_pesan',
+    'utilisasi_bayar',
+    'utilisasi_ambil',
+)
+
+# Output yang dimodelkan dalam skala log1p (melonjak saat sistem jenuh)
+_OUTPUT_LOG = {'rata_waktu_tunggu'}
+
+
+@dataclass
+class Estimasi:
+    """Jawaban surrogat (atau simulasi cadangan) untuk satu konfigurasi."""
+    nilai: Dict[str, float]
+    std: Dict[str, float]
+    sumber: str          # 'surrogat' atau 'simulasi'
+    ketidakpastian: float  # Std prediksi relatif terhadap sebaran data latih (maks antar output)
+    waktu_detik: float
+
+
+# Batas fitur; interval kedatangan dimodelkan dalam skala log
+_BAWAH = np.array([b for b, _ in INPUT_SURROGAT.values()], dtype=float)
+_ATAS = np.array([a for _, a in INPUT_SURROGAT.values()], dtype=float)
+_BAWAH[0], _ATAS[0] = np.log(_BAWAH[0]), np.log(_ATAS[0])
+
+
+def _fitur(nilai: np.ndarray) -> np.ndarray:
+    """Parameter (n, d) urut ``INPUT_SURROGAT`` -> fitur [0, 1]."""
+    nilai = np.array(nilai, dtype=float, ndmin=2)
+    nilai[:, 0] = np.log(nilai[:, 0])
+    return (nilai - _BAWAH) / (_ATAS - _BAWAH)
+
+
+def _jarak_kuadrat(xa: np.ndarray, xb: np.ndarray, panjang: np.ndarray) -> np.ndarray:
+    """Jarak kuadrat berskala antara setiap baris ``xa`` dan ``xb``."""
+    a, b = xa / panjang, xb / panjang
+    return np.maximum(
+        (a ** 2).sum(axis=1)[:, None] + (b ** 2).sum(axis=1)[None, :] - 2 * a @ b.T, 0.0
+    )
+
+
+def _neg_log_likelihood(log_param: np.ndarray, x: np.ndarray, y: np.ndarray, noise: np.ndarray) -> float:
+    """Negatif log marginal likelihood GP (y sudah distandarkan)."""
+    panjang = np.exp(log_param[:-2])
+    sinyal, nugget = np.exp(log_param[-2]), np.exp(log_param[-1])
+    k = sinyal * np.exp(-0.5 * _jarak_kuadrat(x, x, panjang))
+    k[np.diag_indices_from(k)] += noise + nugget + 1e-8
+    try:
+        faktor = cho_factor(k, lower=True)
+    except np.linalg.LinAlgError:
+        return 1e10
+    alpha = cho_solve(faktor, y)
+    return 0.5 * y @ alpha + np.log(np.diag(faktor[0])).sum()
+
+
+class ModelSurrogat:
+    """
+    Gaussian process independen untuk setiap KPI di ``OUTPUT_SURROGAT``.
+
+    Semua output berbagi titik latih; panjang skala, amplitudo, dan nugget
+    dipilih per output.
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        panjang: np.ndarray,
+        sinyal: np.ndarray,
+        alpha: np.ndarray,
+        k_inv: np.ndarray,
+        rata_y: np.ndarray,
+        skala_y: np.ndarray,
+        info: Optional[Dict] = None,
+        versi_engine: Optional[str] = None
+    ):
+        """
+        Args:
+            x: Fitur titik latih (n, d)
+            panjang: Panjang skala per output dan input (m, d)
+            sinyal: Varians sinyal per output (m,)
+            alpha: ``K^-1 y`` per output (m, n)
+            k_inv: ``K^-1`` per output (m, n, n)
+            rata_y, skala_y: Standarisasi output (m,)
+            info: Metadata (jumlah titik, replikasi, waktu latih)
+            versi_engine: ``VERSI_ENGINE`` saat model dilatih (None = tidak diketahui)
+        """
+        self.x = x
+        self.panjang = panjang
+        self.sinyal = sinyal
+        self.alpha = alpha
+        self.k_inv = k_inv
+        self.rata_y = rata_y
+        self.skala_y = skala_y
+        self.info = info or {}
+        self.versi_engine = versi_engine
+        # Untuk jarak kuadrat satu titik: ||(x - X) / l||^2 = (x - X)^2 @ (1 / l^2)
+        self._inv_panjang2 = (1.0 / panjang ** 2).T
+
+    @classmethod
+    def latih(cls, df: pd.DataFrame) -> 'ModelSurrogat':
+        """
+        Melatih model dari hasil sweep.
+
+        Args:
+            df: Satu baris per run dengan kolom ``INPUT_SURROGAT`` dan
+                ``OUTPUT_SURROGAT`` (mis. keluaran ``jalankan_sweep``)
+
+        Returns:
+            Model terlatih
+        """
+        mulai = time.perf_counter()
+        kolom_hilang = (set(INPUT_SURROGAT) | set(OUTPUT_SURROGAT)) - set(df.columns)
+        if kolom_hilang:
+            raise ValueError(f"Kolom data latih tidak ada: {sorted(kolom_hilang)}")
+
+        data = df[list(INPUT_SURROGAT) + list(OUTPUT_SURROGAT)].copy()
+        for nama in _OUTPUT_LOG:
+            data[nama] = np.log1p(data[nama])
+        grup = data.groupby(list(INPUT_SURROGAT), sort=True)
+        rata = grup.mean().reset_index()
+        # Varians rata-rata replikasi sebagai noise per titik (0 jika satu replikasi)
+        noise = (grup.var(ddof=1) / grup.size().to_numpy()[:, None]).fillna(0.0).to_numpy()
+
+        x = _fitur(rata[list(INPUT_SURROGAT)].to_numpy())
+        n, d = x.shape
+        hasil = {k: [] for k in ('panjang', 'sinyal', 'alpha', 'k_inv', 'rata_y', 'skala_y')}
+        for j, nama in enumerate(OUTPUT_SURROGAT):
+            y_mentah = rata[nama].to_numpy()
+            rata_y, skala_y = y_mentah.mean(), y_mentah.std() or 1.0
+            y = (y_mentah - rata_y) / skala_y
+            noise_j = noise[:, j] / skala_y ** 2
+
+            awal = np.concatenate([np.full(d, np.log(0.3)), [0.0, np.log(1e-3)]])
+            batas = [(np.log(0.02), np.log(10.0))] * d + [(np.log(1e-2), np.log(1e2)), (np.log(1e-8), np.log(1.0))]
+            optimal = minimize(
+                _neg_log_likelihood, awal, args=(x, y, noise_j), method='L-BFGS-B', bounds=batas
+            ).x
+
+            panjang = np.exp(optimal[:-2])
+            sinyal = np.exp(optimal[-2])
+            k = sinyal * np.exp(-0.5 * _jarak_kuadrat(x, x, panjang))
+            k[np.diag_indices_from(k)] += noise_j + np.exp(optimal[-1]) + 1e-8
+            faktor = cho_factor(k, lower=True)
+
+            hasil['panjang'].append(panjang)
+            hasil['sinyal'].append(sinyal)
+            hasil['alpha'].append(cho_solve(faktor, y))
+            hasil['k_inv'].append(cho_solve(faktor, np.eye(n)))
+            hasil['rata_y'].append(rata_y)
+            hasil['skala_y'].append(skala_y)
+
+        info = {
+            'jumlah_titik': n,
+            'jumlah_run': len(df),
+            'waktu_latih': round(time.perf_counter() - mulai, 3),
+        }
+        return cls(
+            x, **{k: np.array(v) for k, v in hasil.items()}, info=info, versi_engine=VERSI_ENGINE
+        )
+
+    def prediksi(self, parameter: Dict) -> Tuple[Dict[str, float], Dict[str, float], float]:
+        """
+        Prediksi KPI satu konfigurasi.
+
+        Args:
+            parameter: Nilai ``INPUT_SURROGAT`` (kunci lain diabaikan)
+
+        Returns:
+            Tuple (nilai, std, ketidakpastian). ``ketidakpastian`` adalah std
+            prediksi terbesar relatif terhadap sebaran output di data latih
+        """
+        fitur = _fitur([parameter[k] for k in INPUT_SURROGAT])[0]
+        jarak = ((fitur - self.x) ** 2) @ self._inv_panjang2           # (n, m)
+        k = (self.sinyal * np.exp(-0.5 * jarak)).T                       # (m, n)
+        rata = (k * self.alpha).sum(axis=1)
+        varians = self.sinyal - np.einsum('mi,mij,mj->m', k, self.k_inv, k)
+        std = np.sqrt(np.maximum(varians, 0.0))
+
+        nilai, simpangan = {}, {}
+        for j, nama in enumerate(OUTPUT_SURROGAT):
+            m = rata[j] * self.skala_y[j] + self.rata_y[j]
+            s = std[j] * self.skala_y[j]
+            if nama in _OUTPUT_LOG:
+                # Delta method: d(expm1(m)) / dm = exp(m)
+                m, s = np.expm1(m), np.exp(m) * s
+            nilai[nama] = max(float(m), 0.0)
+            simpangan[nama] = float(s)
+        return nilai, simpangan, float(std.max())
+
+    def estimasi(
+        self,
+        parameter: Dict,
+        batas_ketidakpastian: float = 0.1,
+        replikasi_cadangan: int = 20
+    ) -> Estimasi:
+        """
+        Prediksi surrogat, atau simulasi nyata jika ketidakpastian terlalu besar.
+
+        Args:
+            parameter: Nilai ``INPUT_SURROGAT``
+            batas_ketidakpastian: Batas ``ketidakpastian`` (relatif terhadap
+                sebaran data latih) sebelum kembali ke simulasi
+            replikasi_cadangan: Replikasi ``engine_batch`` untuk simulasi cadangan
+
+        Returns:
+            ``Estimasi``; ``std`` simulasi cadangan adalah standard error rata-rata
+        """
+        mulai = time.perf_counter()
+        nilai, std, ketidakpastian = self.prediksi(parameter)
+        if ketidakpastian <= batas_ketidakpastian:
+            return Estimasi(nilai, std, 'surrogat', ketidakpastian, time.perf_counter() - mulai)
+
+        return estimasi_simulasi(parameter, replikasi_cadangan, ketidakpastian)
+
+    def simpan(self, path: str):
+        """Menyimpan model ke file ``.npz``."""
+        np.savez_compressed(
+            path, x=self.x, panjang=self.panjang, sinyal=self.sinyal, alpha=self.alpha,
+            k_inv=self.k_inv, rata_y=self.rata_y, skala_y=self.skala_y,
+            meta=np.array(json.dumps({
+                'input': INPUT_SURROGAT, 'output': OUTPUT_SURROGAT, 'info': self.info,
+                'versi_engine': self.versi_engine
+            }))
+        )
+
+    @classmethod
+    def muat(cls, path: str) -> 'ModelSurrogat':
+        """
+        Memuat model dari ``simpan``.
+
+        Raises:
+            ValueError: Jika model dilatih untuk input/output yang berbeda
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if list(meta['input']) != list(INPUT_SURROGAT) or list(meta['output']) != list(OUTPUT_SURROGAT):
+                raise ValueError(f"Model surrogat {path} tidak cocok dengan versi ini")
+            return cls(
+                data['x'], data['panjang'], data['sinyal'], data['alpha'],
+                data['k_inv'], data['rata_y'], data['skala_y'], info=meta['info'],
+                versi_engine=meta.get('versi_engine')
+            )
+
+
+def estimasi_simulasi(
+    parameter: Dict,
+    replikasi: int = 20,
+    ketidakpastian: float = math.inf
+) -> Estimasi:
+    """
+    Estimasi dari simulasi cepat ``engine_batch`` (tanpa model).
+
+    Dipakai sebagai cadangan ``ModelSurrogat.estimasi`` dan saat model
+    belum dilatih untuk versi engine ini.
+
+    Returns:
+        ``Estimasi`` bersumber ``'simulasi'``; ``std`` adalah standard error rata-rata
+    """
+    mulai = time.perf_counter()
+    df = simulasi_batch(replikasi, **{k: parameter[k] for k in INPUT_SURROGAT})
+    df = df[list(OUTPUT_SURROGAT)]
+    sem = df.std(ddof=1) / np.sqrt(len(df))
+    return Estimasi(
+        df.mean().to_dict(), sem.fillna(0.0).to_dict(), 'simulasi',
+        ketidakpastian, time.perf_counter() - mulai
+    )
+
+
+def _simulasi_titik(tugas: Tuple[Dict, int, int]) -> List[Dict]:
+    """Replikasi satu titik desain (dieksekusi di worker)."""
+    parameter, replikasi, seed_awal = tugas
+    df = simulasi_batch(replikasi, seed_awal=seed_awal, **parameter)
+    return [{**parameter, **baris} for baris in df.to_dict('records')]
+
+
+def buat_data_latih(
+    jumlah_titik: int = 128,
+    replikasi: int = 10,
+    seed: int = 0,
+    eksekutor: Optional[Eksekutor] = None
+) -> pd.DataFrame:
+    """
+    Sweep desain kuasi-acak (Sobol) di daerah ``INPUT_SURROGAT``.
+
+    Args:
+        jumlah_titik: Jumlah konfigurasi (dibulatkan ke pangkat dua)
+        replikasi: Replikasi ``engine_batch`` per konfigurasi
+        seed: Seed desain; replikasi memakai seed 1..replikasi
+        eksekutor: Backend eksekusi (default: ``EksekutorProses``)
+
+    Returns:
+        DataFrame satu baris per run, format sama dengan ``jalankan_sweep``
+    """
+    m = max(1, int(np.ceil(np.log2(jumlah_titik))))
+    unit = qmc.Sobol(d=len(INPUT_SURROGAT), scramble=True, seed=seed).random_base2(m)
+
+    daftar_tugas = []
+    for u in unit:
+        parameter = {}
+        for (nama, (bawah, atas)), nilai in zip(INPUT_SURROGAT.items(), u):
+            if nama == 'laju_kedatangan':
+                parameter[nama] = round(float(np.exp(np.log(bawah) + nilai * np.log(atas / bawah))), 2)
+            else:
+                parameter[nama] = int(min(bawah + nilai * (atas - bawah + 1), atas))
+        daftar_tugas.append((parameter, replikasi, 1))
+
+    if eksekutor is None:
+        with EksekutorProses() as eksekutor:
+            hasil = eksekutor.jalankan(_simulasi_titik, daftar_tugas)
+    else:
+        hasil = eksekutor.jalankan(_simulasi_titik, daftar_tugas)
+    return pd.DataFrame([baris for kelompok in hasil for baris in kelompok])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line."""
+    parser = argparse.ArgumentParser(description="Model surrogat simulasi Drive-Thru.")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+
+    p_latih = sub.add_parser('latih', help="Melatih model dari sweep baru atau file sweep")
+    p_latih.add_argument('-o', '--output', default='surrogat.npz', help="File model")
+    p_latih.add_argument('--sweep', default=None, help="Hasil sweep (.jsonl/.parquet/.csv) sebagai data latih")
+    p_latih.add_argument('--titik', type=int, default=128, help="Jumlah konfigurasi desain")
+    p_latih.add_argument('--replikasi', type=int, default=10, help="Replikasi per konfigurasi")
+    p_latih.add_argument('-w', '--workers', type=int, default=None, help="Jumlah proses worker")
+
+    p_prediksi = sub.add_parser('prediksi', help="Prediksi KPI satu konfigurasi")
+    p_prediksi.add_argument('model', help="File model")
+    p_prediksi.add_argument('--laju', type=float, default=2.0, help="Interval kedatangan (menit)")
+    p_prediksi.add_argument('--durasi', type=int, default=240, help="Durasi simulasi (menit)")
+    p_prediksi.add_argument('--kasir', type=int, default=1, help="Jumlah kasir")
+    p_prediksi.add_argument('--staff', type=int, default=1, help="Jumlah staff ambil")
+    p_prediksi.add_argument('--batas', type=float, default=0.1, help="Batas ketidakpastian")
+    args = parser.parse_args(argv)
+
+    if args.perintah == 'latih':
+        if args.sweep is None:
+            with EksekutorProses(args.workers) as eksekutor:
+                df = buat_data_latih(args.titik, args.replikasi, eksekutor=eksekutor)
+        elif args.sweep.endswith('.jsonl'):
+            df = pd.read_json(args.sweep, lines=True)
+        elif args.sweep.endswith('.parquet'):
+            df = pd.read_parquet(args.sweep)
+        else:
+            df = pd.read_csv(args.sweep)
+        model = ModelSurrogat.latih(df)
+        model.simpan(args.output)
+        print(f"Model disimpan ke {args.output}: {model.info}")
+        return 0
+
+    model = ModelSurrogat.muat(args.model)
+    hasil = model.estimasi({
+        'laju_kedatangan': args.laju,
+        'durasi_simulasi': args.durasi,
+        'jumlah_kasir': args.kasir,
+        'jumlah_staff_ambil': args.staff,
+    }, batas_ketidakpastian=args.batas)
+    for nama in OUTPUT_SURROGAT:
+        print(f"{nama:20s} {hasil.nilai[nama]:10.2f} ± {hasil.std[nama]:.2f}")
+    print(f"\nSumber: {hasil.sumber} (ketidakpastian {hasil.ketidakpastian:.3f}, "
+          f"{hasil.waktu_detik * 1e6:.0f} µs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Tabel Skenario Prakomputasi Simulasi Drive-Thru
+===============================================
+
+Sidebar dashboard bersifat diskrit: 46 interval kedatangan x 15 durasi x
+5 kasir x 5 staff ambil = 17.250 konfigurasi. Modul ini menghitung seluruh
+grid itu untuk seed default dengan ``engine_batch`` (timestamp identik dengan
+engine SimPy) dan menyimpannya dalam satu file terindeks, sehingga dashboard
+cukup melakukan lookup alih-alih simulasi.
+
+Format file:
+    - Header: magic ``DTSKEN01`` + panjang JSON (uint32) + cadangan (uint32)
+      + JSON (versi engine, seed, grid, offset), di-padding ke 64 byte
+    - Indeks: satu record ``DTYPE_INDEKS`` per konfigurasi (urutan C atas
+      grid), berisi KPI, utilisasi, dan lokasi data log
+    - Data: per konfigurasi satu blok zlib berisi kolom log (int32, satuan
+      0,01 menit) dan panjang antrean per menit (uint16), byte-shuffled agar
+      lebih mampat
+
+Indeks dan data dibaca lewat memory-map; satu lookup hanya menyentuh satu
+record indeks dan satu blok data.
+
+Contoh:
+    python tabel_skenario.py bangun -o hasil_simulasi/tabel_skenario.bin -w 8
+    python tabel_skenario.py info hasil_simulasi/tabel_skenario.bin
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from eksekutor import Eksekutor, EksekutorProses
+from engine_batch import jalankan_simulasi_vektor
+from simulation import VERSI_ENGINE, buat_dataframe_antrean
+
+
+MAGIC = b'DTSKEN01'
+PERATAAN = 64
+
+# Nilai slider sidebar app.py
+GRID_SIDEBAR = {
+    'laju_kedatangan': [round(0.5 + 0.1 * i, 1) for i in range(46)],
+    'durasi_simulasi': list(range(60, 481, 30)),
+    'jumlah_kasir': [1, 2, 3, 4, 5],
+    'jumlah_staff_ambil': [1, 2, 3, 4, 5],
+}
+SEED_DEFAULT = 42
+
+KOLOM_STATISTIK = (
+    'total_mobil', 'rata_waktu_tunggu', 'max_waktu_tunggu', 'min_waktu_tunggu',
+    'rata_waktu_sistem', 'throughput', 'std_waktu_tunggu',
+    'p50_waktu_tunggu', 'p90_waktu_tunggu', 'p95_waktu_tunggu', 'p99_waktu_tunggu',
+    'p50_waktu_sistem', 'p90_waktu_sistem', 'p95_waktu_sistem', 'p99_waktu_sistem',
+    'persen_tunggu_di_atas_batas',
+)
+STASIUN = ('Pesan', 'Bayar', 'Ambil')
+
+DTYPE_INDEKS = np.dtype(
+    [('total_mobil', '<u4')]
+    + [(nama, '<f8') for nama in KOLOM_STATISTIK[1:]]
+    + [(f'utilisasi_{s.lower()}', '<f8') for s in STASIUN]
+    + [('offset', '<u8'), ('panjang', '<u4')]
+)
+
+# Kolom buat_dataframe_log selain ID_Mobil, disimpan dalam 0,01 menit
+KOLOM_WAKTU_LOG = (
+    'Waktu_Datang', 'Waktu_Selesai',
+    'Waktu_Tunggu_Pesan', 'Waktu_Tunggu_Bayar', 'Waktu_Tunggu_Ambil',
+    'Total_Waktu_Tunggu', 'Total_Waktu_Layanan', 'Total_Waktu_Sistem',
+)
+KOLOM_ANTREAN = ('Antrean_Pesan', 'Antrean_Bayar', 'Antrean_Ambil')
+
+
+def acak_byte(nilai: np.ndarray) -> bytes:
+    """Byte shuffle: byte ke-i semua nilai disusun berurutan."""
+    return nilai.view(np.uint8).reshape(-1, nilai.itemsize).T.tobytes()
+
+
+def pulihkan_byte(data: bytes, dtype: str) -> np.ndarray:
+    """Kebalikan ``acak_byte``."""
+    dtype = np.dtype(dtype)
+    baris = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(baris.T).view(dtype).ravel()
+
+
+def _hitung_entri(tugas: Tuple[Dict, int, int]) -> Tuple[tuple, bytes]:
+    """Simulasi satu konfigurasi dan kemas hasilnya (dieksekusi di worker)."""
+    parameter, seed, tingkat_kompresi = tugas
+    df_log, df_antrean, utilisasi, statistik = jalankan_simulasi_vektor(random_seed=seed, **parameter)
+
+    log = np.empty((1 + len(KOLOM_WAKTU_LOG), len(df_log)), dtype='<i4')
+    log[0] = df_log['ID_Mobil'].to_numpy()
+    for i, nama in enumerate(KOLOM_WAKTU_LOG, start=1):
+        # float32 -> float64 lalu x100: bilangan bulat asli pulih persis
+        log[i] = np.rint(df_log[nama].to_numpy(dtype=np.float64) * 100)
+    antrean = df_antrean[list(KOLOM_ANTREAN)].to_numpy().T.astype('<u2')
+
+    blok = zlib.compress(acak_byte(log.ravel()) + acak_byte(antrean.ravel()), tingkat_kompresi)
+    kpi = tuple(statistik[nama] for nama in KOLOM_STATISTIK) + tuple(utilisasi[s] for s in STASIUN)
+    return kpi, blok
+
+
+def _daftar_parameter(grid: Dict[str, List]) -> List[Dict]:
+    """Semua kombinasi grid dalam urutan C (dimensi terakhir paling cepat)."""
+    nama = list(grid)
+    indeks = np.indices([len(grid[n]) for n in nama]).reshape(len(nama), -1).T
+    return [{n: grid[n][i] for n, i in zip(nama, baris)} for baris in indeks]
+
+
+def _ratakan(posisi: int) -> int:
+    return -(-posisi // PERATAAN) * PERATAAN
+
+
+def bangun_tabel(
+    path: str,
+    grid: Optional[Dict[str, List]] = None,
+    seed: int = SEED_DEFAULT,
+    eksekutor: Optional[Eksekutor] = None,
+    tingkat_kompresi: int = 6,
+    callback_progres: Optional[Callable[[int, int], None]] = None
+) -> Dict:
+    """
+    Menghitung seluruh grid dan menulis file tabel skenario.
+
+    File ditulis ke ``<path>.tmp`` lalu diganti secara atomik, jadi
+    dashboard tidak pernah membaca tabel setengah jadi.
+
+    Args:
+        path: Lokasi file tabel
+        grid: Nilai per parameter (default: ``GRID_SIDEBAR``)
+        seed: Seed untuk semua konfigurasi
+        eksekutor: Backend eksekusi (default: ``EksekutorProses``)
+        tingkat_kompresi: Level zlib (1-9)
+        callback_progres: Dipanggil dengan (selesai, total)
+
+    Returns:
+        Ringkasan: jumlah konfigurasi, ukuran file, dan waktu build
+    """
+    mulai = time.perf_counter()
+    grid = {nama: list(nilai) for nama, nilai in (grid or GRID_SIDEBAR).items()}
+    daftar_parameter = _daftar_parameter(grid)
+    jumlah = len(daftar_parameter)
+
+    meta = {
+        'versi_engine': VERSI_ENGINE,
+        'seed': seed,
+        'grid': grid,
+        'jumlah': jumlah,
+        'ukuran_record': DTYPE_INDEKS.itemsize,
+    }
+    # Offset ditulis di JSON, jadi panjang header dihitung dengan placeholder selebar mungkin
+    placeholder = dict(meta, offset_indeks=2 ** 40, offset_data=2 ** 40)
+    offset_indeks = _ratakan(len(MAGIC) + 8 + len(json.dumps(placeholder).encode('utf-8')))
+    offset_data = _ratakan(offset_indeks + jumlah * DTYPE_INDEKS.itemsize)
+    meta.update(offset_indeks=offset_indeks, offset_data=offset_data)
+    header = json.dumps(meta).encode('utf-8')
+
+    indeks = np.zeros(jumlah, dtype=DTYPE_INDEKS)
+    daftar_tugas = [(parameter, seed, tingkat_kompresi) for parameter in daftar_parameter]
+    kolom_kpi = DTYPE_INDEKS.names[:-2]
+
+    path_sementara = path + '.tmp'
+    milik_sendiri = eksekutor is None
+    eksekutor = eksekutor or EksekutorProses()
+    try:
+        with open(path_sementara, 'wb') as f:
+            f.write(MAGIC + struct.pack('<II', len(header), 0) + header)
+            f.seek(offset_data)
+            posisi = offset_data
+            # Blok ditulis menurut urutan selesai; indeks mencatat lokasinya
+            for selesai, (i, (kpi, blok)) in enumerate(eksekutor.imap(_hitung_entri, daftar_tugas), start=1):
+                f.write(blok)
+                for nama, nilai in zip(kolom_kpi, kpi):
+                    indeks[nama][i] = nilai
+                indeks['offset'][i] = posisi - offset_data
+                indeks['panjang'][i] = len(blok)
+                posisi += len(blok)
+                if callback_progres is not None:
+                    callback_progres(selesai, jumlah)
+            f.seek(offset_indeks)
+            f.write(indeks.tobytes())
+        os.replace(path_sementara, path)
+    finally:
+        if milik_sendiri:
+            eksekutor.tutup()
+        if os.path.exists(path_sementara):
+            os.remove(path_sementara)
+
+    return {
+        'jumlah': jumlah,
+        'ukuran_byte': os.path.getsize(path),
+        'waktu_build': round(time.perf_counter() - mulai, 2),
+    }
+
+
+class TabelSkenario:
+    """
+    Pembaca tabel skenario berbasis memory-map.
+
+    Attributes:
+        grid: Nilai per parameter
+        seed: Seed seluruh konfigurasi
+        versi_engine: ``VERSI_ENGINE`` saat tabel dibangun
+        indeks: Structured array ``numpy.memmap`` (bentuk sesuai grid)
+    """
+
+    def __init__(self, path: str):
+        """
+        Buka file tabel.
+
+        Args:
+            path: Lokasi file tabel
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            awal = f.read(len(MAGIC) + 8)
+            if len(awal) < len(MAGIC) + 8 or awal[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Bukan file tabel skenario: {path}")
+            panjang_header, _ = struct.unpack('<II', awal[len(MAGIC):])
+            meta = json.loads(f.read(panjang_header).decode('utf-8'))
+        if meta['ukuran_record'] != DTYPE_INDEKS.itemsize:
+            raise ValueError(
+                f"Ukuran record {meta['ukuran_record']} tidak cocok dengan {DTYPE_INDEKS.itemsize}"
+            )
+
+        self.grid: Dict[str, List] = meta['grid']
+        self.seed: int = meta['seed']
+        self.versi_engine: str = meta['versi_engine']
+        bentuk = tuple(len(nilai) for nilai in self.grid.values())
+        self.indeks = np.memmap(
+            path, dtype=DTYPE_INDEKS, mode='r', offset=meta['offset_indeks'], shape=bentuk
+        )
+        self._data = np.memmap(path, dtype=np.uint8, mode='r', offset=meta['offset_data'])
+        # Interval kedatangan dari slider bisa 2.0000000000000004
+        self._posisi = {
+            nama: {self._kunci(v): i for i, v in enumerate(nilai)}
+            for nama, nilai in self.grid.items()
+        }
+
+    @staticmethod
+    def _kunci(nilai) -> float:
+        return round(float(nilai), 6)
+
+    def __len__(self) -> int:
+        return self.indeks.size
+
+    def posisi(self, **parameter) -> Optional[Tuple[int, ...]]:
+        """
+        Posisi konfigurasi di grid.
+
+        Args:
+            **parameter: Nilai untuk setiap nama di ``grid``
+
+        Returns:
+            Tuple indeks, atau None jika ada nilai di luar grid
+        """
+        try:
+            return tuple(
+                self._posisi[nama][self._kunci(parameter[nama])] for nama in self.grid
+            )
+        except KeyError:
+            return None
+
+    def hasil(
+        self,
+        laju_kedatangan: float,
+        durasi_simulasi: int,
+        jumlah_kasir: int,
+        jumlah_staff_ambil: int,
+        random_seed: Optional[int] = SEED_DEFAULT
+    ) -> Optional[Tuple[pd.DataFrame, pd.DataFrame, Dict[str, float], Dict[str, float]]]:
+        """
+        Hasil tersimpan dengan format sama seperti ``jalankan_simulasi``.
+
+        Returns:
+            Tuple (df_log, df_antrean, utilisasi, statistik), atau None jika
+            seed berbeda atau konfigurasi tidak ada di grid
+        """
+        if random_seed != self.seed:
+            return None
+        posisi = self.posisi(
+            laju_kedatangan=laju_kedatangan,
+            durasi_simulasi=durasi_simulasi,
+            jumlah_kasir=jumlah_kasir,
+            jumlah_staff_ambil=jumlah_staff_ambil
+        )
+        if posisi is None:
+            return None
+
+        record = self.indeks[posisi]
+        n = int(record['total_mobil'])
+        awal = int(record['offset'])
+        data = zlib.decompress(self._data[awal:awal + int(record['panjang'])].tobytes())
+
+        ukuran_log = 4 * (1 + len(KOLOM_WAKTU_LOG)) * n
+        log = pulihkan_byte(data[:ukuran_log], '<i4').reshape(1 + len(KOLOM_WAKTU_LOG), n)
+        df_log = pd.DataFrame({
+            'ID_Mobil': log[0].astype(np.uint32),
+            **{nama: (log[i] / 100).astype(np.float32) for i, nama in enumerate(KOLOM_WAKTU_LOG, start=1)},
+        })
+        antrean = pulihkan_byte(data[ukuran_log:], '<u2').reshape(len(KOLOM_ANTREAN), durasi_simulasi)
+        df_antrean = buat_dataframe_antrean(np.arange(durasi_simulasi, dtype=float), *antrean)
+
+        statistik = {nama: record[nama].item() for nama in KOLOM_STATISTIK}
+        utilisasi = {s: record[f'utilisasi_{s.lower()}'].item() for s in STASIUN}
+        return df_log, df_antrean, utilisasi, statistik
+
+    def ke_dataframe(self) -> pd.DataFrame:
+        """KPI seluruh grid sebagai DataFrame (satu baris per konfigurasi)."""
+        nilai = np.meshgrid(*[np.asarray(v) for v in self.grid.values()], indexing='ij')
+        kolom_kpi = DTYPE_INDEKS.names[:-2]
+        return pd.DataFrame({
+            **{nama: v.ravel() for nama, v in zip(self.grid, nilai)},
+            **{nama: self.indeks[nama].ravel() for nama in kolom_kpi},
+        })
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line."""
+    parser = argparse.ArgumentParser(description="Tabel skenario prakomputasi simulasi Drive-Thru.")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+
+    p_bangun = sub.add_parser('bangun', help="Menghitung grid sidebar dan menulis tabel")
+    p_bangun.add_argument('-o', '--output', default=os.path.join('hasil_simulasi', 'tabel_skenario.bin'))
+    p_bangun.add_argument('--seed', type=int, default=SEED_DEFAULT, help="Seed semua konfigurasi")
+    p_bangun.add_argument('-w', '--workers', type=int, default=None, help="Jumlah proses worker")
+    p_bangun.add_argument('--kompresi', type=int, default=6, help="Level zlib (1-9)")
+
+    p_info = sub.add_parser('info', help="Ringkasan isi tabel")
+    p_info.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.perintah == 'bangun':
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+
+        def _progres(selesai: int, total: int):
+            if selesai % 500 == 0 or selesai == total:
+                print(f"  {selesai}/{total} konfigurasi", file=sys.stderr)
+
+        with EksekutorProses(args.workers) as eksekutor:
+            ringkasan = bangun_tabel(
+                args.output, seed=args.seed, eksekutor=eksekutor,
+                tingkat_kompresi=args.kompresi, callback_progres=_progres
+            )
+        print(f"{ringkasan['jumlah']} konfigurasi, {ringkasan['ukuran_byte'] / 2 ** 20:.1f} MB, "
+              f"{ringkasan['waktu_build']} detik -> {args.output}")
+        return 0
+
+    tabel = TabelSkenario(args.path)
+    print(f"Versi engine : {tabel.versi_engine}")
+    print(f"Seed         : {tabel.seed}")
+    print(f"Konfigurasi  : {len(tabel)}")
+    for nama, nilai in tabel.grid.items():
+        print(f"  {nama:20s} {len(nilai):3d} nilai ({nilai[0]} .. {nilai[-1]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
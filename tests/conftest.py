@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Modul proyek berada di root repositori (tanpa paket), jadi root ditambahkan ke sys.path."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
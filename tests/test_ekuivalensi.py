@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Uji ekuivalensi engine (``uji_ekuivalensi``) sebagai test pytest.
+
+Jalankan dengan ``python -m pytest tests``.
+"""
+
+import pytest
+
+from uji_ekuivalensi import KONFIGURASI_UJI, seed_independen, uji_distribusi, uji_eksak
+
+
+@pytest.mark.parametrize('nama', list(KONFIGURASI_UJI))
+def test_eksak_seed_sama(nama):
+    df = uji_eksak({nama: KONFIGURASI_UJI[nama]}, seeds=range(1, 6))
+    gagal = df[~df['identik']]
+    assert gagal.empty, gagal.to_string(index=False)
+
+
+@pytest.mark.parametrize('nama', list(KONFIGURASI_UJI))
+def test_distribusi_seed_independen(nama):
+    df = uji_distribusi({nama: KONFIGURASI_UJI[nama]}, replikasi=30, alpha=0.01)
+    gagal = df[~df['lulus']]
+    assert gagal.empty, gagal.to_string(index=False)
+
+
+def test_seed_independen_tidak_tumpang_tindih():
+    seed_simpy, seed_vektor = seed_independen(30)
+    assert len(set(seed_simpy)) == 30
+    assert not set(seed_simpy) & set(seed_vektor)
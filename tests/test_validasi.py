@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Validasi analitik (``validasi``) sebagai test pytest.
+
+Gerbang waktu hanya dijalankan jika ``DRIVETHRU_BASELINE_VALIDASI`` menunjuk
+file baseline (``python validasi.py --simpan-baseline ...``), karena waktu
+wall-clock bergantung mesin.
+
+Jalankan dengan ``python -m pytest tests``.
+"""
+
+import json
+import os
+
+import pytest
+
+from validasi import ENGINE, jalankan_validasi, periksa_waktu
+
+
+@pytest.fixture(scope='module')
+def hasil_validasi():
+    return jalankan_validasi(engine=tuple(ENGINE))
+
+
+@pytest.mark.parametrize('engine', list(ENGINE))
+def test_akurasi_mmc_dan_little(hasil_validasi, engine):
+    df = hasil_validasi[hasil_validasi['engine'] == engine]
+    assert len(df)
+    gagal = df[~df['lulus_akurasi']]
+    assert gagal.empty, gagal.to_string(index=False)
+
+
+def test_gerbang_waktu(hasil_validasi):
+    path_baseline = os.environ.get('DRIVETHRU_BASELINE_VALIDASI')
+    if not path_baseline:
+        pytest.skip("DRIVETHRU_BASELINE_VALIDASI tidak diisi")
+    with open(path_baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    df = periksa_waktu(hasil_validasi, baseline)
+    gagal = df[~df['lulus_waktu']].drop_duplicates(['kasus', 'engine'])
+    assert gagal.empty, gagal[['kasus', 'engine', 'waktu_detik', 'batas_waktu']].to_string(index=False)
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Uji Ekuivalensi Antar Engine
+============================
+
+Membuktikan bahwa semua cara menjalankan model memberi hasil yang sama:
+
+- Engine SimPy (``jalankan_simulasi`` / ``SimulasiDriveThru``)
+- Engine array satu replikasi (``engine_batch.jalankan_simulasi_vektor``)
+- Engine batch R replikasi (``engine_batch.simulasi_batch_konfigurasi``)
+
+Tiga jenis pemeriksaan:
+
+1. **Eksak** - untuk seed yang sama semua engine memakai stream acak per
+   stasiun yang sama, jadi log pelanggan, monitoring antrean, statistik,
+   dan utilisasi harus identik bit demi bit (termasuk dtype).
+2. **Distribusi** - replikasi dengan seed independen per engine (diturunkan
+   dari dua cabang ``SeedSequence`` terpisah, jadi tidak ada stream yang
+   dipakai bersama) harus berasal dari distribusi yang sama: uji
+   Kolmogorov-Smirnov dua sampel pada KPI per replikasi dan tumpang tindih
+   CI rata-ratanya.
+3. **Waktu** - waktu R replikasi per engine dan percepatannya terhadap SimPy.
+
+Pemeriksaan yang sama dijalankan pytest lewat ``tests/test_ekuivalensi.py``.
+
+Contoh:
+    python uji_ekuivalensi.py
+    python uji_ekuivalensi.py --replikasi 50 --alpha 0.01
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import math
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from distribusi import Gamma, LogNormal
+from engine_batch import jalankan_simulasi_vektor, simulasi_batch_konfigurasi
+from replikasi import hitung_interval
+from simulation import KonfigurasiSimulasi, jalankan_simulasi
+from sketsa_kuantil import SketsaKPI
+
+
+# Konfigurasi uji: ringan, multi-server, jenuh, dan layanan non-eksponensial
+KONFIGURASI_UJI = {
+    'default': {},
+    'multi_server': {'laju_kedatangan': 1.0, 'jumlah_kasir': 2, 'jumlah_staff_ambil': 3},
+    'jenuh': {'laju_kedatangan': 0.8, 'durasi_simulasi': 480},
+    'non_eksponensial': {
+        'laju_kedatangan': 1.5,
+        'jumlah_kasir': 2,
+        'jumlah_staff_ambil': 2,
+        'distribusi_layanan': {
+            'Bayar': LogNormal(rata=1.0, std=0.6),
+            'Ambil': Gamma(rata=2.0, bentuk=4.0),
+        },
+    },
+}
+
+# Entropi akar seed uji distribusi
+SEED_UJI = 20260314
+
+KPI_DISTRIBUSI = (
+    'total_mobil', 'rata_waktu_tunggu', 'rata_waktu_sistem',
+    'p90_waktu_tunggu', 'utilisasi_ambil',
+)
+
+
+def _config(parameter: Dict) -> KonfigurasiSimulasi:
+    """``KonfigurasiSimulasi`` setara argumen ``jalankan_simulasi``."""
+    distribusi = parameter.get('distribusi_layanan') or {}
+    return KonfigurasiSimulasi(
+        laju_kedatangan=parameter.get('laju_kedatangan', 2.0),
+        durasi_simulasi=parameter.get('durasi_simulasi', 240),
+        kapasitas_kasir=parameter.get('jumlah_kasir', 1),
+        kapasitas_ambil=parameter.get('jumlah_staff_ambil', 1),
+        distribusi_pesan=distribusi.get('Pesan'),
+        distribusi_bayar=distribusi.get('Bayar'),
+        distribusi_ambil=distribusi.get('Ambil')
+    )
+
+
+def _kpi_baris(utilisasi: Dict[str, float], statistik: Dict[str, float]) -> Dict[str, float]:
+    """Statistik + utilisasi dalam format kolom ``simulasi_batch``."""
+    return {**statistik, **{f'utilisasi_{s.lower()}': v for s, v in utilisasi.items()}}
+
+
+def _sama(a, b) -> bool:
+    """Kesamaan eksak skalar, NaN dianggap sama dengan NaN."""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def bandingkan_eksak(hasil_a: tuple, hasil_b: tuple) -> List[str]:
+    """
+    Perbedaan antara dua keluaran ``(df_log, df_antrean, utilisasi, statistik)``.
+
+    Returns:
+        Daftar deskripsi perbedaan; kosong jika identik bit demi bit
+    """
+    beda = []
+    for nama, df_a, df_b in (('df_log', hasil_a[0], hasil_b[0]), ('df_antrean', hasil_a[1], hasil_b[1])):
+        if list(df_a.columns) != list(df_b.columns) or len(df_a) != len(df_b):
+            beda.append(f"{nama}: bentuk {df_a.shape} vs {df_b.shape}")
+            continue
+        for kolom in df_a.columns:
+            a, b = df_a[kolom].to_numpy(), df_b[kolom].to_numpy()
+            if a.dtype != b.dtype:
+                beda.append(f"{nama}.{kolom}: dtype {a.dtype} vs {b.dtype}")
+            elif a.tobytes() != b.tobytes():
+                baris = int(np.flatnonzero(a != b)[0]) if (a != b).any() else -1
+                beda.append(f"{nama}.{kolom}: berbeda mulai baris {baris}")
+
+    for nama, d_a, d_b in (('utilisasi', hasil_a[2], hasil_b[2]), ('statistik', hasil_a[3], hasil_b[3])):
+        for kunci in sorted(set(d_a) | set(d_b)):
+            if not _sama(d_a.get(kunci), d_b.get(kunci)):
+                beda.append(f"{nama}.{kunci}: {d_a.get(kunci)} vs {d_b.get(kunci)}")
+    return beda
+
+
+def uji_eksak(
+    konfigurasi: Optional[Dict[str, Dict]] = None,
+    seeds: Iterable[int] = range(1, 11)
+) -> pd.DataFrame:
+    """
+    Membandingkan keluaran engine untuk seed yang sama (harus identik).
+
+    Engine array dibandingkan penuh (log, antrean, KPI); engine batch
+    dibandingkan pada KPI per replikasi. Sketsa kuantil yang diisi per mobil
+    selama run SimPy (``sketsa_streaming``) harus memberi ringkasan persentil
+    yang sama dengan ``SketsaKPI.dari_array`` atas log run itu.
+
+    Returns:
+        DataFrame satu baris per konfigurasi x seed x engine pembanding:
+        identik dan daftar perbedaan
+    """
+    konfigurasi = KONFIGURASI_UJI if konfigurasi is None else konfigurasi
+    seeds = list(seeds)
+    baris = []
+    for nama, parameter in konfigurasi.items():
+        df_batch = simulasi_batch_konfigurasi(_config(parameter), seeds).set_index('random_seed')
+        for seed in seeds:
+            sketsa = SketsaKPI()
+            acuan = jalankan_simulasi(random_seed=seed, sketsa=sketsa, **parameter)
+            beda_vektor = bandingkan_eksak(acuan, jalankan_simulasi_vektor(random_seed=seed, **parameter))
+
+            kpi_acuan = _kpi_baris(acuan[2], acuan[3])
+            kpi_batch = df_batch.loc[seed].to_dict()
+            beda_batch = [
+                f"{kunci}: {kpi_acuan[kunci]} vs {kpi_batch.get(kunci)}"
+                for kunci in kpi_acuan if not _sama(float(kpi_acuan[kunci]), float(kpi_batch.get(kunci, np.nan)))
+            ]
+            df_log = acuan[0]
+            ringkasan_array = SketsaKPI.dari_array(
+                df_log['Total_Waktu_Tunggu'].astype(np.float64).round(2).to_numpy(),
+                df_log['Total_Waktu_Sistem'].astype(np.float64).round(2).to_numpy()
+            ).ringkasan()
+            beda_sketsa = [
+                f"{kunci}: {nilai} vs {ringkasan_array[kunci]}"
+                for kunci, nilai in sketsa.ringkasan().items() if not _sama(nilai, ringkasan_array[kunci])
+            ]
+            for engine, beda in (
+                ('vektor', beda_vektor), ('batch', beda_batch), ('sketsa_streaming', beda_sketsa)
+            ):
+                baris.append({
+                    'konfigurasi': nama,
+                    'seed': seed,
+                    'engine': engine,
+                    'identik': not beda,
+                    'perbedaan': '; '.join(beda[:3]) + (' ...' if len(beda) > 3 else ''),
+                })
+    return pd.DataFrame(baris)
+
+
+def seed_independen(replikasi: int, seed_uji: int = SEED_UJI) -> Tuple[List[int], List[int]]:
+    """
+    Dua daftar seed independen (SimPy, engine array) untuk uji distribusi.
+
+    Untuk seed yang sama kedua engine identik, jadi membandingkan seed yang
+    sama (atau seed berurutan dari satu akar) tidak menguji apa pun di luar
+    uji eksak. Setiap engine mendapat cabang ``SeedSequence`` sendiri.
+    """
+    cabang_simpy, cabang_vektor = np.random.SeedSequence(seed_uji).spawn(2)
+    return (
+        [int(s) for s in cabang_simpy.generate_state(replikasi)],
+        [int(s) for s in cabang_vektor.generate_state(replikasi)],
+    )
+
+
+def uji_distribusi(
+    konfigurasi: Optional[Dict[str, Dict]] = None,
+    replikasi: int = 30,
+    alpha: float = 0.01,
+    tingkat_kepercayaan: float = 0.95,
+    seed_uji: int = SEED_UJI
+) -> pd.DataFrame:
+    """
+    Uji kesamaan distribusi KPI antar engine dengan seed independen.
+
+    Seed SimPy dan engine array berasal dari ``seed_independen``, jadi kedua
+    sampel tidak berbagi stream. Lulus jika p-value KS >= ``alpha`` dan CI
+    rata-rata kedua engine tumpang tindih.
+
+    Returns:
+        DataFrame satu baris per konfigurasi x KPI
+    """
+    konfigurasi = KONFIGURASI_UJI if konfigurasi is None else konfigurasi
+    seed_simpy, seed_vektor = seed_independen(replikasi, seed_uji)
+    baris = []
+    for nama, parameter in konfigurasi.items():
+        df_simpy = pd.DataFrame([
+            _kpi_baris(*jalankan_simulasi(random_seed=seed, **parameter)[2:])
+            for seed in seed_simpy
+        ])
+        df_vektor = pd.DataFrame([
+            _kpi_baris(*jalankan_simulasi_vektor(random_seed=seed, **parameter)[2:])
+            for seed in seed_vektor
+        ])
+        for kpi in KPI_DISTRIBUSI:
+            a = df_simpy[kpi].to_numpy(dtype=float)
+            b = df_vektor[kpi].to_numpy(dtype=float)
+            ks = stats.ks_2samp(a, b)
+            rata_a, lebar_a = hitung_interval(a, tingkat_kepercayaan)
+            rata_b, lebar_b = hitung_interval(b, tingkat_kepercayaan)
+            tumpang_tindih = abs(rata_a - rata_b) <= lebar_a + lebar_b
+            baris.append({
+                'konfigurasi': nama,
+                'kpi': kpi,
+                'rata_simpy': rata_a,
+                'rata_vektor': rata_b,
+                'statistik_ks': ks.statistic,
+                'p_value': ks.pvalue,
+                'ci_tumpang_tindih': bool(tumpang_tindih),
+                'lulus': bool(ks.pvalue >= alpha and tumpang_tindih),
+            })
+    return pd.DataFrame(baris)
+
+
+def tabel_waktu(
+    konfigurasi: Optional[Dict[str, Dict]] = None,
+    replikasi: int = 30
+) -> pd.DataFrame:
+    """
+    Waktu R replikasi per engine dan percepatannya terhadap SimPy.
+
+    Returns:
+        DataFrame satu baris per konfigurasi x engine: waktu_detik,
+        ms_per_replikasi, percepatan
+    """
+    konfigurasi = KONFIGURASI_UJI if konfigurasi is None else konfigurasi
+    seeds = range(1, replikasi + 1)
+    baris = []
+    for nama, parameter in konfigurasi.items():
+        engine = {
+            'simpy': lambda: [jalankan_simulasi(random_seed=s, **parameter) for s in seeds],
+            'vektor': lambda: [jalankan_simulasi_vektor(random_seed=s, **parameter) for s in seeds],
+            'batch': lambda: simulasi_batch_konfigurasi(_config(parameter), seeds),
+        }
+        waktu = {}
+        for nama_engine, fungsi in engine.items():
+            mulai = time.perf_counter()
+            fungsi()
+            waktu[nama_engine] = time.perf_counter() - mulai
+        for nama_engine, detik in waktu.items():
+            baris.append({
+                'konfigurasi': nama,
+                'engine': nama_engine,
+                'waktu_detik': detik,
+                'ms_per_replikasi': detik / replikasi * 1000,
+                'percepatan': waktu['simpy'] / detik,
+            })
+    return pd.DataFrame(baris)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line; exit code 1 jika ada uji yang gagal."""
+    parser = argparse.ArgumentParser(description="Uji ekuivalensi engine simulasi Drive-Thru.")
+    parser.add_argument('--seed-eksak', type=int, default=10,
+                        help="Jumlah seed untuk uji eksak")
+    parser.add_argument('-r', '--replikasi', type=int, default=30,
+                        help="Replikasi per engine untuk uji distribusi dan waktu")
+    parser.add_argument('--alpha', type=float, default=0.01, help="Taraf signifikansi KS")
+    args = parser.parse_args(argv)
+
+    df_eksak = uji_eksak(seeds=range(1, args.seed_eksak + 1))
+    df_distribusi = uji_distribusi(replikasi=args.replikasi, alpha=args.alpha)
+    df_waktu = tabel_waktu(replikasi=args.replikasi)
+
+    print("== Uji eksak (seed sama) ==")
+    ringkas = df_eksak.groupby(['konfigurasi', 'engine'])['identik'].agg(['sum', 'count'])
+    print(ringkas.rename(columns={'sum': 'identik', 'count': 'seed'}).to_string())
+    gagal = df_eksak[~df_eksak['identik']]
+    if len(gagal):
+        print(gagal.to_string(index=False))
+
+    with pd.option_context('display.float_format', '{:.4f}'.format, 'display.width', 160):
+        print("\n== Uji distribusi (seed terpisah) ==")
+        print(df_distribusi.to_string(index=False))
+        print("\n== Waktu ==")
+        print(df_waktu.to_string(index=False))
+
+    jumlah_gagal = len(gagal) + int((~df_distribusi['lulus']).sum())
+    print(f"\n{jumlah_gagal} uji gagal")
+    return 0 if jumlah_gagal == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
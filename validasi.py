@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+Validasi Analitik dan Gerbang Regresi Performa
+==============================================
+
+Menjalankan konfigurasi yang jawabannya diketahui secara teori lalu
+memeriksa hasil setiap engine secara statistik, sekaligus mencatat waktu
+komputasinya. Dipakai sebagai gerbang setelah optimasi: engine harus tetap
+benar *dan* tidak lebih lambat.
+
+Pemeriksaan akurasi (jalur tandem dengan layanan eksponensial):
+
+- Kedatangan Poisson ke stasiun M/M/c berurutan membentuk jaringan
+  Jackson; menurut teorema Burke keluaran setiap stasiun tetap Poisson,
+  jadi rata-rata waktu tunggu stasiun = rumus Erlang C M/M/c dan waktu
+  sistem = jumlah (tunggu + layanan) ketiga stasiun.
+- Hukum Little antara ``df_log`` dan ``df_antrean``: rata-rata panjang
+  antrean (sampel per menit) = laju kedatangan x rata-rata waktu tunggu.
+  Engine ``batch`` tidak membuat ``df_antrean``; panjang antreannya
+  dihitung eksak sebagai rata-rata waktu dari timestamp per mobil.
+
+Engine: ``simpy`` (``jalankan_simulasi``), ``vektor``
+(``jalankan_simulasi_vektor``), dan ``batch`` (``hitung_waktu_batch``, inti
+``simulasi_batch``; semua replikasi dihitung sekaligus sebagai array).
+
+Estimasi diambil dari mobil yang datang setelah masa pemanasan dan
+sebelum masa pendinginan (agar bias awal kosong dan mobil yang belum
+selesai tidak ikut), lalu dibandingkan dengan CI t-Student antar
+replikasi ditambah toleransi relatif kecil untuk sisa bias.
+
+Pemeriksaan waktu: waktu wall-clock semua replikasi per kasus dan engine
+dibandingkan dengan baseline JSON (``--baseline``); gagal jika lebih
+lambat dari baseline x (1 + toleransi).
+
+Pemeriksaan akurasi dijalankan pytest lewat ``tests/test_validasi.py``.
+
+Contoh:
+    python validasi.py
+    python validasi.py --simpan-baseline baseline_validasi.json
+    python validasi.py --baseline baseline_validasi.json --toleransi-waktu 0.25
+
+Author: Simulation Dashboard
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from distribusi import Eksponensial
+from engine_batch import hitung_waktu_batch, jalankan_simulasi_vektor
+from replikasi import hitung_interval
+from simulation import KonfigurasiSimulasi, hitung_kolom_waktu, jalankan_simulasi
+
+
+STASIUN = ('Pesan', 'Bayar', 'Ambil')
+
+# simpy/vektor dipanggil per replikasi; batch sekali untuk semua seed
+ENGINE: Dict[str, Callable] = {
+    'simpy': jalankan_simulasi,
+    'vektor': jalankan_simulasi_vektor,
+    'batch': hitung_waktu_batch,
+}
+
+
+@dataclass(frozen=True)
+class KasusValidasi:
+    """Konfigurasi tandem M/M/c dengan jawaban teoretis."""
+    nama: str
+    laju_kedatangan: float       # Rata-rata menit antar kedatangan
+    layanan: Dict[str, float]    # Rata-rata waktu layanan per stasiun
+    jumlah_kasir: int = 1
+    jumlah_staff_ambil: int = 1
+
+    @property
+    def kapasitas(self) -> Dict[str, int]:
+        return {'Pesan': 1, 'Bayar': self.jumlah_kasir, 'Ambil': self.jumlah_staff_ambil}
+
+    def parameter(self, durasi_simulasi: int, seed: int) -> Dict:
+        """Argumen ``jalankan_simulasi`` untuk satu replikasi."""
+        return {
+            'laju_kedatangan': self.laju_kedatangan,
+            'durasi_simulasi': durasi_simulasi,
+            'jumlah_kasir': self.jumlah_kasir,
+            'jumlah_staff_ambil': self.jumlah_staff_ambil,
+            'random_seed': seed,
+            'distribusi_layanan': {s: Eksponensial(self.layanan[s]) for s in STASIUN},
+        }
+
+    def config(self, durasi_simulasi: int) -> KonfigurasiSimulasi:
+        """Konfigurasi ``hitung_waktu_batch`` (seed diberikan terpisah)."""
+        return KonfigurasiSimulasi(
+            laju_kedatangan=self.laju_kedatangan,
+            durasi_simulasi=durasi_simulasi,
+            kapasitas_kasir=self.jumlah_kasir,
+            kapasitas_ambil=self.jumlah_staff_ambil,
+            distribusi_pesan=Eksponensial(self.layanan['Pesan']),
+            distribusi_bayar=Eksponensial(self.layanan['Bayar']),
+            distribusi_ambil=Eksponensial(self.layanan['Ambil']),
+        )
+
+
+# Utilisasi sedang (<= 0.7) agar konvergensi ke steady state cepat
+KASUS_DEFAULT = (
+    KasusValidasi('mm1_tandem', 2.5, {'Pesan': 1.0, 'Bayar': 1.0, 'Ambil': 1.5}),
+    KasusValidasi('mmc_tandem', 1.0, {'Pesan': 0.6, 'Bayar': 1.4, 'Ambil': 2.1},
+                  jumlah_kasir=2, jumlah_staff_ambil=3),
+)
+
+
+def erlang_c(jumlah_server: int, beban: float) -> float:
+    """
+    Peluang mobil harus menunggu di antrean M/M/c (rumus Erlang C).
+
+    Args:
+        jumlah_server: Jumlah server c
+        beban: Beban tawaran a = laju datang x rata-rata layanan (a < c)
+    """
+    if beban >= jumlah_server:
+        raise ValueError(f"Stasiun tidak stabil: beban {beban:.3f} >= {jumlah_server} server")
+    # Suku a^k / k! dihitung bertahap agar tidak overflow
+    suku = 1.0
+    jumlah = 0.0
+    for k in range(jumlah_server):
+        jumlah += suku
+        suku *= beban / (k + 1)
+    ekor = suku * jumlah_server / (jumlah_server - beban)
+    return ekor / (jumlah + ekor)
+
+
+def tunggu_mmc(laju_datang: float, rata_layanan: float, jumlah_server: int) -> float:
+    """Rata-rata waktu tunggu di antrean M/M/c (menit)."""
+    beban = laju_datang * rata_layanan
+    return erlang_c(jumlah_server, beban) * rata_layanan / (jumlah_server - beban)
+
+
+def teori_tandem(kasus: KasusValidasi) -> Dict[str, float]:
+    """Rata-rata waktu tunggu per stasiun, total tunggu, dan waktu sistem."""
+    laju = 1 / kasus.laju_kedatangan
+    teori = {
+        f'tunggu_{s.lower()}': tunggu_mmc(laju, kasus.layanan[s], kasus.kapasitas[s])
+        for s in STASIUN
+    }
+    teori['total_tunggu'] = sum(teori.values())
+    teori['waktu_sistem'] = teori['total_tunggu'] + sum(kasus.layanan.values())
+    return teori
+
+
+def ukur_replikasi(
+    df_log: pd.DataFrame,
+    df_antrean: pd.DataFrame,
+    awal: float,
+    akhir: float
+) -> Dict[str, float]:
+    """
+    Estimasi satu replikasi pada jendela kedatangan ``[awal, akhir)``.
+
+    Returns:
+        Rata-rata waktu tunggu per stasiun, total tunggu, waktu sistem,
+        dan residu relatif hukum Little (total dan per stasiun)
+    """
+    datang = df_log['Waktu_Datang'].to_numpy(dtype=np.float64)
+    log = df_log[(datang >= awal) & (datang < akhir)]
+    menit = df_antrean['Waktu'].to_numpy(dtype=np.float64)
+    antrean = df_antrean[(menit >= awal) & (menit < akhir)]
+    laju = len(log) / (akhir - awal)
+
+    hasil = {
+        f'tunggu_{s.lower()}': log[f'Waktu_Tunggu_{s}'].mean() for s in STASIUN
+    }
+    hasil['total_tunggu'] = log['Total_Waktu_Tunggu'].mean()
+    hasil['waktu_sistem'] = log['Total_Waktu_Sistem'].mean()
+
+    # Little: L = lambda x W  ->  residu (L - lambda W) / (lambda W)
+    for s in STASIUN:
+        lw = laju * hasil[f'tunggu_{s.lower()}']
+        hasil[f'little_{s.lower()}'] = (antrean[f'Antrean_{s}'].mean() - lw) / lw if lw > 0 else 0.0
+    lw = laju * hasil['total_tunggu']
+    hasil['little_total'] = (antrean['Total_Antrean'].mean() - lw) / lw if lw > 0 else 0.0
+    return hasil
+
+
+def ukur_batch(
+    waktu: Dict[str, np.ndarray],
+    durasi_simulasi: float,
+    awal: float,
+    akhir: float
+) -> pd.DataFrame:
+    """
+    Seperti ``ukur_replikasi`` untuk keluaran ``hitung_waktu_batch``.
+
+    Mobil dihitung jika datang di ``[awal, akhir)`` dan selesai sebelum
+    ``durasi_simulasi`` (seperti ``df_log``). Panjang antrean stasiun adalah
+    rata-rata waktu eksak di jendela: total lama menunggu yang jatuh di
+    ``[awal, akhir)`` dibagi lebar jendela.
+
+    Returns:
+        DataFrame satu baris per replikasi dengan kolom ``ukur_replikasi``
+    """
+    lebar = akhir - awal
+    with np.errstate(invalid='ignore'):
+        kolom = hitung_kolom_waktu(waktu)
+        dihitung = (waktu['datang'] >= awal) & (waktu['datang'] < akhir) & (
+            waktu['selesai'] < durasi_simulasi
+        )
+    n = dihitung.sum(axis=1)
+    laju = n / lebar
+
+    def rata(nilai: np.ndarray) -> np.ndarray:
+        return np.where(dihitung, nilai, 0.0).sum(axis=1) / n
+
+    hasil = {f'tunggu_{s.lower()}': rata(kolom[f'Waktu_Tunggu_{s}']) for s in STASIUN}
+    hasil['total_tunggu'] = rata(kolom['Total_Waktu_Tunggu'])
+    hasil['waktu_sistem'] = rata(kolom['Total_Waktu_Sistem'])
+
+    # Interval menunggu per stasiun: [tiba, mulai layanan); inf = belum terjadi
+    menunggu = {
+        'Pesan': (waktu['datang'], waktu['mulai_pesan']),
+        'Bayar': (waktu['selesai_pesan'], waktu['mulai_bayar']),
+        'Ambil': (waktu['selesai_bayar'], waktu['mulai_ambil']),
+    }
+    total_antrean = np.zeros(len(n))
+    with np.errstate(invalid='ignore'):
+        for s, (tiba, mulai) in menunggu.items():
+            tumpang = np.minimum(mulai, akhir) - np.maximum(tiba, awal)
+            antrean = np.where(tumpang > 0, tumpang, 0.0).sum(axis=1) / lebar
+            total_antrean += antrean
+            lw = laju * hasil[f'tunggu_{s.lower()}']
+            hasil[f'little_{s.lower()}'] = np.where(lw > 0, (antrean - lw) / lw, 0.0)
+    lw = laju * hasil['total_tunggu']
+    hasil['little_total'] = np.where(lw > 0, (total_antrean - lw) / lw, 0.0)
+    return pd.DataFrame(hasil)
+
+
+def jalankan_validasi(
+    kasus: Iterable[KasusValidasi] = KASUS_DEFAULT,
+    engine: Iterable[str] = tuple(ENGINE),
+    replikasi: int = 10,
+    durasi_simulasi: int = 10000,
+    pemanasan: float = 500,
+    pendinginan: float = 200,
+    tingkat_kepercayaan: float = 0.99,
+    toleransi_relatif: float = 0.03,
+    seed_awal: int = 1,
+    verbose: bool = False
+) -> pd.DataFrame:
+    """
+    Menjalankan semua pemeriksaan akurasi untuk setiap kasus dan engine.
+
+    Lulus jika ``|estimasi - teori| <= setengah_lebar + toleransi x |teori|``
+    (untuk hukum Little teori = residu 0 dan toleransinya absolut).
+
+    Args:
+        kasus: Kasus validasi
+        engine: Nama engine di ``ENGINE``
+        replikasi: Replikasi per kasus dan engine (seed berurutan)
+        durasi_simulasi: Durasi setiap replikasi (menit)
+        pemanasan: Menit awal yang diabaikan
+        pendinginan: Menit akhir yang diabaikan
+        tingkat_kepercayaan: Tingkat kepercayaan CI
+        toleransi_relatif: Toleransi sisa bias
+        seed_awal: Seed replikasi pertama
+        verbose: Cetak progres per kasus
+
+    Returns:
+        DataFrame satu baris per pemeriksaan: kasus, engine, cek, teori,
+        estimasi, setengah_lebar, lulus_akurasi, waktu_detik
+    """
+    awal, akhir = pemanasan, durasi_simulasi - pendinginan
+    if akhir <= awal:
+        raise ValueError("durasi_simulasi harus lebih panjang dari pemanasan + pendinginan")
+
+    baris = []
+    for k in kasus:
+        teori = teori_tandem(k)
+        teori.update({f'little_{s.lower()}': 0.0 for s in STASIUN}, little_total=0.0)
+        for nama_engine in engine:
+            fungsi = ENGINE[nama_engine]
+            seeds = list(range(seed_awal, seed_awal + replikasi))
+            mulai = time.perf_counter()
+            if nama_engine == 'batch':
+                waktu_batch = fungsi(k.config(durasi_simulasi), seeds)
+                df = ukur_batch(waktu_batch, durasi_simulasi, awal, akhir)
+            else:
+                ukuran = []
+                for seed in seeds:
+                    df_log, df_antrean, _, _ = fungsi(**k.parameter(durasi_simulasi, seed))
+                    ukuran.append(ukur_replikasi(df_log, df_antrean, awal, akhir))
+                df = pd.DataFrame(ukuran)
+            waktu = time.perf_counter() - mulai
+
+            for cek, nilai_teori in teori.items():
+                rata, setengah = hitung_interval(df[cek].to_numpy(), tingkat_kepercayaan)
+                batas = setengah + toleransi_relatif * (abs(nilai_teori) if nilai_teori else 1.0)
+                baris.append({
+                    'kasus': k.nama,
+                    'engine': nama_engine,
+                    'cek': cek,
+                    'teori': nilai_teori,
+                    'estimasi': rata,
+                    'setengah_lebar': setengah,
+                    'lulus_akurasi': bool(abs(rata - nilai_teori) <= batas),
+                    'waktu_detik': waktu,
+                })
+            if verbose:
+                print(f"{k.nama} / {nama_engine}: {replikasi} replikasi dalam {waktu:.2f} detik")
+    return pd.DataFrame(baris)
+
+
+def periksa_waktu(
+    df: pd.DataFrame,
+    baseline: Dict[str, float],
+    toleransi: float = 0.25
+) -> pd.DataFrame:
+    """
+    Menambahkan kolom gerbang waktu dari baseline ``{'kasus/engine': detik}``.
+
+    Kasus/engine tanpa baseline selalu lulus.
+    """
+    df = df.copy()
+    kunci = df['kasus'] + '/' + df['engine']
+    df['batas_waktu'] = kunci.map(baseline).astype(float) * (1 + toleransi)
+    df['lulus_waktu'] = df['batas_waktu'].isna() | (df['waktu_detik'] <= df['batas_waktu'])
+    return df
+
+
+def waktu_baseline(df: pd.DataFrame) -> Dict[str, float]:
+    """Waktu per kasus/engine dari hasil ``jalankan_validasi`` (untuk disimpan)."""
+    waktu = df.groupby(['kasus', 'engine'])['waktu_detik'].first()
+    return {f'{k}/{e}': float(w) for (k, e), w in waktu.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point command-line; exit code 1 jika ada pemeriksaan gagal."""
+    parser = argparse.ArgumentParser(
+        description="Validasi engine terhadap teori antrean + gerbang regresi waktu."
+    )
+    parser.add_argument('--engine', default=','.join(ENGINE),
+                        help="Engine dipisah koma (default: semua)")
+    parser.add_argument('-r', '--replikasi', type=int, default=10, help="Replikasi per kasus")
+    parser.add_argument('--durasi', type=int, default=10000, help="Durasi replikasi (menit)")
+    parser.add_argument('--pemanasan', type=float, default=500, help="Menit awal diabaikan")
+    parser.add_argument('--pendinginan', type=float, default=200, help="Menit akhir diabaikan")
+    parser.add_argument('--kepercayaan', type=float, default=0.99, help="Tingkat kepercayaan CI")
+    parser.add_argument('--toleransi', type=float, default=0.03, help="Toleransi relatif bias")
+    parser.add_argument('--seed', type=int, default=1, help="Seed replikasi pertama")
+    parser.add_argument('--baseline', default=None, metavar='JSON',
+                        help="Baseline waktu untuk gerbang performa")
+    parser.add_argument('--toleransi-waktu', type=float, default=0.25,
+                        help="Perlambatan maksimum relatif terhadap baseline")
+    parser.add_argument('--simpan-baseline', default=None, metavar='JSON',
+                        help="Simpan waktu run ini sebagai baseline")
+    args = parser.parse_args(argv)
+
+    engine = [e.strip() for e in args.engine.split(',') if e.strip()]
+    tidak_dikenal = set(engine) - set(ENGINE)
+    if tidak_dikenal:
+        parser.error(f"Engine tidak dikenal: {', '.join(sorted(tidak_dikenal))}")
+
+    df = jalankan_validasi(
+        engine=engine,
+        replikasi=args.replikasi,
+        durasi_simulasi=args.durasi,
+        pemanasan=args.pemanasan,
+        pendinginan=args.pendinginan,
+        tingkat_kepercayaan=args.kepercayaan,
+        toleransi_relatif=args.toleransi,
+        seed_awal=args.seed,
+        verbose=True
+    )
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    df = periksa_waktu(df, baseline, args.toleransi_waktu)
+
+    with pd.option_context('display.float_format', '{:.4f}'.format, 'display.width', 160):
+        print(df.drop(columns='waktu_detik').to_string(index=False))
+    waktu = df.groupby(['kasus', 'engine'])[['waktu_detik', 'batas_waktu', 'lulus_waktu']].first()
+    print()
+    print(waktu.to_string())
+
+    if args.simpan_baseline:
+        with open(args.simpan_baseline, 'w', encoding='utf-8') as f:
+            json.dump(waktu_baseline(df), f, indent=2)
+        print(f"\nBaseline waktu disimpan ke {args.simpan_baseline}")
+
+    gagal_akurasi = int((~df['lulus_akurasi']).sum())
+    gagal_waktu = int((~waktu['lulus_waktu']).sum())
+    print(f"\nAkurasi: {len(df) - gagal_akurasi}/{len(df)} lulus; "
+          f"waktu: {len(waktu) - gagal_waktu}/{len(waktu)} lulus")
+    return 0 if gagal_akurasi == 0 and gagal_waktu == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())